@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""
+User-Agent classification: the previous substring scans vs core.botdetect.
+
+No database or Django setup is needed:
+
+    python benchmarks/bot_detection.py --requests 200000
+
+"warm" replays a realistic mix where a few UA strings dominate (memoized
+verdicts); "cold" uses a distinct UA per request, so only the compiled regex
+helps.
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core import botdetect  # noqa: E402
+
+USER_AGENTS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36',
+    'Mozilla/5.0 (iPhone; CPU iPhone OS 17_4 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.4 Mobile/15E148 Safari/604.1',
+    'Mozilla/5.0 (Linux; Android 14; SM-S918B) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Mobile Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 14_4) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.4 Safari/605.1.15',
+    'Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)',
+    'Mozilla/5.0 (compatible; bingbot/2.0; +http://www.bing.com/bingbot.htm)',
+    'facebookexternalhit/1.1 (+http://www.facebook.com/externalhit_uatext.php)',
+    'WhatsApp/2.23.20.0',
+]
+
+
+def legacy_is_bot(ua):
+    """The previous core.views._is_bot."""
+    ua = (ua or '').lower()
+    return (any(p in ua for p in botdetect.BOT_SPECIFIC)
+            or any(p in ua for p in botdetect.BOT_GENERIC))
+
+
+def run(label, fn, agents):
+    start = time.perf_counter()
+    bots = sum(1 for ua in agents if fn(ua))
+    elapsed = time.perf_counter() - start
+    print(f'{label:<14} {len(agents):>8} UAs  {elapsed:7.3f}s  '
+          f'{len(agents) / elapsed / 1e6:6.2f} M/s  bots={bots}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=200000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    weights = [30, 25, 20, 10, 6, 4, 3, 2]
+    warm = rng.choices(USER_AGENTS, weights=weights, k=args.requests)
+    cold = [f'{ua} build/{i}' for i, ua in enumerate(warm)]
+
+    run('legacy warm', legacy_is_bot, warm)
+    run('compiled warm', botdetect.is_bot, warm)
+    botdetect._classify.cache_clear()
+    run('legacy cold', legacy_is_bot, cold)
+    run('compiled cold', botdetect.is_bot, cold)
+
+
+if __name__ == '__main__':
+    main()
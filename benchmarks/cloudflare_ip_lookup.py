@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+"""
+Cloudflare REMOTE_ADDR check: the previous locked linear scan vs core.middleware.
+
+No database or Django setup is needed:
+
+    python benchmarks/cloudflare_ip_lookup.py --requests 200000
+
+"edge" replays traffic from a few hundred Cloudflare edge addresses, as a
+proxied origin sees it (memoized verdicts); "cold" uses a distinct address
+per request, so only the binary search helps.
+"""
+import argparse
+import ipaddress
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core import middleware  # noqa: E402
+
+
+class LegacyCache:
+    """The previous core.middleware._CfIpCache lookup, without the refresh."""
+
+    def __init__(self, ranges):
+        self._networks = [ipaddress.ip_network(r) for r in ranges]
+        self._lock = threading.Lock()
+
+    def contains(self, ip_str):
+        try:
+            ip = ipaddress.ip_address(ip_str)
+            with self._lock:
+                return any(ip in net for net in self._networks)
+        except ValueError:
+            return False
+
+
+def run(label, fn, addresses):
+    start = time.perf_counter()
+    hits = sum(1 for ip in addresses if fn(ip))
+    elapsed = time.perf_counter() - start
+    print(f'{label:<14} {len(addresses):>8} IPs  {elapsed:7.3f}s  '
+          f'{len(addresses) / elapsed / 1e6:6.2f} M/s  cloudflare={hits}')
+
+
+def random_address(rng, networks):
+    net = rng.choice(networks)
+    return str(net.network_address + rng.randrange(net.num_addresses))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=200000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    ranges = middleware._FALLBACK_RANGES
+    networks = [ipaddress.ip_network(r) for r in ranges]
+    edges = [random_address(rng, networks) for _ in range(300)]
+    edge = rng.choices(edges, k=args.requests)
+    # Half Cloudflare, half arbitrary IPv4 addresses
+    cold = [
+        random_address(rng, networks) if i % 2 else str(ipaddress.IPv4Address(rng.getrandbits(32)))
+        for i in range(args.requests)
+    ]
+
+    legacy = LegacyCache(ranges)
+    run('legacy edge', legacy.contains, edge)
+    run('table edge', middleware._RangeTable(networks).contains, edge)
+    run('legacy cold', legacy.contains, cold)
+    run('table cold', middleware._RangeTable(networks).contains, cold)
+
+
+if __name__ == '__main__':
+    main()
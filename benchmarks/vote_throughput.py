@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""
+Votes per second: the previous ORM toggle sequence vs core.votes.cast_vote.
+
+Runs against a throwaway SQLite database, never the project database:
+
+    python benchmarks/vote_throughput.py --users 200 --rounds 5
+
+Each round every user clicks like, dislike, then dislike again (new vote,
+flip, toggle off), so all three branches are exercised equally.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+
+def legacy_vote(user, word, vote_val):
+    """The pre-engine sequence from core.views.vote, minus notifications."""
+    from django.db import transaction
+    from django.db.models import F
+    from core.models import Word, WordVote
+
+    with transaction.atomic():
+        obj = Word.objects.select_for_update().get(id=word.id)
+        existing_vote = WordVote.objects.filter(user=user, word=obj).first()
+        if existing_vote:
+            if existing_vote.value == vote_val:
+                existing_vote.delete()
+                obj.score = F('score') - vote_val
+            else:
+                existing_vote.value = vote_val
+                existing_vote.save(update_fields=['value'])
+                obj.score = F('score') + (vote_val * 2)
+        else:
+            WordVote.objects.create(value=vote_val, user=user, word=obj)
+            obj.score = F('score') + vote_val
+        obj.save(update_fields=['score'])
+        obj.refresh_from_db()
+        return obj.score
+
+
+def engine_vote(user, word, vote_val):
+    from django.db import transaction
+    from core.votes import cast_vote
+
+    with transaction.atomic():
+        return cast_vote('word', word.id, user.id, vote_val).score
+
+
+def run(label, fn, users, word, rounds):
+    clicks = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for user in users:
+            for vote_val in (1, -1, -1):
+                fn(user, word, vote_val)
+                clicks += 1
+    elapsed = time.perf_counter() - start
+    word.refresh_from_db()
+    print(f'{label:<8} {clicks:>7} votes  {elapsed:7.2f}s  {clicks / elapsed:9.0f} votes/s  final score={word.score}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        import django
+        from django.conf import settings
+
+        settings.DATABASES['default']['NAME'] = str(Path(tmp) / 'bench.db')
+        django.setup()
+
+        from django.contrib.auth.models import User
+        from django.core.management import call_command
+        from core.models import Word
+
+        call_command('migrate', verbosity=0)
+
+        User.objects.bulk_create([User(username=f'bench{i}') for i in range(args.users)])
+        users = list(User.objects.filter(username__startswith='bench'))
+        word = Word.objects.create(word='olcut', definition='bench', status='approved')
+
+        run('legacy', legacy_vote, users, word, args.rounds)
+        run('engine', engine_vote, users, word, args.rounds)
+
+
+if __name__ == '__main__':
+    main()
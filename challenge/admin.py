@@ -5,7 +5,8 @@ from django.template import Template, RequestContext
 from django.contrib.admin import helpers
 from django.utils import timezone
 from .models import TranslationChallenge, ChallengeComment, ChallengeCommentVote
-from core.models import Notification, REJECTION_REASONS
+from core import notifications
+from core.models import REJECTION_REASONS
 
 
 @admin.action(description='Mark selected challenges as Approved')
@@ -40,19 +41,17 @@ def reject_challenges(modeladmin, request, queryset):
             modeladmin.message_user(request, "Rejection reason cannot be empty.", level=messages.WARNING)
             return HttpResponseRedirect(request.get_full_path())
 
-        notifications = []
+        events = []
         for challenge in queryset:
             challenge.status = 'rejected'
             challenge.rejection_reason = final_reason
             challenge.save(update_fields=['status', 'rejection_reason'])
             if challenge.user:
-                notifications.append(Notification(
-                    recipient=challenge.user,
-                    notification_type='challenge_rejected',
+                events.append(notifications.event(
+                    challenge.user, 'challenge_rejected',
                     message=f"{challenge.foreign_word}: {final_reason}",
                 ))
-        if notifications:
-            Notification.objects.bulk_create(notifications)
+        notifications.notify_many(events)
 
         modeladmin.message_user(request, f"{queryset.count()} challenge(s) rejected.")
         return HttpResponseRedirect(request.get_full_path())
@@ -110,10 +109,11 @@ def reject_challenges(modeladmin, request, queryset):
 
 class TranslationChallengeAdmin(admin.ModelAdmin):
     actions = [approve_challenges, pending_challenges, reject_challenges, start_timer, reset_timer]
-    list_display = ('foreign_word', 'meaning', 'status', 'author', 'user', 'timer_on', 'timer_started_at', 'timestamp')
+    list_display = ('foreign_word', 'meaning', 'status', 'author', 'user', 'suggestion_count', 'timer_on', 'timer_started_at', 'timestamp')
     list_filter = ('status', 'timer_on', 'timestamp')
     search_fields = ('foreign_word', 'meaning', 'author')
     list_editable = ('timer_on',)
+    readonly_fields = ('suggestion_count', 'top_suggestion')
 
     def save_model(self, request, obj, form, change):
         if change and 'timer_on' in form.changed_data:
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class ChallengeConfig(AppConfig):
     name = 'challenge'
+
+    def ready(self):
+        import challenge.signals
@@ -0,0 +1,46 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_suggestion_fields(apps, schema_editor):
+    TranslationChallenge = apps.get_model('challenge', 'TranslationChallenge')
+    ChallengeComment = apps.get_model('challenge', 'ChallengeComment')
+    counts = (
+        ChallengeComment.objects.filter(challenge=OuterRef('pk'))
+        .order_by()
+        .values('challenge')
+        .annotate(n=Count('id'))
+        .values('n')
+    )
+    best = (
+        ChallengeComment.objects.filter(challenge=OuterRef('pk'))
+        .order_by('-score', 'timestamp', 'id')
+        .values('id')[:1]
+    )
+    TranslationChallenge.objects.update(
+        suggestion_count=Coalesce(Subquery(counts), 0),
+        top_suggestion=Subquery(best),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('challenge', '0008_rename_challenge_cc_challenge_score_idx_core_challe_challen_ff213f_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='translationchallenge',
+            name='suggestion_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='translationchallenge',
+            name='top_suggestion',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='challenge.challengecomment'),
+        ),
+        migrations.RunPython(backfill_suggestion_fields, migrations.RunPython.noop),
+    ]
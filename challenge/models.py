@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import OuterRef, Subquery
 from django.contrib.auth.models import User
 from django.utils import timezone
 import datetime
@@ -33,6 +34,17 @@ class TranslationChallenge(models.Model):
     timer_started_at = models.DateTimeField(null=True, blank=True)
     winner_word_created = models.BooleanField(default=False)
 
+    # Denormalized from ChallengeComment, maintained by challenge.signals so the
+    # list view needs neither COUNT() nor a prefetch of every suggestion.
+    suggestion_count = models.IntegerField(default=0)
+    top_suggestion = models.ForeignKey(
+        'ChallengeComment',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+    )
+
     TIMER_DURATION = datetime.timedelta(days=7)
 
     @property
@@ -57,8 +69,19 @@ class TranslationChallenge(models.Model):
             return remaining
         return None
 
+    @classmethod
+    def refresh_top_suggestion(cls, challenge_id):
+        """Repoint ``top_suggestion`` at the best-ranked suggestion in one UPDATE."""
+        best = (
+            ChallengeComment.objects.filter(challenge=OuterRef('pk'))
+            .order_by('-score', 'timestamp', 'id')
+            .values('id')[:1]
+        )
+        cls.objects.filter(pk=challenge_id).update(top_suggestion=Subquery(best))
+
     def create_winner_word(self):
-        from core.models import Word, WordVote, Notification
+        from core.models import Word, WordVote
+        from core.notifications import notify
         from django.db import transaction, IntegrityError
 
         if not self.is_closed or self.winner_word_created:
@@ -115,10 +138,8 @@ class TranslationChallenge(models.Model):
 
         # Notify the winner
         if top.user:
-            Notification.objects.create(
-                recipient=top.user,
-                notification_type='challenge_win',
-                word=word,
+            notify(
+                top.user, 'challenge_win', word=word,
                 message=f'"{top.suggested_word}" sözcüğünüz "{self.foreign_word}" yarışmasını kazandı!',
             )
 
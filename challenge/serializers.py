@@ -9,7 +9,7 @@ WORD_SAFE_PATTERN = r'[^a-zA-ZçÇğĞıIİöÖşŞüÜâîûÂÎÛ\s\-]'
 
 class TranslationChallengeSerializer(serializers.ModelSerializer):
     author = serializers.CharField(source='display_author', read_only=True)
-    comment_count = serializers.IntegerField(read_only=True)
+    comment_count = serializers.IntegerField(source='suggestion_count', read_only=True)
     timer_on = serializers.BooleanField(read_only=True)
     timer_started_at = serializers.DateTimeField(read_only=True)
     is_closed = serializers.BooleanField(read_only=True)
@@ -33,14 +33,9 @@ class TranslationChallengeSerializer(serializers.ModelSerializer):
     def get_winner(self, obj):
         if not obj.is_closed:
             return None
-            
-        # P1 FIX: Utilize the prefetched comments list if available to avoid N+1 queries.
-        if hasattr(obj, 'prefetched_ordered_comments'):
-            ordered_comments = obj.prefetched_ordered_comments
-            top = ordered_comments[0] if ordered_comments else None
-        else:
-            top = obj.comments.order_by('-score', 'timestamp').first()
 
+        # top_suggestion is kept current by challenge.signals; list views select_related it.
+        top = obj.top_suggestion
         if top and top.score > 0:
             return {
                 'suggested_word': top.suggested_word,
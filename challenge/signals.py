@@ -0,0 +1,30 @@
+# challenge/signals.py
+
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import TranslationChallenge, ChallengeComment
+
+
+# --- Denormalized TranslationChallenge.suggestion_count / top_suggestion ---
+# Both run inside the caller's transaction (suggestion creation and voting are
+# atomic), so the challenge row never disagrees with its committed suggestions.
+
+@receiver(post_save, sender=ChallengeComment)
+def sync_challenge_on_suggestion_save(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        TranslationChallenge.objects.filter(pk=instance.challenge_id).update(
+            suggestion_count=F('suggestion_count') + 1
+        )
+    elif update_fields and 'score' not in update_fields:
+        return
+    TranslationChallenge.refresh_top_suggestion(instance.challenge_id)
+
+
+@receiver(post_delete, sender=ChallengeComment)
+def sync_challenge_on_suggestion_delete(sender, instance, **kwargs):
+    TranslationChallenge.objects.filter(pk=instance.challenge_id).update(
+        suggestion_count=F('suggestion_count') - 1
+    )
+    TranslationChallenge.refresh_top_suggestion(instance.challenge_id)
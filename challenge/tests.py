@@ -1,3 +1,82 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
 
-# Create your tests here.
+from .models import TranslationChallenge, ChallengeComment
+
+
+@override_settings(RATELIMIT_ENABLE=False)
+class ChallengeCommentCursorTests(TestCase):
+
+    def setUp(self):
+        self.challenge = TranslationChallenge.objects.create(
+            foreign_word='smartphone', meaning='akıllı telefon', status='approved',
+        )
+        for i, score in enumerate([2, 5, 2, 0]):
+            user = User.objects.create_user(username=f'oneren{i}', password='pass123')
+            ChallengeComment.objects.create(
+                challenge=self.challenge, user=user, suggested_word=f'akilli{i}',
+                etymology='köken', example_sentence='örnek.', score=score,
+            )
+
+    def test_suggestions_walk_best_first(self):
+        url = reverse('get_challenge_comments', args=[self.challenge.id])
+        ids, cursor = [], ''
+        while True:
+            data = self.client.get(url, {'limit': 3, 'cursor': cursor}).json()
+            ids.extend(c['id'] for c in data['comments'])
+            if not data['has_next']:
+                break
+            cursor = data['next_cursor']
+
+        expected = list(
+            ChallengeComment.objects.filter(challenge=self.challenge)
+            .order_by('-score', 'timestamp', 'id').values_list('id', flat=True)
+        )
+        self.assertEqual(ids, expected)
+
+
+@override_settings(RATELIMIT_ENABLE=False)
+class ChallengeSuggestionDenormTests(TestCase):
+
+    def setUp(self):
+        self.challenge = TranslationChallenge.objects.create(
+            foreign_word='laptop', meaning='dizüstü bilgisayar', status='approved',
+        )
+        self.owner = User.objects.create_user(username='sahip', password='pass123')
+        self.voter = User.objects.create_user(username='secmen', password='pass123')
+
+    def _suggest(self, user, word):
+        self.client.force_login(user)
+        return self.client.post(
+            reverse('add_challenge_suggestion'),
+            data={'challenge_id': self.challenge.id, 'suggested_word': word,
+                  'etymology': 'köken', 'example_sentence': 'örnek.'},
+            content_type='application/json',
+        ).json()['suggestion']['id']
+
+    def test_count_and_top_follow_suggestions_and_votes(self):
+        first = self._suggest(self.owner, 'dizustu')
+        second = self._suggest(self.voter, 'kucukbilgisayar')
+        self.challenge.refresh_from_db()
+        self.assertEqual(self.challenge.suggestion_count, 2)
+        self.assertEqual(self.challenge.top_suggestion_id, first)
+
+        self.client.force_login(self.owner)
+        self.client.post(
+            reverse('vote_challenge_comment', args=[second]),
+            data={'action': 'like'}, content_type='application/json',
+        )
+        self.challenge.refresh_from_db()
+        self.assertEqual(self.challenge.top_suggestion_id, second)
+
+        ChallengeComment.objects.get(id=second).delete()
+        self.challenge.refresh_from_db()
+        self.assertEqual(self.challenge.suggestion_count, 1)
+        self.assertEqual(self.challenge.top_suggestion_id, first)
+
+    def test_list_uses_stored_count(self):
+        self._suggest(self.owner, 'dizustu')
+        self.client.logout()
+        data = self.client.get(reverse('get_challenges')).json()
+        self.assertEqual(data['challenges'][0]['comment_count'], 1)
@@ -6,17 +6,25 @@ from rest_framework.authentication import SessionAuthentication
 from django.shortcuts import get_object_or_404
 from django_ratelimit.decorators import ratelimit
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-from django.db.models import Count, F, Prefetch, Case, When, Value, BooleanField
+from django.db.models import Case, When, Value, BooleanField
+from django.conf import settings
 from django.db import transaction, DatabaseError, OperationalError, IntegrityError
 from django.utils import timezone
 
 from core.views import get_client_ip, universal_rate_key
+from core.pagination import InvalidCursor, paginate_request
+from core.notifications import sync_vote_notification
+from core import vote_queue
+from core.votes import cast_vote
 from .models import TranslationChallenge, ChallengeComment, ChallengeCommentVote
 from .serializers import (
     TranslationChallengeSerializer, TranslationChallengeCreateSerializer,
     ChallengeCommentSerializer, ChallengeSuggestionCreateSerializer
 )
 
+# Suggestions are ranked best-first; id breaks ties for keyset pagination
+SUGGESTION_ORDERING = ('-score', 'timestamp', 'id')
+
 
 @ratelimit(key='ip', rate='60/m', method='GET', block=False)
 @api_view(['GET'])
@@ -35,7 +43,7 @@ def get_challenges(request):
         limit = int(request.GET.get('limit', 20))
     except (ValueError, TypeError):
         limit = 20
-    limit = min(limit, 50)
+    limit = max(1, min(limit, 50))
 
     now = timezone.now()
     closed_cutoff = now - TranslationChallenge.TIMER_DURATION
@@ -43,22 +51,14 @@ def get_challenges(request):
     challenges_qs = (
         TranslationChallenge.objects.filter(status='approved')
         .annotate(
-            comment_count=Count('comments'),
             closed_flag=Case(
                 When(timer_on=True, timer_started_at__lte=closed_cutoff, then=Value(True)),
                 default=Value(False),
                 output_field=BooleanField(),
             ),
         )
-        .select_related('user')
-        .prefetch_related(
-            Prefetch(
-                'comments',
-                queryset=ChallengeComment.objects.order_by('-score', 'timestamp'),
-                to_attr='prefetched_ordered_comments'
-            )
-        )
-        .order_by('closed_flag', '-comment_count', '-timestamp')
+        .select_related('user', 'top_suggestion__user')
+        .order_by('closed_flag', '-suggestion_count', '-timestamp')
     )
 
     paginator = Paginator(challenges_qs, limit)
@@ -126,23 +126,17 @@ def get_challenge_comments(request, challenge_id):
         except (DatabaseError, OperationalError, IntegrityError):
             pass
 
-    try:
-        page = int(request.GET.get('page', 1))
-    except (ValueError, TypeError):
-        page = 1
     try:
         limit = int(request.GET.get('limit', 10))
     except (ValueError, TypeError):
         limit = 10
-    limit = min(limit, 20)
-
-    comments_qs = ChallengeComment.objects.filter(challenge=challenge).select_related('user').order_by('-score', 'timestamp')
-    paginator = Paginator(comments_qs, limit)
+    limit = max(1, min(limit, 20))
 
+    comments_qs = ChallengeComment.objects.filter(challenge=challenge).select_related('user')
     try:
-        comments_page = paginator.page(page)
-    except (EmptyPage, PageNotAnInteger):
-        comments_page = []
+        comments_page = paginate_request(request, comments_qs, SUGGESTION_ORDERING, limit)
+    except InvalidCursor as e:
+        return Response({'error': str(e)}, status=400)
 
     user_votes = {}
     try:
@@ -165,14 +159,15 @@ def get_challenge_comments(request, challenge_id):
 
     winner_id = None
     if challenge.is_closed:
-        top = ChallengeComment.objects.filter(challenge=challenge).order_by('-score', 'timestamp').first()
+        top = challenge.top_suggestion
         if top and top.score > 0:
             winner_id = top.id
 
     return Response({
         'success': True,
         'comments': serializer.data,
-        'has_next': comments_page.has_next() if hasattr(comments_page, 'has_next') else False,
+        'has_next': comments_page.has_next,
+        'next_cursor': comments_page.next_cursor,
         'is_closed': challenge.is_closed,
         'timer_on': challenge.timer_on,
         'has_submitted': has_submitted,
@@ -276,7 +271,7 @@ def vote_challenge_comment(request, comment_id):
         return Response({'error': 'Geçersiz işlem.'}, status=400)
 
     comment = get_object_or_404(
-        ChallengeComment.objects.select_for_update().select_related('challenge'),
+        ChallengeComment.objects.select_related('challenge', 'user'),
         id=comment_id,
         challenge__status='approved'
     )
@@ -288,76 +283,33 @@ def vote_challenge_comment(request, comment_id):
         }, status=403)
 
     vote_val = 1 if action == 'like' else -1
-    existing_vote = ChallengeCommentVote.objects.filter(user=user, comment=comment).first()
-    response_action = 'none'
-
-    if existing_vote:
-        if existing_vote.value == vote_val:
-            existing_vote.delete()
-            comment.score = F('score') - vote_val
-            response_action = 'none'
-        else:
-            existing_vote.value = vote_val
-            existing_vote.save(update_fields=['value']) # Fix: Added update_fields
-            comment.score = F('score') + (vote_val * 2)
-            response_action = 'liked' if vote_val == 1 else 'disliked'
-    else:
-        try:
-            ChallengeCommentVote.objects.create(
-                value=vote_val,
-                ip_address=client_ip,
-                user=user,
-                comment=comment
-            )
-        except IntegrityError:
-            return Response({'error': 'Oy zaten kaydedildi.'}, status=409)
-        comment.score = F('score') + vote_val
-        response_action = 'liked' if vote_val == 1 else 'disliked'
-
-    comment.save(update_fields=['score']) # Fix: Added update_fields
-    comment.refresh_from_db()
+
+    if settings.VOTE_WRITE_BEHIND:
+        new_score, response_action = vote_queue.enqueue_vote(
+            user, 'challenge_comment', comment, vote_val, client_ip
+        )
+        return Response({
+            'success': True,
+            'new_score': new_score,
+            'user_action': response_action,
+            'pending': True,
+        })
+
+    result = cast_vote('challenge_comment', comment.id, user.id, vote_val, client_ip)
+    if result.score is None:
+        transaction.set_rollback(True)
+        return Response({'error': 'Geçersiz içerik.'}, status=404)
+    response_action = result.user_action
+    TranslationChallenge.refresh_top_suggestion(comment.challenge_id)
 
     owner = comment.user if hasattr(comment, 'user') else None
-    if owner and owner != user:
-        from core.models import Notification
-        from django.core.cache import cache
-
-        like_type = 'challenge_like'
-        dislike_type = 'challenge_dislike'
-        current_type = like_type if vote_val == 1 else dislike_type
-        opposite_type = dislike_type if vote_val == 1 else like_type
-        
-        if response_action == 'none':
-            # SOFT DELETE
-            updated = Notification.objects.filter(
-                recipient=owner, actor=user, notification_type=current_type, challenge_comment_id=comment.id
-            ).update(is_active=False)
-            
-            if updated:
-                cache.delete(f'notif_unread_{owner.id}')
-        else:
-            # Deactivate opposite vote type
-            Notification.objects.filter(
-                recipient=owner, actor=user, notification_type=opposite_type, challenge_comment_id=comment.id
-            ).update(is_active=False)
-            
-            # Fetch or create the notification
-            notif, created = Notification.objects.get_or_create(
-                recipient=owner, actor=user, notification_type=current_type, challenge_comment_id=comment.id,
-                defaults={'is_active': True}
-            )
-            
-            # REVIVE: If it existed but was deactivated, turn it back on.
-            if not created and not notif.is_active:
-                notif.is_active = True
-                notif.is_read = False
-                notif.save(update_fields=['is_active', 'is_read'])
-                cache.delete(f'notif_unread_{owner.id}')
-            elif created:
-                cache.delete(f'notif_unread_{owner.id}')
+    sync_vote_notification(
+        owner, user, 'challenge', result.old_value, result.new_value,
+        {'challenge_comment_id': comment.id}
+    )
 
     return Response({
         'success': True,
-        'new_score': comment.score,
+        'new_score': result.score,
         'user_action': response_action
     })
\ No newline at end of file
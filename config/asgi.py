@@ -3,6 +3,11 @@ ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Run under an ASGI server (e.g. ``uvicorn config.asgi:application``) with
+NOTIFICATION_STREAM_ENABLED=True to serve the async notification stream
+(core.views.notification_stream); long-lived SSE connections then cost a
+coroutine each instead of a worker thread.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
 """
@@ -15,6 +15,9 @@ DEBUG = config('DEBUG', default=False, cast=bool)
 # Reads ALLOWED_HOSTS from .env, converts comma-separated string to list
 ALLOWED_HOSTS = config('ALLOWED_HOSTS', cast=Csv())
 
+# Public origin used in absolute URLs (sitemaps, robots.txt)
+SITE_URL = config('SITE_URL', default='https://yenisozcukler.com')
+
 # --- CLOUDFLARE VE GÜVENLİK AYARLARI ---
 
 # Django 4.0+ için zorunlu: Admin panelindeki 403 hatasını çözer.
@@ -23,6 +26,12 @@ CSRF_TRUSTED_ORIGINS = [
     'https://www.yenisozcukler.com',
 ]
 
+# Last good Cloudflare IP range list, one CIDR per line (core/middleware.py). Workers
+# load it and pick up changes on their own; only `manage.py refresh_cloudflare_ips`
+# (e.g. a daily cron job) downloads it. Until the file exists, or with an empty
+# value, the built-in list in core/middleware.py is used.
+CLOUDFLARE_RANGES_PATH = config('CLOUDFLARE_RANGES_PATH', default=str(BASE_DIR.parent / 'cloudflare-ips.txt'))
+
 SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
 SECURE_REFERRER_POLICY = 'strict-origin-when-cross-origin'
 SECURE_CONTENT_TYPE_NOSNIFF = True
@@ -51,7 +60,34 @@ CACHES = {
     }
 }
 
+# Directory for pre-rendered bot word pages (core/prerender.py); empty disables.
+# Fill it once with `manage.py prerender_words`, later changes keep it current.
+PRERENDER_DIR = config('PRERENDER_DIR', default='')
+
+# In-process tier in front of CACHES['default'] (core/cachelayer.py)
+LOCAL_CACHE = {
+    'MAX_BYTES': config('LOCAL_CACHE_MAX_BYTES', default=8 * 1024 * 1024, cast=int),
+    'TIMEOUT': 10,        # seconds a local copy may be served
+    'SYNC_INTERVAL': 1,   # seconds between invalidation log polls (shared backend only)
+}
+
+# With several worker processes, point this at a file (e.g. /var/cache/sozluk/cache.sqlite3)
+# so they share one cache and see each other's invalidations (core/sharedcache.py).
+SHARED_CACHE_PATH = config('SHARED_CACHE_PATH', default='')
+if SHARED_CACHE_PATH:
+    CACHES['default'] = {
+        'BACKEND': 'core.sharedcache.SQLiteCache',
+        'LOCATION': SHARED_CACHE_PATH,
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    }
+
+# Per-view request metrics (core/metrics.py), served to staff at /metrics. With several
+# worker processes, point this at a file (e.g. /var/cache/sozluk/metrics.sqlite3) so the
+# endpoint reports the sum over all of them; empty keeps them per process.
+METRICS_PATH = config('METRICS_PATH', default='')
+
 MIDDLEWARE = [
+    'core.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -129,6 +165,25 @@ STORAGES = {
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Write-behind voting: clicks are stored as VoteIntent rows and applied in
+# batches by `manage.py flush_votes` (see core/vote_queue.py).
+VOTE_WRITE_BEHIND = config('VOTE_WRITE_BEHIND', default=False, cast=bool)
+
+# 'inline' writes notifications in the request; 'queue' stores NotificationJob
+# rows for `manage.py process_notifications` (see core/notifications.py).
+NOTIFICATION_DELIVERY = config('NOTIFICATION_DELIVERY', default='inline')
+
+# Serve the notification list from Notification.payload (frozen at creation)
+# instead of joining word/comment/challenge rows on every read.
+NOTIFICATION_FROZEN_PAYLOAD = config('NOTIFICATION_FROZEN_PAYLOAD', default=False, cast=bool)
+
+# Read notifications older than this are removed by `manage.py prune_notifications`
+NOTIFICATION_RETENTION_DAYS = config('NOTIFICATION_RETENTION_DAYS', default=90, cast=int)
+
+# Server-Sent Events at /api/notifications/stream. Enable only when served by an
+# ASGI server (config/asgi.py); otherwise every open tab would pin a worker.
+NOTIFICATION_STREAM_ENABLED = config('NOTIFICATION_STREAM_ENABLED', default=False, cast=bool)
+
 # REST FRAMEWORK AYARLARI
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
@@ -3,7 +3,8 @@ from django.contrib import messages
 from django.http import HttpResponseRedirect, HttpResponse
 from django.template import Template, RequestContext
 from django.contrib.admin import helpers
-from .models import Word, Comment, WordVote, CommentVote, Category, Notification, REJECTION_REASONS
+from .models import Word, Comment, WordVote, CommentVote, Category, REJECTION_REASONS
+from . import notifications, pagecache, search
 from django.contrib.auth.models import User
 from django.contrib.auth.admin import UserAdmin
 
@@ -11,12 +12,19 @@ from django.contrib.auth.admin import UserAdmin
 
 @admin.action(description='Mark selected words as Approved')
 def make_approved(modeladmin, request, queryset):
+    word_ids = list(queryset.values_list('id', flat=True))
     updated_count = queryset.update(status='approved')
+    # queryset.update() skips post_save, so sync the search index and caches by hand
+    search.reindex_words(word_ids)
+    pagecache.forget_words(word_ids)
     modeladmin.message_user(request, f"{updated_count} words marked as Approved.")
 
 @admin.action(description='Mark selected words as Pending')
 def make_pending(modeladmin, request, queryset):
+    word_ids = list(queryset.values_list('id', flat=True))
     updated_count = queryset.update(status='pending')
+    search.reindex_words(word_ids)
+    pagecache.forget_words(word_ids)
     modeladmin.message_user(request, f"{updated_count} words marked as Pending.")
 
 @admin.action(description='Reject selected words (with reason)')
@@ -30,20 +38,16 @@ def reject_words(modeladmin, request, queryset):
             modeladmin.message_user(request, "Rejection reason cannot be empty.", level=messages.WARNING)
             return HttpResponseRedirect(request.get_full_path())
 
-        notifications = []
+        events = []
         for word in queryset:
             word.status = 'rejected'
             word.rejection_reason = final_reason
             word.save(update_fields=['status', 'rejection_reason'])
             if word.user:
-                notifications.append(Notification(
-                    recipient=word.user,
-                    notification_type='word_rejected',
-                    word=word,
-                    message=final_reason,
+                events.append(notifications.event(
+                    word.user, 'word_rejected', word=word, message=final_reason,
                 ))
-        if notifications:
-            Notification.objects.bulk_create(notifications)
+        notifications.notify_many(events)
 
         modeladmin.message_user(request, f"{queryset.count()} word(s) rejected.")
         return HttpResponseRedirect(request.get_full_path())
@@ -116,6 +120,8 @@ def change_author(modeladmin, request, queryset):
                 author=new_author_name, 
                 user=user_match # This will be the User object OR None
             )
+            # The author is shown on the cached word pages
+            pagecache.forget_words(list(queryset.values_list('id', flat=True)))
             
             msg = f"Successfully changed author to '{new_author_name}' for {updated_count} words."
             if user_match:
@@ -193,10 +199,11 @@ class CategoryAdmin(admin.ModelAdmin):
 class WordAdmin(admin.ModelAdmin):
     actions = [make_approved, make_pending, reject_words, change_author]
 
-    list_display = ('word', 'status', 'score', 'author', 'user', 'timestamp')
+    list_display = ('word', 'status', 'score', 'comment_count', 'author', 'user', 'timestamp')
     list_filter = ('status', 'categories', 'timestamp')
     search_fields = ('word', 'definition', 'author')
     filter_horizontal = ('categories',)
+    readonly_fields = ('comment_count',)
 
 class CommentAdmin(admin.ModelAdmin):
     list_display = ('author', 'word', 'score', 'timestamp')
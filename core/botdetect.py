@@ -0,0 +1,130 @@
+# core/botdetect.py
+"""
+Crawler detection for the bot-aware page views.
+
+``is_bot`` matches the User-Agent against one compiled alternation of the
+known substrings and memoizes the verdict per UA string in a bounded LRU
+(a handful of UA strings make up most traffic).
+
+``is_verified_crawler`` checks a claimed search-engine crawler the way the
+engines document it: reverse DNS of the client IP must end in the engine's
+domain and the forward lookup of that name must lead back to the IP.
+Results are cached per IP with a TTL.
+"""
+import re
+import socket
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+BOT_SPECIFIC = [
+    'googlebot', 'bingbot', 'yandexbot', 'duckduckbot', 'baiduspider',
+    'slurp', 'facebookexternalhit', 'linkedinbot',
+    'whatsapp', 'telegrambot', 'discordbot', 'applebot',
+]
+BOT_GENERIC = ['bot', 'crawler', 'spider', 'scraper', 'preview']
+
+
+def _alternation(patterns):
+    # A pattern containing another one can never decide a verdict (e.g.
+    # 'googlebot' vs 'bot'), so only the minimal ones are compiled. Matching
+    # runs on the lowercased UA: re.IGNORECASE is several times slower.
+    minimal = [p for p in patterns if not any(q != p and q in p for q in patterns)]
+    return re.compile('|'.join(map(re.escape, sorted(set(minimal)))))
+
+
+_BOT_RE = _alternation(BOT_SPECIFIC + BOT_GENERIC)
+
+# Longer strings are classified without being memoized
+MAX_CACHED_UA_LENGTH = 1024
+
+
+def _matches(ua):
+    return _BOT_RE.search(ua.lower()) is not None
+
+
+_classify = lru_cache(maxsize=4096)(_matches)
+
+
+def is_bot(ua):
+    if not ua:
+        return False
+    if len(ua) > MAX_CACHED_UA_LENGTH:
+        return _matches(ua)
+    return _classify(ua)
+
+
+# --- Verified crawlers (reverse + forward DNS) ---
+
+# UA token -> host suffixes the engine's crawlers resolve to
+CRAWLER_DOMAINS = {
+    'googlebot': ('.googlebot.com', '.google.com', '.googleusercontent.com'),
+    'bingbot': ('.search.msn.com',),
+    'yandexbot': ('.yandex.ru', '.yandex.net', '.yandex.com'),
+    'baiduspider': ('.crawl.baidu.com', '.crawl.baidu.jp'),
+    'applebot': ('.applebot.apple.com',),
+}
+_CRAWLER_RE = re.compile('|'.join(map(re.escape, CRAWLER_DOMAINS)))
+
+VERIFIED_TTL = 24 * 60 * 60
+REJECTED_TTL = 60 * 60
+MAX_CACHED_IPS = 10000
+
+
+class SocketResolver:
+    def reverse(self, ip):
+        return socket.gethostbyaddr(ip)[0]
+
+    def forward(self, host):
+        return socket.gethostbyname_ex(host)[2]
+
+
+class CrawlerVerifier:
+    def __init__(self, resolver=None, clock=time.monotonic):
+        self.resolver = resolver or SocketResolver()
+        self.clock = clock
+        self._cache = OrderedDict()  # (ip, crawler) -> (verdict, expires)
+        self._lock = threading.Lock()
+
+    def claimed_crawler(self, ua):
+        match = _CRAWLER_RE.search((ua or '').lower())
+        return match.group(0) if match else None
+
+    def verify(self, ip, ua):
+        """True if ``ua`` names a known search-engine crawler and ``ip`` really belongs to it."""
+        crawler = self.claimed_crawler(ua)
+        if crawler is None or not ip:
+            return False
+        key = (ip, crawler)
+        now = self.clock()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[1] > now:
+                self._cache.move_to_end(key)
+                return cached[0]
+
+        verdict = self._lookup(ip, CRAWLER_DOMAINS[crawler])
+        with self._lock:
+            self._cache[key] = (verdict, now + (VERIFIED_TTL if verdict else REJECTED_TTL))
+            self._cache.move_to_end(key)
+            while len(self._cache) > MAX_CACHED_IPS:
+                self._cache.popitem(last=False)
+        return verdict
+
+    def _lookup(self, ip, suffixes):
+        try:
+            host = self.resolver.reverse(ip).lower().rstrip('.')
+            if not host.endswith(suffixes):
+                return False
+            return ip in self.resolver.forward(host)
+        except (OSError, UnicodeError):
+            # socket.herror / gaierror are OSError; treat lookup failures as unverified
+            return False
+
+
+verifier = CrawlerVerifier()
+
+
+def is_verified_crawler(ip, ua):
+    return verifier.verify(ip, ua)
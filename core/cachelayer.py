@@ -0,0 +1,270 @@
+# core/cachelayer.py
+"""
+Two-tier cache for the hottest read paths.
+
+Tier 1 is a bounded in-process LRU (settings.LOCAL_CACHE['MAX_BYTES']); tier 2
+is Django's default cache, shared between workers when SHARED_CACHE_PATH is
+set. Keys belong to a ``Namespace`` whose version number is part of every
+key, so a whole family (all word pages, all feed pages) is invalidated by
+``bump()`` without enumerating keys:
+
+    WORDS.get_or_set(slug, lambda: load(slug))
+    WORDS.delete(slug)       # one entry
+    FEED.bump()              # every feed page
+
+Local copies live at most LOCAL_CACHE['TIMEOUT'] seconds. When the shared
+backend keeps an invalidation log (core.sharedcache), writes made by other
+workers also evict local copies within LOCAL_CACHE['SYNC_INTERVAL'].
+
+``get_or_set`` is single-flight: on a miss one caller per key takes a short
+lock in the shared cache and recomputes, while concurrent callers are served
+the previous value (kept under an unversioned "stale" key that survives
+deletes and bumps, for twice the entry's own timeout) or, if there is none yet, wait briefly for the result.
+
+Values are handed out shared, not copied: callers must not mutate them.
+Per-namespace counters are available from ``stats()``.
+"""
+import pickle
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from . import metrics
+
+_MISSING = object()
+
+# Single-flight recomputation (see Namespace.get_or_set)
+LOCK_TIMEOUT = 30          # a crashed leader blocks recomputation at most this long
+LOCK_WAIT = 2.0            # followers without a stale value wait this long, then compute
+LOCK_POLL = 0.05
+# Stale copies outlive the entry by this factor only, up to STALE_TIMEOUT: one
+# per key would otherwise sit in the cache for a day, even for one-off keys
+# such as feed pages with arbitrary query strings
+STALE_FACTOR = 2
+STALE_TIMEOUT = 60 * 60 * 6
+
+
+class LocalLRU:
+    """Size-bounded LRU. Sizes are pickled lengths, a proxy for memory use."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()  # key -> (value, size, expires, namespace)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            if entry[2] <= time.monotonic():
+                self._pop(key)
+                return _MISSING
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key, value, ttl, namespace):
+        """Store a value; returns the namespaces of the entries evicted to make room."""
+        size = len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        evicted = []
+        if size > self.max_bytes:
+            return evicted
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = (value, size, time.monotonic() + ttl, namespace)
+            self.size += size
+            while self.size > self.max_bytes:
+                _key, (_value, _size, _expires, ns) = self._entries.popitem(last=False)
+                self.size -= _size
+                evicted.append(ns)
+        return evicted
+
+    def discard(self, keys):
+        with self._lock:
+            for key in keys:
+                self._pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def _pop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[1]
+
+
+def _options():
+    return {'MAX_BYTES': 8 * 1024 * 1024, 'TIMEOUT': 10, 'SYNC_INTERVAL': 1, **getattr(settings, 'LOCAL_CACHE', {})}
+
+
+_local = LocalLRU(_options()['MAX_BYTES'])
+_stats = {}
+_sync = {'seq': None, 'checked': 0.0}
+_sync_lock = threading.Lock()
+
+
+def _sync_invalidations():
+    """Evict local copies of keys other workers wrote, if the shared backend logs them."""
+    if not hasattr(cache, 'invalidated_since'):
+        return
+    now = time.monotonic()
+    if now - _sync['checked'] < _options()['SYNC_INTERVAL']:
+        return
+    with _sync_lock:
+        _sync['checked'] = now
+        seq, keys = cache.invalidated_since(_sync['seq'])
+        if _sync['seq'] is not None:
+            if keys is None:
+                _local.clear()
+            else:
+                _local.discard(keys)
+        _sync['seq'] = seq
+
+
+def _fresh_version():
+    # Clock-based, so a re-seeded namespace never reuses an earlier version
+    return int(time.time() * 1000)
+
+
+class Namespace:
+    def __init__(self, name, timeout):
+        self.name = name
+        self.timeout = timeout
+        self.stats = _stats.setdefault(name, Counter())
+
+    def _version_key(self):
+        return f'ns:{self.name}'
+
+    def _version(self):
+        raw = cache.make_key(self._version_key())
+        version = _local.get(raw)
+        if version is _MISSING:
+            version = cache.get(self._version_key())
+            if version is None:
+                # Never read, or evicted: a restart at 1 would revive entries of
+                # versions that were bumped away, so seed it like bump() does
+                seed = _fresh_version()
+                cache.add(self._version_key(), seed, None)
+                version = cache.get(self._version_key(), seed)
+            _local.set(raw, version, _options()['TIMEOUT'], self.name)
+        return version
+
+    def _key(self, key):
+        return f'{self.name}:{self._version()}:{key}'
+
+    def get(self, key, default=None):
+        _sync_invalidations()
+        full_key = self._key(key)
+        raw = cache.make_key(full_key)
+        value = _local.get(raw)
+        if value is not _MISSING:
+            self.stats['local_hits'] += 1
+            metrics.note_cache(True)
+            return value
+        value = cache.get(full_key, _MISSING)
+        if value is _MISSING:
+            self.stats['misses'] += 1
+            metrics.note_cache(False)
+            return default
+        self.stats['shared_hits'] += 1
+        metrics.note_cache(True)
+        self._keep_local(raw, value)
+        return value
+
+    def set(self, key, value, timeout=None):
+        full_key = self._key(key)
+        cache.set(full_key, value, self.timeout if timeout is None else timeout)
+        self._keep_local(cache.make_key(full_key), value)
+
+    def get_or_set(self, key, compute, timeout=None, negative_timeout=None):
+        """
+        Cached value for ``key``, recomputed by a single caller on a miss.
+        A None result (e.g. "no such word") is cached too, for
+        ``negative_timeout`` seconds when given. Exceptions from ``compute``
+        propagate and also drop the stale copy.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        lock_key, stale_key = f'{self.name}:lock:{key}', f'{self.name}:stale:{key}'
+        token = uuid.uuid4().hex
+        if not cache.add(lock_key, token, LOCK_TIMEOUT):
+            stale = cache.get(stale_key, _MISSING)
+            if stale is not _MISSING:
+                self.stats['stale_served'] += 1
+                return stale
+            self.stats['waits'] += 1
+            deadline = time.monotonic() + LOCK_WAIT
+            while time.monotonic() < deadline:
+                time.sleep(LOCK_POLL)
+                value = cache.get(self._key(key), _MISSING)
+                if value is not _MISSING:
+                    return value
+            token = None  # Leader is slow or gone: compute without the lock
+
+        try:
+            self.stats['recomputes'] += 1
+            value = compute()
+        except Exception:
+            cache.delete(stale_key)
+            raise
+        else:
+            if value is None and negative_timeout is not None:
+                timeout = negative_timeout
+            self.set(key, value, timeout)
+            if value is None:
+                # A "not found" must not outlive negative_timeout, nor hide a
+                # value that appears meanwhile
+                cache.delete(stale_key)
+            else:
+                ttl = self.timeout if timeout is None else timeout
+                cache.set(stale_key, value, min(ttl * STALE_FACTOR, STALE_TIMEOUT))
+        finally:
+            if token is not None and cache.get(lock_key) == token:
+                cache.delete(lock_key)
+        return value
+
+    def delete(self, key):
+        full_key = self._key(key)
+        cache.delete(full_key)
+        _local.discard([cache.make_key(full_key)])
+
+    def bump(self):
+        """Invalidate every key of the namespace."""
+        try:
+            cache.incr(self._version_key())
+        except ValueError:
+            # Never read yet, or evicted: any fresh number works as long as it is new
+            cache.set(self._version_key(), _fresh_version(), None)
+        _local.discard([cache.make_key(self._version_key())])
+        self.stats['bumps'] += 1
+
+    def _keep_local(self, raw, value):
+        for ns in _local.set(raw, value, _options()['TIMEOUT'], self.name):
+            _stats.setdefault(ns, Counter())['evictions'] += 1
+
+
+def stats():
+    """
+    {namespace: {local_hits, shared_hits, misses, evictions, bumps,
+    recomputes, stale_served, waits}} for this process.
+    """
+    return {name: dict(counter) for name, counter in _stats.items()}
+
+
+def clear_local():
+    _local.clear()
+
+
+CATEGORIES = Namespace('categories', 60 * 60)
+WORDS = Namespace('words', 60 * 60)
+FEED = Namespace('feed', 30)
+BOT_PAGES = Namespace('bot_pages', 60 * 60 * 6)
@@ -0,0 +1,62 @@
+# core/events.py
+"""
+In-process pub/sub for the notification event stream (core.views.notification_stream).
+
+Each open stream subscribes an asyncio.Queue for its user. Sync code (views,
+the notification worker) publishes from any thread; delivery is handed to the
+subscriber's event loop with ``call_soon_threadsafe``. Nothing is shared
+between processes: a stream also re-reads the unread counter on every
+heartbeat, so clients served by another worker converge within one interval.
+"""
+import asyncio
+import threading
+from collections import defaultdict
+
+# A slow client that falls this far behind gets a resync instead of a backlog
+QUEUE_SIZE = 32
+
+
+class Broker:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def subscribe(self, user_id):
+        queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        entry = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            self._subscribers[user_id].add(entry)
+        return entry
+
+    def unsubscribe(self, user_id, entry):
+        with self._lock:
+            subscribers = self._subscribers.get(user_id)
+            if subscribers is not None:
+                subscribers.discard(entry)
+                if not subscribers:
+                    del self._subscribers[user_id]
+
+    def has_subscribers(self, user_id):
+        return user_id in self._subscribers
+
+    def publish(self, user_id, event):
+        with self._lock:
+            entries = list(self._subscribers.get(user_id, ()))
+        for loop, queue in entries:
+            try:
+                loop.call_soon_threadsafe(_offer, queue, event)
+            except RuntimeError:
+                # Loop already closed; the stream's finally block will unsubscribe
+                pass
+
+
+def _offer(queue, event):
+    try:
+        queue.put_nowait(event)
+    except asyncio.QueueFull:
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait({'type': 'resync'})
+
+
+broker = Broker()
@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core import vote_queue
+
+
+class Command(BaseCommand):
+    help = 'Applies queued write-behind votes (settings.VOTE_WRITE_BEHIND) in batched transactions.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--interval', type=float, default=0,
+            help='Keep running and flush every N seconds (0 = drain the queue once and exit).',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        interval = options['interval']
+
+        while True:
+            applied = 0
+            while True:
+                n = vote_queue.flush_pending(batch_size)
+                applied += n
+                if n < batch_size:
+                    break
+            if applied or not interval:
+                self.stdout.write(f'{applied} oy işlendi.')
+            if not interval:
+                return
+            time.sleep(interval)
@@ -0,0 +1,73 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+# Workers are spawned, not forked: each child sets Django up itself and opens
+# its own database connection. Nothing here may import models at module level,
+# because the children import this module before django.setup().
+
+
+def _init_worker():
+    import django
+    django.setup()
+
+
+def _render_chunk(word_ids):
+    from core import prerender
+
+    words = list(prerender.approved_words().filter(pk__in=word_ids))
+    for word in words:
+        prerender.write(word)
+    return len(words)
+
+
+class Command(BaseCommand):
+    help = (
+        'Pre-renders the bot word detail page of every approved word into '
+        'PRERENDER_DIR using a process pool, and removes files of words that '
+        'are no longer approved.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='Rendering processes; 0 renders in this process.')
+        parser.add_argument('--chunk-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        from django.db import connections
+        from core import prerender
+        from core.models import Word
+
+        if not prerender.enabled():
+            raise CommandError('PRERENDER_DIR ayarlanmamış.')
+
+        approved = dict(Word.objects.filter(status='approved').order_by('pk').values_list('pk', 'slug'))
+        ids = list(approved)
+        size = options['chunk_size']
+        chunks = [ids[i:i + size] for i in range(0, len(ids), size)]
+
+        if options['workers'] == 0:
+            written = sum(map(_render_chunk, chunks))
+        else:
+            connections.close_all()
+            with ProcessPoolExecutor(
+                max_workers=options['workers'],
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+            ) as pool:
+                written = sum(pool.map(_render_chunk, chunks))
+
+        removed = 0
+        slugs = set(approved.values())
+        pages = prerender.page_dir()
+        if pages.is_dir():
+            for path in pages.glob('*.html'):
+                if path.stem not in slugs:
+                    prerender.remove(path.stem)
+                    removed += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{written} sözcük sayfası oluşturuldu, {removed} eski sayfa silindi.'
+        ))
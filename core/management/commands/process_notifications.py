@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core import notifications
+
+
+class Command(BaseCommand):
+    help = "Applies queued notification jobs (settings.NOTIFICATION_DELIVERY = 'queue') in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--interval', type=float, default=0,
+            help='Keep running and poll every N seconds (0 = drain the queue once and exit).',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        interval = options['interval']
+
+        while True:
+            processed = 0
+            while True:
+                n = notifications.process_jobs(batch_size)
+                processed += n
+                if n < batch_size:
+                    break
+            if processed or not interval:
+                self.stdout.write(f'{processed} bildirim işi işlendi.')
+            if not interval:
+                return
+            time.sleep(interval)
@@ -0,0 +1,108 @@
+import datetime
+import json
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from core.models import Notification
+
+ARCHIVE_FIELDS = (
+    'id', 'recipient_id', 'actor_id', 'notification_type', 'word_id', 'comment_id',
+    'challenge_comment_id', 'message', 'actor_count', 'recent_actors', 'timestamp',
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Deletes inactive notifications and read notifications older than '
+        'NOTIFICATION_RETENTION_DAYS in small transactions, then reclaims '
+        'free pages and refreshes planner statistics on SQLite.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.NOTIFICATION_RETENTION_DAYS,
+                            help='Age after which read notifications are removed.')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Rows deleted per transaction.')
+        parser.add_argument('--pause', type=float, default=0.05,
+                            help='Seconds to sleep between batches so writers can get the lock.')
+        parser.add_argument('--archive', metavar='PATH',
+                            help='Append read notifications to this JSON-lines file before deleting them.')
+        parser.add_argument('--vacuum-pages', type=int, default=2000,
+                            help='Free pages returned to the OS per run (incremental auto_vacuum only).')
+        parser.add_argument('--enable-incremental-vacuum', action='store_true',
+                            help='One-off: switch the database to auto_vacuum=INCREMENTAL (runs a full VACUUM).')
+        parser.add_argument('--dry-run', action='store_true', help='Only count what would be removed.')
+
+    def handle(self, *args, **options):
+        if options['days'] < 1:
+            raise CommandError('--days en az 1 olmalı.')
+        cutoff = timezone.now() - datetime.timedelta(days=options['days'])
+
+        inactive = Notification.objects.filter(is_active=False)
+        expired = Notification.objects.filter(is_active=True, is_read=True, timestamp__lt=cutoff)
+
+        if options['dry_run']:
+            self.stdout.write(f'{inactive.count()} pasif, {expired.count()} eski okunmuş bildirim silinecek.')
+            return
+
+        removed_inactive = self.delete_in_batches(inactive, options)
+        removed_expired = self.delete_in_batches(expired, options, archive=options['archive'])
+        self.stdout.write(self.style.SUCCESS(
+            f'{removed_inactive} pasif, {removed_expired} eski okunmuş bildirim silindi.'
+        ))
+
+        if connection.vendor == 'sqlite':
+            self.compact(options)
+
+    def delete_in_batches(self, queryset, options, archive=None):
+        removed = 0
+        archive_file = open(archive, 'a', encoding='utf-8') if archive else None
+        try:
+            while True:
+                # Each batch is its own short transaction; the lock is released between them
+                with transaction.atomic():
+                    ids = list(queryset.order_by('id').values_list('id', flat=True)[:options['batch_size']])
+                    if not ids:
+                        break
+                    if archive_file:
+                        for row in Notification.objects.filter(id__in=ids).values(*ARCHIVE_FIELDS):
+                            archive_file.write(json.dumps(row, default=str, ensure_ascii=False) + '\n')
+                    Notification.objects.filter(id__in=ids).delete()
+                if archive_file:
+                    archive_file.flush()
+                removed += len(ids)
+                if len(ids) < options['batch_size']:
+                    break
+                time.sleep(options['pause'])
+        finally:
+            if archive_file:
+                archive_file.close()
+        return removed
+
+    def compact(self, options):
+        with connection.cursor() as cursor:
+            if options['enable_incremental_vacuum']:
+                cursor.execute('PRAGMA auto_vacuum = INCREMENTAL')
+                cursor.execute('VACUUM')
+
+            cursor.execute('PRAGMA auto_vacuum')
+            mode = cursor.fetchone()[0]
+            if mode == 2:
+                cursor.execute('PRAGMA freelist_count')
+                free_pages = cursor.fetchone()[0]
+                # Bounded so a single run never rewrites the whole file
+                cursor.execute(f'PRAGMA incremental_vacuum({int(options["vacuum_pages"])})')
+                cursor.fetchall()
+                self.stdout.write(f'{min(free_pages, options["vacuum_pages"])} boş sayfa geri verildi.')
+            else:
+                self.stdout.write(
+                    'auto_vacuum kapalı; boş sayfalar yeniden kullanılacak. '
+                    'Dosyayı küçültmek için bir kez --enable-incremental-vacuum ile çalıştırın.'
+                )
+
+            cursor.execute(f'ANALYZE {connection.ops.quote_name(Notification._meta.db_table)}')
+            cursor.execute('PRAGMA optimize')
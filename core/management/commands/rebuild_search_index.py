@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError
+
+from core import search
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the FTS5 word search index from all approved words.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        try:
+            total = search.rebuild_index(chunk_size=options['chunk_size'])
+        except OperationalError as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(self.style.SUCCESS(f'{total} sözcük arama dizinine eklendi.'))
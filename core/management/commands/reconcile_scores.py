@@ -0,0 +1,91 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F, Max, Min, Sum
+
+from core import pagecache
+from core.votes import entity_config
+
+ENTITY_TYPES = ('word', 'comment', 'challenge_comment')
+
+
+class Command(BaseCommand):
+    help = (
+        'Recomputes Word, Comment and ChallengeComment scores from their vote '
+        'tables in primary-key chunks, reports drift and fixes it.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=20000,
+                            help='Primary-key range scanned per query.')
+        parser.add_argument('--only', choices=ENTITY_TYPES, action='append',
+                            help='Limit to one entity type (repeatable).')
+        parser.add_argument('--dry-run', action='store_true', help='Only report drifted rows.')
+
+    def handle(self, *args, **options):
+        for entity_type in options['only'] or ENTITY_TYPES:
+            scanned, drifted = self.reconcile(entity_type, options['chunk_size'], options['dry_run'])
+            model = entity_config(entity_type)[0]
+            verb = 'hatalı' if options['dry_run'] else 'düzeltildi'
+            self.stdout.write(f'{model.__name__}: {scanned} satır tarandı, {drifted} puan {verb}.')
+
+    def reconcile(self, entity_type, chunk_size, dry_run):
+        model, vote_model, fk, _prefix = entity_config(entity_type)
+        fk_column = f'{fk}_id'
+        is_suggestion = entity_type == 'challenge_comment'
+        is_word = entity_type == 'word'
+
+        bounds = model.objects.aggregate(lo=Min('pk'), hi=Max('pk'))
+        if bounds['lo'] is None:
+            return 0, 0
+
+        scanned = drifted = 0
+        # Third column: the challenge to re-rank, or the slug of the cached word
+        fields = ('pk', 'score') + (('challenge_id',) if is_suggestion else ('slug',) if is_word else ())
+        for lo in range(bounds['lo'], bounds['hi'] + 1, chunk_size):
+            hi = lo + chunk_size
+            # Scores and vote totals are read and fixed in one transaction, with the
+            # rows read (and, where supported, locked) first, so a vote committing
+            # in between cannot make a correct score look drifted.
+            with transaction.atomic():
+                rows = list(
+                    model.objects.select_for_update()
+                    .filter(pk__gte=lo, pk__lt=hi).order_by().values_list(*fields)
+                )
+                # One grouped aggregate per chunk, driven by the FK index on the vote table
+                totals = dict(
+                    vote_model.objects
+                    .filter(**{f'{fk_column}__gte': lo, f'{fk_column}__lt': hi})
+                    .order_by()
+                    .values_list(fk_column)
+                    .annotate(total=Sum('value'))
+                )
+
+                challenge_ids, word_slugs = set(), []
+                for row in rows:
+                    scanned += 1
+                    actual = totals.get(row[0], 0)
+                    if row[1] == actual:
+                        continue
+                    if not dry_run:
+                        # cast_vote applies relative deltas, so the fix is one too, and
+                        # only if the score is still the value the drift was measured on
+                        fixed = model.objects.filter(pk=row[0], score=row[1]).update(
+                            score=F('score') + (actual - row[1])
+                        )
+                        if not fixed:
+                            continue
+                    drifted += 1
+                    if is_suggestion:
+                        challenge_ids.add(row[2])
+                    elif is_word:
+                        word_slugs.append(row[2])
+
+                if word_slugs and not dry_run:
+                    # .update() skips Word.save, which would have dropped these
+                    pagecache.forget_word_scores(word_slugs)
+                if challenge_ids and not dry_run:
+                    from challenge.models import TranslationChallenge
+                    for challenge_id in challenge_ids:
+                        TranslationChallenge.refresh_top_suggestion(challenge_id)
+
+        return scanned, drifted
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from core.models import Notification, NotificationCounter
+
+
+class Command(BaseCommand):
+    help = 'Recomputes every NotificationCounter from the notification table and reports drift.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report drifted counters.')
+
+    def handle(self, *args, **options):
+        actual = dict(
+            Notification.objects.filter(is_active=True, is_read=False)
+            .order_by()
+            .values_list('recipient_id')
+            .annotate(n=Count('id'))
+        )
+        stored = dict(NotificationCounter.objects.values_list('user_id', 'unread'))
+
+        stale = [
+            NotificationCounter(user_id=user_id, unread=actual.get(user_id, 0))
+            for user_id, unread in stored.items() if unread != actual.get(user_id, 0)
+        ]
+        missing = [
+            NotificationCounter(user_id=user_id, unread=n)
+            for user_id, n in actual.items() if user_id not in stored
+        ]
+
+        if not options['dry_run']:
+            with transaction.atomic():
+                NotificationCounter.objects.bulk_update(stale, ['unread'], batch_size=500)
+                NotificationCounter.objects.bulk_create(missing, batch_size=500)
+
+        verb = 'hatalı' if options['dry_run'] else 'düzeltildi'
+        self.stdout.write(f'{len(stale) + len(missing)} okunmamış bildirim sayacı {verb}.')
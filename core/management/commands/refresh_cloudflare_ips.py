@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.middleware import fetch_ranges, save_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        'Downloads the current Cloudflare IP ranges and writes them to '
+        'CLOUDFLARE_RANGES_PATH. Running workers reload the file within a few '
+        'seconds of a change; run this once per host (e.g. daily from cron).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default=settings.CLOUDFLARE_RANGES_PATH,
+                            help='Snapshot file to write (default: CLOUDFLARE_RANGES_PATH).')
+        parser.add_argument('--timeout', type=float, default=10,
+                            help='Seconds to wait for cloudflare.com.')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not path:
+            raise CommandError('CLOUDFLARE_RANGES_PATH ayarlanmamış.')
+
+        try:
+            networks = fetch_ranges(timeout=options['timeout'])
+        except (OSError, ValueError) as exc:
+            # The previous snapshot stays in place
+            raise CommandError(f'Cloudflare IP listesi alınamadı: {exc}')
+        if {net.version for net in networks} != {4, 6}:
+            raise CommandError('Cloudflare IP listesi eksik görünüyor; dosya değiştirilmedi.')
+
+        if save_snapshot(path, networks):
+            self.stdout.write(self.style.SUCCESS(f'{len(networks)} Cloudflare IP aralığı {path} dosyasına yazıldı.'))
+        else:
+            self.stdout.write('Cloudflare IP listesi değişmedi.')
@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from core.models import Word, Comment
+from challenge.models import TranslationChallenge, ChallengeComment
+
+
+def _count_of(model, fk):
+    return Coalesce(
+        Subquery(
+            model.objects.filter(**{fk: OuterRef('pk')})
+            .order_by()
+            .values(fk)
+            .annotate(n=Count('id'))
+            .values('n')
+        ),
+        0,
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        'Recomputes Word.comment_count and TranslationChallenge.suggestion_count / '
+        'top_suggestion from their source tables and reports drift.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report drifted words.')
+
+    def handle(self, *args, **options):
+        actual = _count_of(Comment, 'word')
+        drifted = Word.objects.annotate(actual_count=actual).exclude(comment_count=F('actual_count'))
+        drift_count = drifted.count()
+
+        suggestions = _count_of(ChallengeComment, 'challenge')
+        best = (
+            ChallengeComment.objects.filter(challenge=OuterRef('pk'))
+            .order_by('-score', 'timestamp', 'id')
+            .values('id')[:1]
+        )
+        drifted_challenges = (
+            TranslationChallenge.objects
+            .annotate(
+                actual_count=suggestions,
+                stored_top=Coalesce('top_suggestion_id', 0),
+                actual_top=Coalesce(Subquery(best), 0),
+            )
+            .exclude(suggestion_count=F('actual_count'), stored_top=F('actual_top'))
+        )
+        challenge_drift = drifted_challenges.count()
+
+        if options['dry_run'] or not (drift_count or challenge_drift):
+            self.stdout.write(f'{drift_count} sözcüğün yorum sayısı hatalı.')
+            self.stdout.write(f'{challenge_drift} meydan okumanın öneri sayısı hatalı.')
+            return
+
+        with transaction.atomic():
+            # One correlated UPDATE for all drifted rows instead of a save() per row
+            fixed = Word.objects.filter(pk__in=drifted.values('pk')).update(comment_count=actual)
+            fixed_challenges = TranslationChallenge.objects.filter(
+                pk__in=drifted_challenges.values('pk')
+            ).update(suggestion_count=suggestions, top_suggestion=Subquery(best))
+        self.stdout.write(self.style.SUCCESS(f'{fixed} sözcüğün yorum sayısı düzeltildi.'))
+        self.stdout.write(self.style.SUCCESS(f'{fixed_challenges} meydan okumanın öneri sayısı düzeltildi.'))
@@ -0,0 +1,220 @@
+# core/metrics.py
+"""
+Per-view request metrics in Prometheus text format.
+
+``MetricsMiddleware`` records, for every request that resolved to a URL
+name, the wall time, the number and total time of database queries, the
+core.cachelayer hits and misses, and the response size. Histograms use
+fixed buckets and are kept as cumulative bucket counts, so every sample is
+a plain counter and samples from several workers simply add up.
+
+With settings.METRICS_PATH set, each worker adds its counts to a shared
+SQLite file every FLUSH_INTERVAL seconds and /metrics reports the sum over
+all workers; without it /metrics shows this process only. Streaming
+responses (SSE, sitemaps) are measured up to the point the response is
+returned, and have no size.
+"""
+import logging
+import sqlite3
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+PREFIX = 'yenisozcukler_'
+FLUSH_INTERVAL = 5
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+# family -> (type, help, buckets)
+FAMILIES = {
+    'request_duration_seconds': ('histogram', 'Wall time of a request.', DURATION_BUCKETS),
+    'db_queries': ('histogram', 'Database queries per request.', QUERY_BUCKETS),
+    'db_duration_seconds': ('histogram', 'Time spent in database queries per request.', DURATION_BUCKETS),
+    'response_size_bytes': ('histogram', 'Size of non-streaming response bodies.', SIZE_BUCKETS),
+    'cache_hits_total': ('counter', 'core.cachelayer lookups answered from the cache.', None),
+    'cache_misses_total': ('counter', 'core.cachelayer lookups that missed.', None),
+}
+_SUFFIX_ORDER = {'_bucket': 0, '_sum': 1, '_count': 2, '': 3}
+
+# (family, suffix, view, le) -> value; le is '' except for buckets
+_pending = Counter()
+_lock = threading.Lock()
+_flush = {'next': 0.0}
+
+_current = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    """Counts of one request; also the database execute wrapper that fills them."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_seconds += time.perf_counter() - start
+
+
+def note_cache(hit):
+    """Called by core.cachelayer on every lookup."""
+    current = _current.get()
+    if current is not None:
+        if hit:
+            current.cache_hits += 1
+        else:
+            current.cache_misses += 1
+
+
+def _observe(samples, family, view, value):
+    for bound in FAMILIES[family][2]:
+        # Buckets above the value get an explicit 0, so every view exposes all of them
+        samples[family, '_bucket', view, str(bound)] += value <= bound
+    samples[family, '_bucket', view, '+Inf'] += 1
+    samples[family, '_sum', view, ''] += value
+    samples[family, '_count', view, ''] += 1
+
+
+def record(view, seconds, current, size=None):
+    samples = Counter()
+    _observe(samples, 'request_duration_seconds', view, seconds)
+    _observe(samples, 'db_queries', view, current.queries)
+    _observe(samples, 'db_duration_seconds', view, current.db_seconds)
+    if size is not None:
+        _observe(samples, 'response_size_bytes', view, size)
+    if current.cache_hits:
+        samples['cache_hits_total', '', view, ''] += current.cache_hits
+    if current.cache_misses:
+        samples['cache_misses_total', '', view, ''] += current.cache_misses
+    with _lock:
+        _pending.update(samples)
+    if settings.METRICS_PATH and time.monotonic() >= _flush['next']:
+        flush()
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        current = RequestMetrics()
+        token = _current.set(current)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(current))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        seconds = time.perf_counter() - start
+
+        match = getattr(request, 'resolver_match', None)
+        if match is not None:
+            size = None if response.streaming else len(response.content)
+            record(match.url_name or match.view_name, seconds, current, size)
+        return response
+
+
+# --- shared file ---
+
+def _connect(path):
+    db = sqlite3.connect(path, timeout=5)
+    db.execute('PRAGMA journal_mode=WAL')
+    db.execute(
+        'CREATE TABLE IF NOT EXISTS samples ('
+        'family TEXT, suffix TEXT, view TEXT, le TEXT, value REAL NOT NULL, '
+        'PRIMARY KEY (family, suffix, view, le))'
+    )
+    return db
+
+
+def flush():
+    """Add this worker's counts since the last flush to METRICS_PATH."""
+    path = settings.METRICS_PATH
+    with _lock:
+        _flush['next'] = time.monotonic() + FLUSH_INTERVAL
+        samples = dict(_pending)
+        _pending.clear()
+    if not samples:
+        return
+    try:
+        db = _connect(path)
+        try:
+            with db:
+                db.executemany(
+                    'INSERT INTO samples VALUES (?, ?, ?, ?, ?) '
+                    'ON CONFLICT (family, suffix, view, le) DO UPDATE SET value = value + excluded.value',
+                    [(*key, value) for key, value in samples.items()],
+                )
+        finally:
+            db.close()
+    except sqlite3.Error as exc:
+        logger.warning('Could not write metrics to %s, keeping them for the next flush: %s', path, exc)
+        with _lock:
+            _pending.update(samples)
+
+
+def collect():
+    """Every sample, summed over all workers when METRICS_PATH is set."""
+    path = settings.METRICS_PATH
+    if not path:
+        with _lock:
+            return dict(_pending)
+    flush()
+    db = _connect(path)
+    try:
+        return {tuple(row[:4]): row[4] for row in db.execute('SELECT * FROM samples')}
+    finally:
+        db.close()
+
+
+def reset():
+    with _lock:
+        _pending.clear()
+
+
+# --- exposition ---
+
+def _number(value):
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _labels(view, le):
+    view = view.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return f'{{view="{view}",le="{le}"}}' if le else f'{{view="{view}"}}'
+
+
+def render(samples):
+    """Prometheus text exposition format (version 0.0.4)."""
+    lines = []
+    for family, (kind, help_text, _buckets) in FAMILIES.items():
+        rows = sorted(
+            (key for key in samples if key[0] == family),
+            key=lambda key: (key[2], _SUFFIX_ORDER[key[1]], float(key[3] or 0)),
+        )
+        if not rows:
+            continue
+        name = PREFIX + family
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for key in rows:
+            _family, suffix, view, le = key
+            lines.append(f'{name}{suffix}{_labels(view, le)} {_number(samples[key])}')
+    return '\n'.join(lines) + '\n'
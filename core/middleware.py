@@ -1,8 +1,13 @@
 import ipaddress
 import logging
-import threading
+import os
+import socket
+import tempfile
 import time
 import urllib.request
+from bisect import bisect_right
+from functools import lru_cache
+
 from django.http import HttpResponseForbidden
 from django.conf import settings
 
@@ -10,9 +15,10 @@ logger = logging.getLogger(__name__)
 
 _CF_IPV4_URL = 'https://www.cloudflare.com/ips-v4'
 _CF_IPV6_URL = 'https://www.cloudflare.com/ips-v6'
-_CF_REFRESH_SECONDS = 86400  # refresh daily
+# Seconds between checks of the snapshot file for changes
+_CF_RELOAD_CHECK_SECONDS = 5
 
-# Last-known-good fallback used when the live fetch fails
+# Used until a snapshot (settings.CLOUDFLARE_RANGES_PATH) has been written
 _FALLBACK_RANGES = [
     # IPv4
     '173.245.48.0/20', '103.21.244.0/22', '103.22.200.0/22',
@@ -27,56 +33,152 @@ _FALLBACK_RANGES = [
 ]
 
 
+# Verdicts memoized per address string; the REMOTE_ADDR of proxied traffic
+# is one of a few hundred Cloudflare edge servers.
+_VERDICT_CACHE_SIZE = 4096
+
+_FAMILIES = ((socket.AF_INET, 4), (socket.AF_INET6, 6))
+
+
+def _merge(ranges):
+    """Sorted, non-overlapping (starts, ends) tuples from inclusive integer ranges."""
+    starts, ends = [], []
+    for first, last in sorted(ranges):
+        if ends and first <= ends[-1] + 1:
+            ends[-1] = max(ends[-1], last)
+        else:
+            starts.append(first)
+            ends.append(last)
+    return tuple(starts), tuple(ends)
+
+
+class _RangeTable:
+    """
+    Immutable lookup table for a list of networks: per address family the
+    merged ranges as integers, searched with bisect. Never modified after
+    construction, so readers need no lock; a refresh builds a new table.
+    """
+
+    def __init__(self, networks):
+        by_version = {4: [], 6: []}
+        for net in networks:
+            by_version[net.version].append((int(net.network_address), int(net.broadcast_address)))
+        self._ranges = {version: _merge(ranges) for version, ranges in by_version.items()}
+        self.size = len(networks)
+        # The verdict cache lives and dies with the table it was computed from
+        self.contains = lru_cache(maxsize=_VERDICT_CACHE_SIZE)(self._lookup)
+
+    def _lookup(self, ip_str):
+        # inet_pton is an order of magnitude faster than ipaddress.ip_address
+        for family, version in _FAMILIES:
+            try:
+                value = int.from_bytes(socket.inet_pton(family, ip_str), 'big')
+            except (OSError, ValueError, TypeError):
+                continue
+            starts, ends = self._ranges[version]
+            i = bisect_right(starts, value) - 1
+            return i >= 0 and value <= ends[i]
+        return False
+
+
+def parse_ranges(lines):
+    """Networks from CIDR lines; blank lines and '#' comments are skipped."""
+    networks = []
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            networks.append(ipaddress.ip_network(line))
+    if not networks:
+        raise ValueError('no ranges')
+    return networks
+
+
+def fetch_ranges(timeout=5):
+    """The current ranges from cloudflare.com (manage.py refresh_cloudflare_ips)."""
+    lines = []
+    for url in (_CF_IPV4_URL, _CF_IPV6_URL):
+        with urllib.request.urlopen(url, timeout=timeout) as resp:
+            lines.extend(resp.read().decode('utf-8').splitlines())
+    return parse_ranges(lines)
+
+
+def load_snapshot(path):
+    with open(path, encoding='utf-8') as f:
+        return parse_ranges(f)
+
+
+def save_snapshot(path, networks):
+    """Write the snapshot atomically; returns False if the file already had this content."""
+    data = ''.join(f'{net}\n' for net in networks).encode()
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    # Workers read the old file or the new one, never a partial write
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        # mkstemp creates 0600; cron and the workers may run as different users
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return True
+
+
 class _CfIpCache:
-    """Holds Cloudflare IP networks, refreshed daily in a background thread."""
+    """
+    Holds the Cloudflare IP ranges. Each worker loads the snapshot file at
+    settings.CLOUDFLARE_RANGES_PATH on its first request and swaps in a new
+    table whenever the file changes; the file itself is only rewritten by
+    ``manage.py refresh_cloudflare_ips``. Requests never touch the network.
+    """
 
     def __init__(self):
-        self._networks = [ipaddress.ip_network(r) for r in _FALLBACK_RANGES]
-        self._lock = threading.Lock()
-        self._last_refreshed = 0.0
-        self._refresh_in_progress = False
+        self._table = _RangeTable(parse_ranges(_FALLBACK_RANGES))
+        self._stamp = None  # (mtime_ns, size, inode) of the snapshot last looked at
+        self._next_check = 0.0
 
     def contains(self, ip_str):
-        self._maybe_refresh()
+        if time.monotonic() >= self._next_check:
+            self._reload_if_changed()
+        return self._table.contains(ip_str)
+
+    def _reload_if_changed(self):
+        self._next_check = time.monotonic() + _CF_RELOAD_CHECK_SECONDS
+        path = settings.CLOUDFLARE_RANGES_PATH
+        if not path:
+            return
         try:
-            ip = ipaddress.ip_address(ip_str)
-            with self._lock:
-                return any(ip in net for net in self._networks)
-        except ValueError:
-            return False
-
-    def _maybe_refresh(self):
-        if time.monotonic() - self._last_refreshed < _CF_REFRESH_SECONDS:
+            st = os.stat(path)
+        except OSError:
             return
-        if self._refresh_in_progress:
+        stamp = (st.st_mtime_ns, st.st_size, st.st_ino)
+        if stamp == self._stamp:
             return
-        self._refresh_in_progress = True
-        t = threading.Thread(target=self._do_refresh, daemon=True)
-        t.start()
-
-    def _do_refresh(self):
+        # Recorded before loading, so a broken file is not re-read until it changes
+        self._stamp = stamp
         try:
-            ranges = []
-            for url in (_CF_IPV4_URL, _CF_IPV6_URL):
-                with urllib.request.urlopen(url, timeout=5) as resp:
-                    body = resp.read().decode('utf-8')
-                    ranges.extend(
-                        line.strip() for line in body.splitlines() if line.strip()
-                    )
-            networks = [ipaddress.ip_network(r) for r in ranges]
-            with self._lock:
-                self._networks = networks
-                self._last_refreshed = time.monotonic()
-            logger.debug('Cloudflare IP list refreshed (%d networks)', len(networks))
-        except Exception as exc:
-            logger.warning('Could not refresh Cloudflare IP list, keeping previous: %s', exc)
-        finally:
-            self._refresh_in_progress = False
+            table = _RangeTable(load_snapshot(path))
+        except (OSError, ValueError) as exc:
+            logger.warning('Could not load Cloudflare IP snapshot %s, keeping previous: %s', path, exc)
+            return
+        # A single attribute assignment: requests see the old table or the new one
+        self._table = table
+        logger.debug('Cloudflare IP snapshot loaded (%d networks)', table.size)
 
 
 _cf_cache = _CfIpCache()
 
 
+def _is_cloudflare_ip(ip):
+    return _cf_cache.contains(ip)
+
+
 class CloudflareSecurityMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
@@ -102,7 +204,7 @@ class CloudflareSecurityMiddleware:
         # 2. The actual TCP connection must originate from a real Cloudflare server.
         #    Without this check an attacker who knows the origin IP can bypass rate
         #    limits by forging a fake CF-Connecting-IP header.
-        if not _cf_cache.contains(remote_addr):
+        if not _is_cloudflare_ip(remote_addr):
             return HttpResponseForbidden("Erişim Engellendi.")
 
         return self._add_security_headers(self.get_response(request))
@@ -0,0 +1,59 @@
+from django.db import migrations
+
+
+FTS_TABLE = 'core_word_fts'
+
+# Frozen copy of core.models.TURKISH_CHAR_MAP
+TURKISH_CHAR_MAP = {
+    'ç': 'c', 'ğ': 'g', 'ı': 'i', 'ö': 'o', 'ş': 's', 'ü': 'u',
+    'â': 'a', 'î': 'i', 'û': 'u',
+}
+
+
+def _fold(text):
+    text = (text or '').replace('I', 'ı').replace('İ', 'i').lower()
+    for tr, en in TURKISH_CHAR_MAP.items():
+        text = text.replace(tr, en)
+    return text
+
+
+def create_fts_index(apps, schema_editor):
+    # FTS5 is SQLite-only; other backends keep using icontains (see core/search.py)
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+
+    Word = apps.get_model('core', 'Word')
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        "word, definition, etymology, example, "
+        "tokenize = 'unicode61 remove_diacritics 2')"
+    )
+
+    rows = [
+        (w.id, _fold(w.word), _fold(w.definition), _fold(w.etymology), _fold(w.example))
+        for w in Word.objects.filter(status='approved').iterator()
+    ]
+    if rows:
+        with schema_editor.connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {FTS_TABLE} (rowid, word, definition, etymology, example) '
+                'VALUES (%s, %s, %s, %s, %s)',
+                rows,
+            )
+
+
+def drop_fts_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0025_remove_notification_core_notifi_recipie_b4f908_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_index, drop_fts_index),
+    ]
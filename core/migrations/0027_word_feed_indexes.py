@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0026_word_fts'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='word',
+            index=models.Index(fields=['status', 'timestamp', 'id'], name='core_word_status_ef76ed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='word',
+            index=models.Index(fields=['status', 'score', 'timestamp', 'id'], name='core_word_status_c3454e_idx'),
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('challenge', '0008_rename_challenge_cc_challenge_score_idx_core_challe_challen_ff213f_idx'),
+        ('core', '0027_word_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['recipient', 'is_active', '-timestamp', '-id'], name='core_notifi_recipie_bd42d4_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_comment_count(apps, schema_editor):
+    Word = apps.get_model('core', 'Word')
+    Comment = apps.get_model('core', 'Comment')
+    counts = (
+        Comment.objects.filter(word=OuterRef('pk'))
+        .order_by()
+        .values('word')
+        .annotate(n=Count('id'))
+        .values('n')
+    )
+    Word.objects.update(comment_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0028_notification_seek_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='word',
+            name='comment_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_comment_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0029_word_comment_count'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VoteIntent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity_type', models.CharField(choices=[('word', 'Word'), ('comment', 'Comment'), ('challenge_comment', 'Challenge Comment')], max_length=20)),
+                ('entity_id', models.BigIntegerField()),
+                ('value', models.SmallIntegerField(choices=[(1, 'Like'), (-1, 'Dislike')])),
+                ('ip_address', models.GenericIPAddressField(blank=True, null=True)),
+                ('timestamp', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['entity_type', 'entity_id', 'user'], name='core_votein_entity__21c70f_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,76 @@
+from itertools import groupby
+
+from django.conf import settings
+from django.db import migrations, models
+
+# Frozen copy of the vote notification types and their target column
+VOTE_TYPES = {
+    'word_like': 'word_id',
+    'word_dislike': 'word_id',
+    'comment_like': 'comment_id',
+    'comment_dislike': 'comment_id',
+    'challenge_like': 'challenge_comment_id',
+    'challenge_dislike': 'challenge_comment_id',
+}
+RECENT_ACTORS_LIMIT = 3
+
+
+def collapse_vote_notifications(apps, schema_editor):
+    """Fold the per-actor rows of every (recipient, type, target) into one roll-up row."""
+    Notification = apps.get_model('core', 'Notification')
+
+    for notification_type, field in VOTE_TYPES.items():
+        rows = (
+            Notification.objects.filter(notification_type=notification_type, **{f'{field}__isnull': False})
+            .order_by('recipient_id', field, '-is_active', '-timestamp', '-id')
+            .values('id', 'recipient_id', field, 'is_active', 'is_read', 'actor__username')
+        )
+        doomed = []
+        for (recipient_id, target_id), group in groupby(
+            rows.iterator(), key=lambda r: (r['recipient_id'], r[field])
+        ):
+            group = list(group)
+            keeper, active = group[0], [r for r in group if r['is_active']]
+            Notification.objects.filter(pk=keeper['id']).update(
+                group_key=f'{notification_type}:{field}={target_id}',
+                actor_count=len(active),
+                recent_actors=[r['actor__username'] for r in active if r['actor__username']][:RECENT_ACTORS_LIMIT],
+                is_active=bool(active),
+                is_read=all(r['is_read'] for r in active),
+            )
+            doomed.extend(r['id'] for r in group[1:])
+
+        for i in range(0, len(doomed), 500):
+            Notification.objects.filter(pk__in=doomed[i:i + 500]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('challenge', '0009_challenge_suggestion_denorm'),
+        ('core', '0030_vote_intent'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='actor_count',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='group_key',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='recent_actors',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.RunPython(collapse_vote_notifications, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='notification',
+            constraint=models.UniqueConstraint(fields=('recipient', 'group_key'), name='unique_notification_group'),
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0033_notification_counter'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='payload',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
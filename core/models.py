@@ -1,8 +1,9 @@
 from django.db import models
 from django.contrib.auth.models import User
-from django.core.cache import cache
 import re
 
+from .cachelayer import BOT_PAGES, CATEGORIES, FEED, WORDS
+
 
 TURKISH_CHAR_MAP = {
     'ç': 'c', 'ğ': 'g', 'ı': 'i', 'ö': 'o', 'ş': 's', 'ü': 'u',
@@ -55,6 +56,18 @@ class Category(models.Model):
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Categories are embedded in every cached word and feed page
+        for namespace in (CATEGORIES, WORDS, FEED, BOT_PAGES):
+            namespace.bump()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        for namespace in (CATEGORIES, WORDS, FEED, BOT_PAGES):
+            namespace.bump()
+        return result
+
 class Word(models.Model):
     STATUS_CHOICES = [
         ('pending', 'Pending'),
@@ -91,6 +104,16 @@ class Word(models.Model):
     timestamp = models.DateTimeField(auto_now_add=True, db_index=True)
 
     score = models.IntegerField(default=0, db_index=True)
+    # Denormalized Comment count, kept in step by core.signals; repair with
+    # `manage.py repair_comment_counts`
+    comment_count = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # Seek indexes for the keyset-paginated feed (see WORD_FEED_ORDERINGS)
+            models.Index(fields=['status', 'timestamp', 'id']),
+            models.Index(fields=['status', 'score', 'timestamp', 'id']),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.slug:
@@ -100,15 +123,15 @@ class Word(models.Model):
         
         # Cache Invalidation: Clear this specific word's cache when edited or approved
         if self.slug:
-            cache.delete(f'word_slug_{self.slug}')
-        # Also clear the global approved words count so the feed stays accurate
-        cache.delete('total_approved_words_count_all')
+            WORDS.delete(self.slug)
+        # Also drop every cached feed page and the approved words count
+        FEED.bump()
 
     def delete(self, *args, **kwargs):
         # Cache Invalidation: Clear cache when a word is deleted (e.g. by an admin)
         if self.slug:
-            cache.delete(f'word_slug_{self.slug}')
-        cache.delete('total_approved_words_count_all')
+            WORDS.delete(self.slug)
+        FEED.bump()
         
         super().delete(*args, **kwargs)
 
@@ -200,6 +223,34 @@ class CommentVote(models.Model):
         unique_together = ('user', 'comment')
 
 
+class VoteIntent(models.Model):
+    """
+    A like/dislike click waiting to be applied by ``manage.py flush_votes``.
+    Only used when settings.VOTE_WRITE_BEHIND is on (see core.vote_queue).
+    """
+    ENTITY_CHOICES = [
+        ('word', 'Word'),
+        ('comment', 'Comment'),
+        ('challenge_comment', 'Challenge Comment'),
+    ]
+    VALUE_CHOICES = [
+        (1, 'Like'),
+        (-1, 'Dislike')
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    entity_type = models.CharField(max_length=20, choices=ENTITY_CHOICES)
+    entity_id = models.BigIntegerField()
+    value = models.SmallIntegerField(choices=VALUE_CHOICES)
+    ip_address = models.GenericIPAddressField(null=True, blank=True)
+    timestamp = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['entity_type', 'entity_id', 'user']),
+        ]
+
+
 class Notification(models.Model):
     TYPE_CHOICES = [
         ('word_like', 'Word Like'),
@@ -238,11 +289,46 @@ class Notification(models.Model):
     is_active = models.BooleanField(default=True, db_index=True)  # <-- NEW FIELD
     timestamp = models.DateTimeField(auto_now_add=True, db_index=True)
 
+    # Like/dislike roll-ups: one row per (recipient, type, target), see core.notifications
+    group_key = models.CharField(max_length=64, null=True, blank=True)
+    actor_count = models.PositiveIntegerField(default=1)
+    recent_actors = models.JSONField(default=list, blank=True)
+
+    # Display fields frozen at creation (actor name, word text, challenge
+    # texts), read instead of joining when NOTIFICATION_FROZEN_PAYLOAD is on
+    payload = models.JSONField(null=True, blank=True)
+
     class Meta:
         ordering = ['-timestamp']
+        constraints = [
+            models.UniqueConstraint(fields=['recipient', 'group_key'], name='unique_notification_group'),
+        ]
         indexes = [
             models.Index(fields=['recipient','is_active', 'is_read', '-timestamp']),
+            # Seek index for the keyset-paginated notification list
+            models.Index(fields=['recipient', 'is_active', '-timestamp', '-id']),
         ]
 
     def __str__(self):
-        return f"{self.notification_type} -> {self.recipient.username}"
\ No newline at end of file
+        return f"{self.notification_type} -> {self.recipient.username}"
+
+
+class NotificationJob(models.Model):
+    """
+    A queued notification write, applied by ``manage.py process_notifications``
+    when settings.NOTIFICATION_DELIVERY is 'queue' (see core.notifications).
+    """
+    KIND_CHOICES = [
+        ('create', 'Create'),
+        ('vote', 'Vote roll-up'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    payload = models.JSONField()
+    timestamp = models.DateTimeField(auto_now_add=True)
+
+
+class NotificationCounter(models.Model):
+    """Per-user unread notification total, kept in step by core.notifications."""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='+')
+    unread = models.IntegerField(default=0)
@@ -0,0 +1,329 @@
+# core/notifications.py
+"""
+Notification delivery.
+
+Every notification is written through ``notify``/``notify_many`` (plain
+events) or ``sync_vote_notification`` (like/dislike roll-ups). With
+settings.NOTIFICATION_DELIVERY = 'queue' these only append NotificationJob
+rows and ``manage.py process_notifications`` applies them in batches;
+the default 'inline' writes immediately.
+
+Like/dislike notifications are rolled up: there is one row per
+(recipient, type, target), identified by ``group_key``, holding how many
+people currently vote that way (``actor_count``) and the most recent of them
+(``recent_actors``). A vote updates that row in place instead of adding one.
+
+Each user's unread total lives in NotificationCounter and is adjusted next to
+every write that changes it (``adjust_unread``), so reading it is a single
+primary-key lookup. ``manage.py reconcile_unread_counts`` repairs drift.
+
+Changes are announced on commit to open notification streams (core.events).
+
+Every new row also gets a frozen display ``payload`` (``freeze_payloads``) so
+the list can be served without joins; only the challenge timer, which changes
+over time, is looked up at read time (``challenge_timers``).
+"""
+import logging
+from collections import Counter
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .events import broker
+from .models import Word, Comment, Notification, NotificationJob, NotificationCounter
+
+logger = logging.getLogger(__name__)
+
+RECENT_ACTORS_LIMIT = 3
+
+# Columns a plain notification event may set
+EVENT_FIELDS = (
+    'recipient_id', 'actor_id', 'notification_type', 'message',
+    'word_id', 'comment_id', 'challenge_comment_id',
+)
+
+# Keys of Notification.payload; values that are None are left out
+FROZEN_FIELDS = (
+    'actor_username', 'word_text', 'word_def', 'word_example', 'word_etymology',
+    'challenge_id', 'challenge_foreign_word', 'challenge_meaning', 'challenge_suggested_word',
+)
+
+
+def freeze_payloads(notifications):
+    """Fill ``payload`` on the given (saved or unsaved) notifications with one lookup per related table."""
+    from django.contrib.auth.models import User
+    from challenge.models import ChallengeComment
+
+    def ids(field):
+        return {getattr(n, field) for n in notifications if getattr(n, field)}
+
+    actor_ids, word_ids, suggestion_ids = ids('actor_id'), ids('word_id'), ids('challenge_comment_id')
+    usernames = dict(User.objects.filter(pk__in=actor_ids).values_list('pk', 'username')) if actor_ids else {}
+    words = Word.objects.only('word', 'definition', 'example', 'etymology').in_bulk(word_ids) if word_ids else {}
+    suggestions = ChallengeComment.objects.select_related('challenge').only(
+        'suggested_word', 'challenge__foreign_word', 'challenge__meaning'
+    ).in_bulk(suggestion_ids) if suggestion_ids else {}
+
+    for notif in notifications:
+        values = {'actor_username': usernames.get(notif.actor_id)}
+        word = words.get(notif.word_id)
+        if word is not None:
+            values.update(
+                word_text=word.word, word_def=word.definition,
+                word_example=word.example, word_etymology=word.etymology,
+            )
+        suggestion = suggestions.get(notif.challenge_comment_id)
+        if suggestion is not None:
+            values.update(
+                challenge_id=suggestion.challenge_id,
+                challenge_foreign_word=suggestion.challenge.foreign_word,
+                challenge_meaning=suggestion.challenge.meaning,
+                challenge_suggested_word=suggestion.suggested_word,
+            )
+        notif.payload = {k: v for k, v in values.items() if v is not None}
+    return notifications
+
+
+def challenge_timers(notifications):
+    """{challenge id: TranslationChallenge with just the timer columns} for frozen payloads."""
+    from challenge.models import TranslationChallenge
+
+    ids = {(n.payload or {}).get('challenge_id') for n in notifications} - {None}
+    if not ids:
+        return {}
+    return TranslationChallenge.objects.only('timer_on', 'timer_started_at').in_bulk(ids)
+
+
+def unread_count(user_id):
+    unread = NotificationCounter.objects.filter(pk=user_id).values_list('unread', flat=True).first()
+    return max(unread or 0, 0)
+
+
+def _announce(user_id, notification_id=None):
+    """Tell this process's open streams for ``user_id`` to refresh, once the write commits."""
+    if not broker.has_subscribers(user_id):
+        return
+    event = {'type': 'notification', 'id': notification_id} if notification_id else {'type': 'unread'}
+    transaction.on_commit(lambda: broker.publish(user_id, event))
+
+
+def adjust_unread(user_id, delta):
+    """Apply ``delta`` to a user's unread counter; call after the notification write."""
+    if not delta:
+        return
+    updated = NotificationCounter.objects.filter(pk=user_id).update(unread=F('unread') + delta)
+    if not updated and delta > 0:
+        # No counter yet: seed it from the table, which already includes this write
+        NotificationCounter.objects.get_or_create(
+            user_id=user_id,
+            defaults={'unread': Notification.objects.filter(
+                recipient_id=user_id, is_active=True, is_read=False
+            ).count()},
+        )
+    _announce(user_id)
+
+
+def _queued():
+    return settings.NOTIFICATION_DELIVERY == 'queue'
+
+
+def event(recipient, notification_type, actor=None, message='', word=None, comment=None,
+           challenge_comment=None):
+    return {
+        'recipient_id': recipient.pk,
+        'actor_id': actor.pk if actor else None,
+        'notification_type': notification_type,
+        'message': message,
+        'word_id': word.pk if word else None,
+        'comment_id': comment.pk if comment else None,
+        'challenge_comment_id': challenge_comment.pk if challenge_comment else None,
+    }
+
+
+def notify(recipient, notification_type, **kwargs):
+    """Create one notification (``actor``, ``message``, ``word``, ``comment``, ``challenge_comment``)."""
+    notify_many([event(recipient, notification_type, **kwargs)])
+
+
+def notify_many(events):
+    """Create notifications from event dicts (see ``event``), e.g. from admin bulk actions."""
+    events = list(events)
+    if not events:
+        return
+    if _queued():
+        NotificationJob.objects.bulk_create([NotificationJob(kind='create', payload=e) for e in events])
+        return
+    for notif in Notification.objects.bulk_create(freeze_payloads([Notification(**e) for e in events])):
+        _announce(notif.recipient_id, notif.pk)
+    for user_id, n in Counter(e['recipient_id'] for e in events).items():
+        adjust_unread(user_id, n)
+
+
+def vote_group_key(notification_type, target):
+    """e.g. ('word_like', {'word_id': 12}) -> 'word_like:word_id=12'"""
+    (field, value), = target.items()
+    return f'{notification_type}:{field}={value}'
+
+
+def _add_actor(owner, actor, notification_type, target, defaults):
+    """Returns the change in the owner's unread count."""
+    key = vote_group_key(notification_type, target)
+    try:
+        with transaction.atomic():
+            notif, created = Notification.objects.get_or_create(
+                recipient=owner, group_key=key,
+                defaults={
+                    **(defaults or {}), **target,
+                    'notification_type': notification_type,
+                    'actor': actor,
+                    'actor_count': 1,
+                    'recent_actors': [actor.username],
+                },
+            )
+    except IntegrityError:
+        # Lost a creation race; the row exists now
+        notif, created = Notification.objects.get(recipient=owner, group_key=key), False
+    _announce(owner.pk, notif.pk)
+    if created:
+        freeze_payloads([notif])
+        notif.save(update_fields=['payload'])
+        return 1
+
+    # Counts and flags change in conditional UPDATEs; which one matched tells the
+    # row's real state, so concurrent voters cannot lose counts or skew the delta.
+    rows = Notification.objects.filter(pk=notif.pk)
+    changes = {'actor': actor, 'is_read': False, 'timestamp': timezone.now()}  # Mark unread so they see it again
+    with transaction.atomic():
+        if rows.filter(is_active=False).update(is_active=True, actor_count=1, **changes):
+            delta = 1
+        elif rows.filter(is_read=True).update(actor_count=F('actor_count') + 1, **changes):
+            delta = 1
+        elif rows.update(actor_count=F('actor_count') + 1, **changes):
+            delta = 0
+        else:
+            return 0
+        # The row is locked by the UPDATE now, so this read is current
+        notif = rows.get()
+        recent = [actor.username] + [name for name in notif.recent_actors if name != actor.username]
+        if notif.payload is not None:
+            notif.payload['actor_username'] = actor.username
+        rows.update(recent_actors=recent[:RECENT_ACTORS_LIMIT], payload=notif.payload)
+    return delta
+
+
+def _remove_actor(owner, actor, notification_type, target):
+    """Returns the change in the owner's unread count."""
+    group = Notification.objects.filter(recipient=owner, group_key=vote_group_key(notification_type, target))
+    with transaction.atomic():
+        # SOFT DELETE: the last actor leaving keeps the row (inactive), revived by the next vote.
+        leaving = group.filter(is_active=True, actor_count__lte=1)
+        if leaving.filter(is_read=False).update(actor_count=0, is_active=False):
+            delta = -1
+        elif leaving.update(actor_count=0, is_active=False):
+            delta = 0
+        elif group.filter(is_active=True).update(actor_count=F('actor_count') - 1):
+            delta = 0
+        else:
+            return 0
+        notif = group.get()
+        group.update(recent_actors=[name for name in notif.recent_actors if name != actor.username])
+    return delta
+
+
+def sync_vote_notification(owner, actor, prefix, old_value, new_value, target, defaults=None):
+    """
+    Move ``actor`` between the like/dislike roll-ups of one target after
+    their vote changed from ``old_value`` to ``new_value`` (1, -1 or None).
+
+    ``prefix`` is 'word', 'comment' or 'challenge'; ``target`` holds the id of
+    the voted object (e.g. ``{'word_id': 12}``) and ``defaults`` any extra
+    columns for a newly created row.
+    """
+    if not owner or not actor or owner == actor or old_value == new_value:
+        return
+
+    if _queued():
+        NotificationJob.objects.create(kind='vote', payload={
+            'owner_id': owner.pk, 'actor_id': actor.pk, 'prefix': prefix,
+            'old_value': old_value, 'new_value': new_value,
+            'target': target, 'defaults': defaults,
+        })
+        return
+
+    adjust_unread(owner.pk, _apply_vote_change(owner, actor, prefix, old_value, new_value, target, defaults))
+
+
+def _apply_vote_change(owner, actor, prefix, old_value, new_value, target, defaults):
+    kinds = {1: f'{prefix}_like', -1: f'{prefix}_dislike'}
+    delta = 0
+    if old_value is not None:
+        delta += _remove_actor(owner, actor, kinds[old_value], target)
+    if new_value is not None:
+        delta += _add_actor(owner, actor, kinds[new_value], target, defaults)
+    return delta
+
+
+def _existing_ids(model, ids):
+    ids = {i for i in ids if i is not None}
+    return set(model.objects.filter(pk__in=ids).values_list('pk', flat=True)) if ids else set()
+
+
+def process_jobs(batch_size=500):
+    """
+    Apply up to ``batch_size`` queued NotificationJob rows in one transaction:
+    plain events go through a single bulk_create and every touched recipient's
+    unread counter is adjusted once. Returns the number of jobs handled.
+    """
+    from django.contrib.auth.models import User
+    from challenge.models import ChallengeComment
+
+    with transaction.atomic():
+        jobs = list(NotificationJob.objects.order_by('id')[:batch_size])
+        if not jobs:
+            return 0
+
+        payloads = [job.payload for job in jobs]
+        users = User.objects.in_bulk({
+            uid for p in payloads
+            for uid in (p.get('recipient_id'), p.get('owner_id'), p.get('actor_id')) if uid
+        })
+
+        def target_ids(field):
+            return [p.get(field) for p in payloads] + [p.get('target', {}).get(field) for p in payloads]
+
+        # Targets deleted after the event was queued would fail the FK check at commit
+        alive = {
+            'word_id': _existing_ids(Word, target_ids('word_id')),
+            'comment_id': _existing_ids(Comment, target_ids('comment_id')),
+            'challenge_comment_id': _existing_ids(ChallengeComment, target_ids('challenge_comment_id')),
+        }
+
+        def targets_alive(values):
+            return all(v is None or v in alive[f] for f, v in values.items() if f in alive)
+
+        created, unread_deltas = [], Counter()
+        for job, p in zip(jobs, payloads):
+            if job.kind == 'create':
+                event = {f: p.get(f) for f in EVENT_FIELDS}
+                if event['recipient_id'] in users and targets_alive(event):
+                    if event['actor_id'] not in users:
+                        event['actor_id'] = None
+                    created.append(Notification(**event))
+                    unread_deltas[event['recipient_id']] += 1
+            elif job.kind == 'vote':
+                owner, actor = users.get(p['owner_id']), users.get(p['actor_id'])
+                if owner and actor and targets_alive({**p['target'], **(p['defaults'] or {})}):
+                    unread_deltas[owner.pk] += _apply_vote_change(
+                        owner, actor, p['prefix'], p['old_value'], p['new_value'], p['target'], p['defaults']
+                    )
+
+        for notif in Notification.objects.bulk_create(freeze_payloads(created)):
+            _announce(notif.recipient_id, notif.pk)
+        for user_id, delta in unread_deltas.items():
+            adjust_unread(user_id, delta)
+        NotificationJob.objects.filter(id__in=[job.id for job in jobs]).delete()
+
+    logger.info('Processed %d notification jobs for %d recipients', len(jobs), len(unread_deltas))
+    return len(jobs)
@@ -0,0 +1,128 @@
+# core/pagecache.py
+"""
+Rendered-HTML cache for the bot (server-side rendered) pages.
+
+The index, category and word detail pages served to crawlers are rendered
+once and kept in the BOT_PAGES namespace (core.cachelayer) together with
+gzip and, when the optional ``brotli`` package is installed, brotli bodies,
+so a hit costs neither a query nor a template render nor compression.
+
+Entries are dropped precisely: a word change forgets its own page, the
+index and the pages of its categories (core.signals, and ``forget_words``
+for admin actions that use queryset.update()); a category change bumps the
+whole namespace. Word pages may also be pre-rendered to disk (core.prerender).
+"""
+import gzip
+
+try:
+    import brotli
+except ImportError:  # optional; gzip only
+    brotli = None
+
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+
+from .cachelayer import BOT_PAGES, FEED, WORDS
+from .models import Word
+
+INDEX_KEY = 'index'
+
+
+def word_key(slug):
+    return f'word:{slug}'
+
+
+def category_key(slug):
+    return f'category:{slug}'
+
+
+def compress(body):
+    """{encoding: body} for every encoding we can serve."""
+    return {
+        'identity': body,
+        'gzip': gzip.compress(body, compresslevel=9, mtime=0),
+        'br': brotli.compress(body, quality=11) if brotli else None,
+    }
+
+
+def accepted_encodings(request):
+    accepted = set()
+    for part in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        coding, _, params = part.partition(';')
+        params = params.replace(' ', '')
+        try:
+            q = float(params[2:]) if params.startswith('q=') else 1.0
+        except ValueError:
+            q = 1.0
+        if q > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def encoded_response(body, encoding, content_type):
+    response = HttpResponse(body, content_type=content_type)
+    if encoding != 'identity':
+        response['Content-Encoding'] = encoding
+    response['Content-Length'] = str(len(body))
+    patch_vary_headers(response, ['Accept-Encoding'])
+    return response
+
+
+def _entry(response):
+    return {'content_type': response['Content-Type'], **compress(response.content)}
+
+
+def serve(request, key, render):
+    """
+    Response for a bot page, from the cache or from ``render()`` (which may
+    raise Http404; nothing is cached then).
+    """
+    entry = BOT_PAGES.get_or_set(key, lambda: _entry(render()))
+    accepted = accepted_encodings(request)
+    if entry['br'] is not None and 'br' in accepted:
+        encoding = 'br'
+    elif 'gzip' in accepted:
+        encoding = 'gzip'
+    else:
+        encoding = 'identity'
+    return encoded_response(entry[encoding], encoding, entry['content_type'])
+
+
+def forget_word(slug, category_slugs):
+    BOT_PAGES.delete(INDEX_KEY)
+    if slug:
+        BOT_PAGES.delete(word_key(slug))
+    for category_slug in category_slugs:
+        BOT_PAGES.delete(category_key(category_slug))
+
+
+def forget_words(word_ids):
+    """
+    Drop every cached page and API entry showing these words. For admin
+    actions that change words with queryset.update(), which skips Word.save.
+    """
+    from . import prerender, sitemaps
+
+    for word in Word.objects.filter(pk__in=word_ids).prefetch_related('categories'):
+        forget_word(word.slug, [c.slug for c in word.categories.all()])
+        if word.slug:
+            WORDS.delete(word.slug)
+    FEED.bump()
+    prerender.schedule(word_ids)
+    sitemaps.forget_words(word_ids)
+
+
+def forget_word_scores(slugs):
+    """
+    Drop the API entries showing these words' scores once the transaction
+    commits (the bot pages show no score). For score writes that skip
+    Word.save: votes, flush_votes and reconcile_scores.
+    """
+    slugs = [slug for slug in slugs if slug]
+
+    def forget():
+        for slug in slugs:
+            WORDS.delete(slug)
+        FEED.bump()
+    transaction.on_commit(forget)
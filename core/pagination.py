@@ -0,0 +1,157 @@
+# core/pagination.py
+"""
+Keyset (seek) pagination.
+
+Instead of LIMIT/OFFSET, every page remembers the sort-key values of its last
+row in an opaque cursor and the next page starts strictly after them. Deep
+pages cost the same as the first one, and rows inserted or re-scored between
+requests never shift the page boundaries.
+"""
+import base64
+import binascii
+import datetime
+import json
+from dataclasses import dataclass
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+@dataclass
+class KeysetPage:
+    items: list
+    next_cursor: str | None = None
+    has_next: bool = False
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+def _encode_value(value):
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    return value
+
+
+def encode_cursor(values):
+    raw = json.dumps([_encode_value(v) for v in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    padded = cursor + '=' * (-len(cursor) % 4)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (binascii.Error, UnicodeError, ValueError) as exc:
+        raise InvalidCursor('Geçersiz sayfa imleci.') from exc
+    if not isinstance(values, list):
+        raise InvalidCursor('Geçersiz sayfa imleci.')
+    return values
+
+
+class KeysetPaginator:
+    """
+    Paginates ``queryset`` by ``ordering``, e.g. ``('-score', '-timestamp', '-id')``.
+
+    The last ordering field must be unique (normally the primary key) so that
+    every row has a distinct position. Mixed ascending/descending orderings
+    are supported.
+    """
+
+    def __init__(self, queryset, ordering, limit):
+        self.queryset = queryset
+        self.ordering = tuple(ordering)
+        # A zero or negative ?limit= would leave no row to take the cursor from
+        self.limit = max(1, limit)
+        self._fields = [
+            (name.lstrip('-'), name.startswith('-')) for name in self.ordering
+        ]
+
+    def _to_python(self, values):
+        if len(values) != len(self._fields):
+            raise InvalidCursor('Geçersiz sayfa imleci.')
+        opts = self.queryset.model._meta
+        converted = []
+        for (name, _desc), value in zip(self._fields, values):
+            try:
+                value = opts.get_field(name).to_python(value)
+            except (ValidationError, TypeError) as exc:
+                raise InvalidCursor('Geçersiz sayfa imleci.') from exc
+            # to_python passes None through; no ordering field is nullable
+            if value is None:
+                raise InvalidCursor('Geçersiz sayfa imleci.')
+            converted.append(value)
+        return converted
+
+    def _seek_filter(self, values):
+        # (a, b, c) after (x, y, z)  ==  a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z)
+        # with > flipped to < for descending fields.
+        condition = Q()
+        equal_prefix = Q()
+        for (name, desc), value in zip(self._fields, values):
+            lookup = 'lt' if desc else 'gt'
+            condition |= equal_prefix & Q(**{f'{name}__{lookup}': value})
+            equal_prefix &= Q(**{name: value})
+
+        # Redundant leading bound so the database can seek on the index
+        # instead of evaluating the OR chain over the whole table.
+        first_name, first_desc = self._fields[0]
+        bound = Q(**{f'{first_name}__{"lte" if first_desc else "gte"}': values[0]})
+        return bound & condition
+
+    def page(self, cursor=None):
+        qs = self.queryset.order_by(*self.ordering)
+        if cursor:
+            qs = qs.filter(self._seek_filter(self._to_python(decode_cursor(cursor))))
+
+        # One extra row tells us whether a next page exists without a COUNT(*)
+        rows = list(qs[:self.limit + 1])
+        items = rows[:self.limit]
+        next_cursor = None
+        if len(rows) > self.limit:
+            last = items[-1]
+            next_cursor = encode_cursor([getattr(last, name) for name, _desc in self._fields])
+        return KeysetPage(items, next_cursor, next_cursor is not None)
+
+
+# Offsets above this are answered with an empty page without a query
+MAX_OFFSET = 2 ** 31
+
+
+def offset_page(queryset, page_number, limit):
+    """
+    Legacy ``?page=N`` pagination without the COUNT(*) that Django's Paginator
+    runs to validate page numbers. Out-of-range or malformed pages are empty.
+    """
+    try:
+        page_number = int(page_number)
+    except (TypeError, ValueError):
+        return KeysetPage([])
+    if page_number < 1:
+        return KeysetPage([])
+
+    limit = max(1, limit)
+    start = (page_number - 1) * limit
+    if start > MAX_OFFSET:
+        # Past any real row count, and SQLite rejects OFFSETs beyond 64 bits
+        return KeysetPage([])
+    rows = list(queryset[start:start + limit + 1])
+    return KeysetPage(rows[:limit], has_next=len(rows) > limit)
+
+
+def paginate_request(request, queryset, ordering, limit):
+    """
+    Cursor mode when ``?cursor=`` is present (empty string = first page),
+    otherwise the old ``?page=N`` mode. Raises InvalidCursor on a bad cursor.
+    """
+    cursor = request.GET.get('cursor')
+    if cursor is not None:
+        return KeysetPaginator(queryset, ordering, limit).page(cursor)
+    return offset_page(queryset.order_by(*ordering), request.GET.get('page', 1), limit)
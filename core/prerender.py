@@ -0,0 +1,148 @@
+# core/prerender.py
+"""
+Pre-rendered word detail pages for bots.
+
+With settings.PRERENDER_DIR set, the ``word_detail.html`` output of every
+approved word is kept on disk as ``sozcuk/<slug>.html`` plus ``.gz`` (and
+``.br`` when brotli is installed) next to it. ``word_detail`` answers bot
+requests straight from those files, like whitenoise serves static assets,
+without touching the ORM; words without a file fall back to core.pagecache.
+
+Files are rewritten after commit whenever a word, its categories or a
+category it belongs to changes (core.signals, pagecache.forget_words), and
+removed when the word is deleted or leaves 'approved'. Category changes that
+touch many words only remove the files (``schedule_bulk``). ``manage.py
+prerender_words`` rebuilds everything with a process pool.
+"""
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.template.loader import render_to_string
+
+from .models import Word
+from .pagecache import accepted_encodings, compress, encoded_response
+
+logger = logging.getLogger(__name__)
+
+SUFFIXES = {'identity': '', 'gzip': '.gz', 'br': '.br'}
+CONTENT_TYPE = 'text/html; charset=utf-8'
+
+# Re-renders per change done in the request itself (see schedule_bulk)
+INLINE_REFRESH_LIMIT = 200
+
+
+def enabled():
+    return bool(settings.PRERENDER_DIR)
+
+
+def page_dir():
+    return Path(settings.PRERENDER_DIR) / 'sozcuk'
+
+
+def _page_path(slug):
+    return page_dir() / f'{slug}.html'
+
+
+def _write_atomic(path, data):
+    # Readers see the old file or the new one, never a partial write
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        # mkstemp creates 0600; the web workers may run as another user
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def write(word):
+    """Render one approved word (with ``categories`` ideally prefetched) to disk."""
+    path = _page_path(word.slug)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    html = render_to_string('word_detail.html', {'word': word}).encode()
+    for encoding, body in compress(html).items():
+        if body is not None:
+            _write_atomic(path.with_name(path.name + SUFFIXES[encoding]), body)
+
+
+def remove(slug):
+    path = _page_path(slug)
+    for suffix in SUFFIXES.values():
+        path.with_name(path.name + suffix).unlink(missing_ok=True)
+
+
+def approved_words():
+    return Word.objects.filter(status='approved').select_related('user').prefetch_related('categories')
+
+
+def refresh(word_ids):
+    """Rewrite the files of these words, or remove them if no longer approved."""
+    for word in Word.objects.filter(pk__in=word_ids).select_related('user').prefetch_related('categories'):
+        if word.status == 'approved':
+            write(word)
+        elif word.slug:
+            remove(word.slug)
+
+
+def schedule(word_ids):
+    """``refresh`` once the current transaction commits."""
+    if not enabled():
+        return
+    word_ids = list(word_ids)
+    if word_ids:
+        transaction.on_commit(lambda: refresh(word_ids))
+
+
+def schedule_bulk(word_ids):
+    """
+    ``schedule`` for changes touching many words at once (a renamed or deleted
+    category). Above INLINE_REFRESH_LIMIT words nothing is rendered in the
+    request: the files are removed instead, bots fall back to core.pagecache,
+    and the next ``manage.py prerender_words`` writes them again.
+    """
+    if not enabled():
+        return
+    word_ids = list(word_ids)
+    if len(word_ids) <= INLINE_REFRESH_LIMIT:
+        schedule(word_ids)
+        return
+    slugs = list(Word.objects.filter(pk__in=word_ids, slug__gt='').values_list('slug', flat=True))
+    logger.info('%d pre-rendered pages dropped; run prerender_words to rebuild them', len(slugs))
+    transaction.on_commit(lambda: _remove_all(slugs))
+
+
+def _remove_all(slugs):
+    for slug in slugs:
+        remove(slug)
+
+
+def schedule_remove(slug):
+    if enabled() and slug:
+        transaction.on_commit(lambda: remove(slug))
+
+
+def serve(request, slug):
+    """Response from the pre-rendered file, or None when there is none."""
+    if not enabled():
+        return None
+    path = _page_path(slug)
+    accepted = accepted_encodings(request)
+    for encoding in ('br', 'gzip', 'identity'):
+        if encoding != 'identity' and encoding not in accepted:
+            continue
+        try:
+            body = path.with_name(path.name + SUFFIXES[encoding]).read_bytes()
+        except FileNotFoundError:
+            continue
+        except OSError:
+            # e.g. unreadable for this user: fall back to core.pagecache
+            logger.warning('Could not read pre-rendered page %s', path, exc_info=True)
+            return None
+        return encoded_response(body, encoding, CONTENT_TYPE)
+    return None
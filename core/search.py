@@ -0,0 +1,148 @@
+# core/search.py
+"""
+SQLite FTS5 full-text index for approved words.
+
+The index lives in the ``core_word_fts`` virtual table (created by migration
+0026). Its rowid is the Word primary key and every column holds Turkish-folded
+text, so "ŞIK", "şık" and "sik" all match the same rows.
+"""
+import logging
+import re
+
+from django.db import connection, transaction, DatabaseError, OperationalError
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import Word, TURKISH_CHAR_MAP
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = 'core_word_fts'
+INDEXED_FIELDS = ('word', 'definition', 'etymology', 'example')
+
+MAX_QUERY_TERMS = 8
+
+_TOKEN_RE = re.compile(r'\w+')
+
+# None = not checked yet for this process
+_fts_ready = None
+
+
+def fold_turkish(text):
+    """Lowercase with Turkish casing rules and strip Turkish diacritics."""
+    if not text:
+        return ''
+    text = text.replace('I', 'ı').replace('İ', 'i').lower()
+    for tr, en in TURKISH_CHAR_MAP.items():
+        text = text.replace(tr, en)
+    return text
+
+
+def build_match_expression(query):
+    """Turn raw user input into an FTS5 MATCH expression (AND of prefix terms)."""
+    terms = _TOKEN_RE.findall(fold_turkish(query))[:MAX_QUERY_TERMS]
+    if not terms:
+        return None
+    # Quoting every term keeps FTS5 operators (AND, NEAR, -, ^) typed by users inert.
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def is_available():
+    global _fts_ready
+    if _fts_ready is None:
+        if connection.vendor != 'sqlite':
+            _fts_ready = False
+        else:
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s",
+                        [FTS_TABLE],
+                    )
+                    _fts_ready = cursor.fetchone() is not None
+            except (DatabaseError, OperationalError):
+                # e.g. "database is locked": no answer, so don't cache one; fall
+                # back for this request and ask again on the next
+                logger.warning('Could not check for the search index', exc_info=True)
+                return False
+    return _fts_ready
+
+
+def filter_words(queryset, query):
+    """Restrict a Word queryset to rows matching ``query``."""
+    if not is_available():
+        return queryset.filter(Q(word__icontains=query) | Q(definition__icontains=query))
+
+    match = build_match_expression(query)
+    if match is None:
+        return queryset.none()
+
+    return queryset.filter(
+        id__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', (match,))
+    )
+
+
+def _row(word):
+    return [word.pk] + [fold_turkish(getattr(word, f)) for f in INDEXED_FIELDS]
+
+
+def _insert_rows(cursor, rows):
+    columns = ', '.join(INDEXED_FIELDS)
+    placeholders = ', '.join(['%s'] * (len(INDEXED_FIELDS) + 1))
+    cursor.executemany(
+        f'INSERT INTO {FTS_TABLE} (rowid, {columns}) VALUES ({placeholders})',
+        rows,
+    )
+
+
+def index_word(word):
+    """Add, refresh or drop a single word depending on its status."""
+    if not is_available() or word.pk is None:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [word.pk])
+        if word.status == 'approved':
+            _insert_rows(cursor, [_row(word)])
+
+
+def remove_word(word_id):
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [word_id])
+
+
+def reindex_words(word_ids):
+    """Re-sync a set of words, e.g. after a bulk ``queryset.update(status=...)``."""
+    word_ids = list(word_ids)
+    if not is_available() or not word_ids:
+        return
+    approved = Word.objects.filter(id__in=word_ids, status='approved').only('id', *INDEXED_FIELDS)
+    with connection.cursor() as cursor:
+        cursor.executemany(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [[i] for i in word_ids])
+        _insert_rows(cursor, [_row(w) for w in approved])
+
+
+def rebuild_index(chunk_size=2000):
+    """Drop every indexed row and re-insert all approved words. Returns the row count."""
+    if not is_available():
+        raise OperationalError(f'{FTS_TABLE} tablosu bulunamadı, önce migrate çalıştırın.')
+
+    total = 0
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        qs = Word.objects.filter(status='approved').only('id', *INDEXED_FIELDS).order_by('id')
+        batch = []
+        for word in qs.iterator(chunk_size=chunk_size):
+            batch.append(_row(word))
+            if len(batch) >= chunk_size:
+                _insert_rows(cursor, batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            _insert_rows(cursor, batch)
+            total += len(batch)
+        # Merge the b-tree segments written above into one
+        cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+    logger.info('Search index rebuilt (%d words)', total)
+    return total
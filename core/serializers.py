@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from .models import Word, Comment, Category, Notification
+from .notifications import FROZEN_FIELDS
 import re
 
 # --- YARDIMCI FONKSİYONLAR (HELPER FUNCTIONS) ---
@@ -43,7 +44,7 @@ class NotificationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Notification
         fields = [
-            'id', 'notification_type', 'actor_username',
+            'id', 'notification_type', 'actor_username', 'actor_count', 'recent_actors',
             'word_text', 'word_def', 'word_example', 'word_etymology',
             'message', 'is_read', 'timestamp', 'word_id', 'comment_id',
             'challenge_comment_id', 'challenge_id', 'challenge_foreign_word',
@@ -89,6 +90,46 @@ class NotificationSerializer(serializers.ModelSerializer):
         return cc.suggested_word if cc else None
 
 
+def challenge_timer_fields(challenge):
+    if challenge is None:
+        return {
+            'challenge_timer_on': None,
+            'challenge_is_closed': None,
+            'challenge_time_remaining_seconds': None,
+        }
+    remaining = challenge.time_remaining
+    return {
+        'challenge_timer_on': challenge.timer_on,
+        'challenge_is_closed': challenge.is_closed,
+        'challenge_time_remaining_seconds': int(remaining.total_seconds()) if remaining is not None else None,
+    }
+
+
+class FrozenNotificationSerializer(serializers.ModelSerializer):
+    """
+    Same output as NotificationSerializer, built from Notification.payload
+    instead of joined rows. The timer fields come from ``context['challenges']``
+    (see core.notifications.challenge_timers).
+    """
+    challenge_comment_id = serializers.IntegerField(read_only=True, allow_null=True)
+
+    class Meta:
+        model = Notification
+        fields = [
+            'id', 'notification_type', 'actor_count', 'recent_actors',
+            'message', 'is_read', 'timestamp', 'word_id', 'comment_id', 'challenge_comment_id',
+        ]
+
+    def to_representation(self, obj):
+        data = super().to_representation(obj)
+        payload = obj.payload or {}
+        for field in FROZEN_FIELDS:
+            data[field] = payload.get(field)
+        challenges = self.context.get('challenges', {})
+        data.update(challenge_timer_fields(challenges.get(payload.get('challenge_id'))))
+        return data
+
+
 class CategorySerializer(serializers.ModelSerializer):
     class Meta:
         model = Category
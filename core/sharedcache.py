@@ -0,0 +1,248 @@
+# core/sharedcache.py
+"""
+Cache backend shared by every worker process on one host.
+
+Entries live in a small SQLite file (WAL mode, so readers never block the
+writer), which makes a ``cache.delete`` in one gunicorn worker visible to all
+others immediately instead of only to the worker that handled the write.
+
+Each write of a key (set, add, incr, delete, clear) also appends to an
+invalidation log in the same file. Process-local copies of cached values
+poll it with ``invalidated_since(seq)`` to learn which keys went stale.
+
+Expired entries, MAX_ENTRIES and the log's LOG_RETENTION are enforced every
+CULL_EVERY writes (default 100) rather than on each one.
+
+    CACHES = {'default': {
+        'BACKEND': 'core.sharedcache.SQLiteCache',
+        'LOCATION': '/var/cache/sozluk/cache.sqlite3',
+    }}
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL)',
+    'CREATE INDEX IF NOT EXISTS cache_expires ON cache (expires)',
+    'CREATE TABLE IF NOT EXISTS invalidations (seq INTEGER PRIMARY KEY AUTOINCREMENT, key TEXT NOT NULL, at REAL NOT NULL)',
+)
+
+# Logged instead of a key when the whole cache was cleared
+CLEARED = '*'
+
+
+class SQLiteCache(BaseCache):
+    def __init__(self, location, params):
+        super().__init__(params)
+        self._path = location
+        options = params.get('OPTIONS', {})
+        # How long invalidation log rows are kept; readers further behind resync fully
+        self._log_retention = options.get('LOG_RETENTION', 300)
+        # Writes between culls; MAX_ENTRIES may be exceeded by up to this many per worker thread
+        self._cull_every = options.get('CULL_EVERY', 100)
+        self._writes = 0
+        self._local = threading.local()
+
+    # --- connection ---
+
+    def _db(self):
+        db = getattr(self._local, 'db', None)
+        # A connection must not cross a fork (gunicorn preload)
+        if db is None or self._local.pid != os.getpid():
+            directory = os.path.dirname(self._path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            db = sqlite3.connect(self._path, timeout=5, isolation_level=None)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            for statement in SCHEMA:
+                db.execute(statement)
+            self._local.db, self._local.pid = db, os.getpid()
+        return db
+
+    def _write(self):
+        return _Transaction(self._db())
+
+    # --- helpers ---
+
+    def _log(self, db, keys):
+        now = time.time()
+        db.executemany('INSERT INTO invalidations (key, at) VALUES (?, ?)', [(k, now) for k in keys])
+
+    def _store(self, db, key, value, timeout):
+        db.execute(
+            'INSERT INTO cache (key, value, expires) VALUES (?, ?, ?) '
+            'ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires = excluded.expires',
+            (key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), self.get_backend_timeout(timeout)),
+        )
+
+    def _cull(self, db):
+        # COUNT(*) is a full scan, so only every CULL_EVERY-th write pays for it
+        self._writes += 1
+        if self._writes % self._cull_every:
+            return
+        now = time.time()
+        db.execute('DELETE FROM cache WHERE expires IS NOT NULL AND expires <= ?', (now,))
+        self._trim_log(db, now - self._log_retention)
+        count = db.execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+        if count > self._max_entries:
+            if self._cull_frequency == 0:
+                db.execute('DELETE FROM cache')
+                self._log(db, [CLEARED])
+                return
+            # Soonest to expire first; entries without a timeout last
+            keys = [row[0] for row in db.execute(
+                'SELECT key FROM cache ORDER BY expires IS NULL, expires LIMIT ?',
+                (count // self._cull_frequency,),
+            )]
+            db.executemany('DELETE FROM cache WHERE key = ?', [(k,) for k in keys])
+            self._log(db, keys)
+
+    def _trim_log(self, db, cutoff):
+        # seq rises with at: walking the primary key up to the first row to keep
+        # only visits the rows being deleted
+        row = db.execute('SELECT seq FROM invalidations WHERE at >= ? ORDER BY seq LIMIT 1', (cutoff,)).fetchone()
+        if row is None:
+            db.execute('DELETE FROM invalidations')
+        else:
+            db.execute('DELETE FROM invalidations WHERE seq < ?', (row[0],))
+
+    def _fetch(self, db, key):
+        row = db.execute('SELECT value, expires FROM cache WHERE key = ?', (key,)).fetchone()
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            return None
+        return row
+
+    # --- BaseCache API ---
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._write() as db:
+            if self._fetch(db, key) is not None:
+                return False
+            self._cull(db)
+            self._store(db, key, value, timeout)
+            self._log(db, [key])
+        return True
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._fetch(self._db(), key)
+        return default if row is None else pickle.loads(row[0])
+
+    def get_many(self, keys, version=None):
+        mapping = {self.make_and_validate_key(k, version=version): k for k in keys}
+        if not mapping:
+            return {}
+        placeholders = ', '.join('?' * len(mapping))
+        now = time.time()
+        rows = self._db().execute(
+            f'SELECT key, value FROM cache WHERE key IN ({placeholders}) AND (expires IS NULL OR expires > ?)',
+            (*mapping, now),
+        )
+        return {mapping[key]: pickle.loads(value) for key, value in rows}
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._write() as db:
+            self._cull(db)
+            self._store(db, key, value, timeout)
+            self._log(db, [key])
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        keys = {self.make_and_validate_key(k, version=version): v for k, v in data.items()}
+        with self._write() as db:
+            self._cull(db)
+            for key, value in keys.items():
+                self._store(db, key, value, timeout)
+            self._log(db, list(keys))
+        return []
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._write() as db:
+            if self._fetch(db, key) is None:
+                return False
+            db.execute('UPDATE cache SET expires = ? WHERE key = ?', (self.get_backend_timeout(timeout), key))
+        return True
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._write() as db:
+            deleted = db.execute('DELETE FROM cache WHERE key = ?', (key,)).rowcount
+            self._log(db, [key])
+        return bool(deleted)
+
+    def delete_many(self, keys, version=None):
+        keys = [self.make_and_validate_key(k, version=version) for k in keys]
+        with self._write() as db:
+            db.executemany('DELETE FROM cache WHERE key = ?', [(k,) for k in keys])
+            self._log(db, keys)
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._fetch(self._db(), key) is not None
+
+    def incr(self, key, delta=1, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._write() as db:
+            row = self._fetch(db, key)
+            if row is None:
+                raise ValueError("Key '%s' not found" % key)
+            value = pickle.loads(row[0]) + delta
+            db.execute(
+                'UPDATE cache SET value = ? WHERE key = ?',
+                (pickle.dumps(value, pickle.HIGHEST_PROTOCOL), key),
+            )
+            self._log(db, [key])
+        return value
+
+    def clear(self):
+        with self._write() as db:
+            db.execute('DELETE FROM cache')
+            self._log(db, [CLEARED])
+
+    def close(self, **kwargs):
+        # Connections are per thread and reused across requests
+        pass
+
+    # --- invalidation log ---
+
+    def invalidated_since(self, seq):
+        """
+        (latest seq, set of raw keys written after ``seq``). The set is None when
+        the caller must drop everything: the cache was cleared, or ``seq`` is
+        older than the retained log. Pass seq=None to just get the current position.
+        """
+        db = self._db()
+        # sqlite_sequence, unlike MAX(seq), does not go back when old rows are pruned
+        row = db.execute("SELECT seq FROM sqlite_sequence WHERE name = 'invalidations'").fetchone()
+        latest = row[0] if row else 0
+        if seq is None or latest == seq:
+            return latest, set()
+        oldest = db.execute('SELECT MIN(seq) FROM invalidations').fetchone()[0]
+        if oldest is None or oldest > seq + 1:
+            return latest, None
+        keys = {row[0] for row in db.execute(
+            'SELECT key FROM invalidations WHERE seq > ? AND seq <= ?', (seq, latest)
+        )}
+        return latest, None if CLEARED in keys else keys
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE takes the write lock up front, so read-modify-write (add, incr) is atomic."""
+
+    def __init__(self, db):
+        self.db = db
+
+    def __enter__(self):
+        self.db.execute('BEGIN IMMEDIATE')
+        return self.db
+
+    def __exit__(self, exc_type, exc, tb):
+        self.db.execute('ROLLBACK' if exc_type else 'COMMIT')
@@ -1,9 +1,12 @@
 # core/signals.py
 
-from django.db.models.signals import post_save
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_save, post_delete, pre_delete, pre_save
 from django.dispatch import receiver
 from django.contrib.auth.models import User
-from .models import Word, Comment
+from .models import Category, Word, Comment, Notification
+from . import pagecache, prerender, search, sitemaps
+from .notifications import adjust_unread
 
 
 @receiver(post_save, sender=User)
@@ -34,4 +37,125 @@ def claim_guest_content(sender, instance, created, **kwargs):
         ChallengeComment.objects.filter(
             author__iexact=nickname,
             user__isnull=True
-        ).update(user=instance)
\ No newline at end of file
+        ).update(user=instance)
+
+
+# Saves that only touch these fields cannot change the search index
+_SEARCH_IRRELEVANT_FIELDS = {'score', 'slug', 'author', 'user', 'ip_address', 'rejection_reason'}
+
+
+@receiver(post_save, sender=Word)
+def sync_word_search_index(sender, instance, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= _SEARCH_IRRELEVANT_FIELDS:
+        return
+    search.index_word(instance)
+
+
+@receiver(post_delete, sender=Word)
+def drop_word_search_index(sender, instance, **kwargs):
+    search.remove_word(instance.pk)
+
+
+# --- Bot page cache (core.pagecache) ---
+# Only the score is absent from the bot templates
+
+@receiver(post_save, sender=Word)
+def forget_word_pages(sender, instance, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= {'score'}:
+        return
+    pagecache.forget_word(instance.slug, instance.categories.values_list('slug', flat=True))
+    prerender.schedule([instance.pk])
+    sitemaps.forget_words([instance.pk])
+
+
+# pre_delete: the category links are gone by post_delete
+@receiver(pre_delete, sender=Word)
+def forget_deleted_word_pages(sender, instance, **kwargs):
+    pagecache.forget_word(instance.slug, instance.categories.values_list('slug', flat=True))
+    prerender.schedule_remove(instance.slug)
+    sitemaps.forget_words([instance.pk])
+
+
+@receiver(m2m_changed, sender=Word.categories.through)
+def forget_recategorized_word_pages(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        categories = instance.categories.all() if action == 'pre_clear' else Category.objects.filter(pk__in=pk_set)
+        pagecache.forget_word(instance.slug, categories.values_list('slug', flat=True))
+        prerender.schedule([instance.pk])
+    else:
+        words = instance.words.all() if action == 'pre_clear' else Word.objects.filter(pk__in=pk_set)
+        for slug in words.values_list('slug', flat=True):
+            pagecache.forget_word(slug, [instance.slug])
+        prerender.schedule(words.values_list('pk', flat=True))
+
+
+# Category names and slugs appear on every pre-rendered page of their words,
+# and active categories are listed in their own sitemap. Other fields (order,
+# description) leave both alone.
+CATEGORY_PAGE_FIELDS = ('name', 'slug', 'is_active')
+
+
+@receiver(pre_save, sender=Category)
+def remember_category_page_fields(sender, instance, **kwargs):
+    instance._stored_page_fields = (
+        Category.objects.filter(pk=instance.pk).values_list(*CATEGORY_PAGE_FIELDS).first()
+        if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=Category)
+def refresh_category_pages(sender, instance, created, **kwargs):
+    stored = getattr(instance, '_stored_page_fields', None)
+    current = tuple(getattr(instance, name) for name in CATEGORY_PAGE_FIELDS)
+    if stored == current:
+        return
+    if not created and (stored is None or stored[:2] != current[:2]):
+        prerender.schedule_bulk(instance.words.values_list('pk', flat=True))
+    sitemaps.forget_categories()
+
+
+@receiver(pre_delete, sender=Category)
+def refresh_deleted_category_pages(sender, instance, **kwargs):
+    prerender.schedule_bulk(instance.words.values_list('pk', flat=True))
+    sitemaps.forget_categories()
+
+
+# A user's words show their username (Word.display_author)
+
+@receiver(pre_save, sender=User)
+def remember_username(sender, instance, **kwargs):
+    instance._stored_username = (
+        User.objects.filter(pk=instance.pk).values_list('username', flat=True).first()
+        if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=User)
+def forget_renamed_user_pages(sender, instance, created, **kwargs):
+    if created or getattr(instance, '_stored_username', None) in (None, instance.username):
+        return
+    pagecache.forget_words(list(instance.words.values_list('pk', flat=True)))
+
+
+# --- Denormalized Word.comment_count ---
+# F() updates run inside the caller's transaction (add_comment is atomic), so
+# the counter and the comment row commit or roll back together.
+
+@receiver(post_save, sender=Comment)
+def increment_word_comment_count(sender, instance, created, **kwargs):
+    if created:
+        Word.objects.filter(pk=instance.word_id).update(comment_count=F('comment_count') + 1)
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_word_comment_count(sender, instance, **kwargs):
+    Word.objects.filter(pk=instance.word_id).update(comment_count=F('comment_count') - 1)
+
+
+# Covers cascades (a deleted word or comment takes its notifications with it)
+@receiver(post_delete, sender=Notification)
+def drop_unread_notification(sender, instance, **kwargs):
+    if instance.is_active and not instance.is_read:
+        adjust_unread(instance.recipient_id, -1)
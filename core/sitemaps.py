@@ -0,0 +1,162 @@
+# core/sitemaps.py
+"""
+Streaming, sharded sitemaps.
+
+/sitemap.xml is a sitemap index pointing at one child per 50k-id range of
+words (/sitemap-words-<n>.xml, shard n holds ids n*50000+1 .. (n+1)*50000)
+plus /sitemap-categories.xml. Children are written while a keyset-iterated
+query walks the shard, so no sitemap is ever built in memory; the gzip of
+the finished document is cached and later served as is.
+
+A word change deletes only its own shard and the index (core.signals,
+pagecache.forget_words); category changes delete the categories sitemap.
+"""
+import time
+import zlib
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, Max
+from django.http import HttpResponseNotFound, StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+
+from .models import Category, Word
+from .pagecache import accepted_encodings, encoded_response
+
+SHARD_SIZE = 50000
+BATCH_SIZE = 2000
+CACHE_TIMEOUT = 60 * 60 * 24
+CONTENT_TYPE = 'application/xml; charset=utf-8'
+
+INDEX_KEY = 'sitemap:index'
+CATEGORIES_KEY = 'sitemap:categories'
+
+_HEAD = '<?xml version="1.0" encoding="UTF-8"?>\n'
+_NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+
+
+def shard_of(word_id):
+    return (word_id - 1) // SHARD_SIZE
+
+
+def words_key(shard):
+    return f'sitemap:words:{shard}'
+
+
+def _lastmod(value):
+    return f'<lastmod>{value.isoformat(timespec="seconds")}</lastmod>' if value else ''
+
+
+def _url(loc, lastmod=None):
+    return f'<url><loc>{escape(loc)}</loc>{_lastmod(lastmod)}</url>\n'
+
+
+# --- documents (generators of str chunks) ---
+
+def index_chunks():
+    site = settings.SITE_URL
+    yield f'{_HEAD}<sitemapindex {_NS}>\n'
+    yield f'<sitemap><loc>{escape(site)}/sitemap-categories.xml</loc></sitemap>\n'
+    shards = (
+        Word.objects.filter(status='approved')
+        .annotate(shard=(F('pk') - 1) / SHARD_SIZE)
+        .order_by()
+        .values_list('shard')
+        .annotate(lastmod=Max('timestamp'))
+        .order_by('shard')
+    )
+    for shard, lastmod in shards:
+        yield f'<sitemap><loc>{escape(site)}/sitemap-words-{shard}.xml</loc>{_lastmod(lastmod)}</sitemap>\n'
+    yield '</sitemapindex>\n'
+
+
+def shard_exists(shard):
+    lo, hi = shard * SHARD_SIZE, (shard + 1) * SHARD_SIZE
+    return Word.objects.filter(status='approved', pk__gt=lo, pk__lte=hi).exists()
+
+
+def word_chunks(shard):
+    site = settings.SITE_URL
+    yield f'{_HEAD}<urlset {_NS}>\n'
+    last, hi = shard * SHARD_SIZE, (shard + 1) * SHARD_SIZE
+    while True:
+        # Keyset walk over the primary key: each batch is an index range scan
+        rows = list(
+            Word.objects.filter(status='approved', pk__gt=last, pk__lte=hi)
+            .order_by('pk')
+            .values_list('pk', 'slug', 'timestamp')[:BATCH_SIZE]
+        )
+        if not rows:
+            break
+        yield ''.join(_url(f'{site}/sozcuk/{slug}/', timestamp) for _pk, slug, timestamp in rows)
+        last = rows[-1][0]
+    yield '</urlset>\n'
+
+
+def category_chunks():
+    site = settings.SITE_URL
+    yield f'{_HEAD}<urlset {_NS}>\n'
+    yield _url(f'{site}/')
+    for slug in Category.objects.filter(is_active=True).values_list('slug', flat=True):
+        yield _url(f'{site}/kategori/{slug}/')
+    yield '</urlset>\n'
+
+
+# --- serving ---
+
+def _stream_and_store(key, chunks):
+    """Yield the document while gzipping it; cache the gzip once complete."""
+    started = time.time()
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    compressed = []
+    for chunk in chunks:
+        data = chunk.encode()
+        compressed.append(compressor.compress(data))
+        yield data
+    compressed.append(compressor.flush())
+    # Skip the store if the document was invalidated while it was streaming
+    if (cache.get(f'{key}:changed') or 0) < started:
+        cache.set(key, b''.join(compressed), CACHE_TIMEOUT)
+
+
+def _gunzip(body, chunk_size=64 * 1024):
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    for i in range(0, len(body), chunk_size):
+        yield decompressor.decompress(body[i:i + chunk_size])
+    yield decompressor.flush()
+
+
+def respond(request, key, chunks, exists=None):
+    """
+    ``chunks`` is a zero-argument callable returning the document generator.
+    ``exists``, if given, is checked on a cache miss; False means 404, so
+    made-up URLs never create cache entries.
+    """
+    body = cache.get(key)
+    if body is None and exists is not None and not exists():
+        return HttpResponseNotFound()
+    if body is not None and 'gzip' in accepted_encodings(request):
+        return encoded_response(body, 'gzip', CONTENT_TYPE)
+    if body is not None:
+        response = StreamingHttpResponse(_gunzip(body), content_type=CONTENT_TYPE)
+    else:
+        response = StreamingHttpResponse(_stream_and_store(key, chunks()), content_type=CONTENT_TYPE)
+    patch_vary_headers(response, ['Accept-Encoding'])
+    return response
+
+
+# --- invalidation ---
+
+def _forget(keys):
+    now = time.time()
+    cache.delete_many(keys)
+    cache.set_many({f'{key}:changed': now for key in keys}, CACHE_TIMEOUT)
+
+
+def forget_words(word_ids):
+    _forget([INDEX_KEY] + sorted({words_key(shard_of(pk)) for pk in word_ids if pk}))
+
+
+def forget_categories():
+    _forget([CATEGORIES_KEY])
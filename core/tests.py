@@ -797,3 +797,1460 @@ class CloudflareMiddlewareTests(TestCase):
         request.META['REMOTE_ADDR'] = '127.0.0.1'
         resp = self.middleware(request)
         self.assertIn('Permissions-Policy', resp)
+
+
+# ---------------------------------------------------------------------------
+# 12. Full-text search index
+# ---------------------------------------------------------------------------
+
+@override_settings(RATELIMIT_ENABLE=False)
+class SearchIndexTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='searcher', password='pass123')
+        _make_approved_word(user=self.user, word='şıklık', definition='zarif görünüş')
+        _make_approved_word(user=self.user, word='araba', definition='taşıt')
+
+    def _search(self, query):
+        resp = self.client.get(reverse('get_words'), {'search': query})
+        return [w['word'] for w in resp.json()['words']]
+
+    def test_search_folds_turkish_case_and_diacritics(self):
+        self.assertEqual(self._search('SIKLIK'), ['şıklık'])
+        self.assertEqual(self._search('tasit'), ['araba'])
+
+    def test_search_matches_prefix(self):
+        self.assertEqual(self._search('zari'), ['şıklık'])
+
+    def test_failed_availability_check_is_retried(self):
+        from django.db import OperationalError
+        from . import search
+
+        with patch.object(search, '_fts_ready', None):
+            with patch('django.db.backends.utils.CursorWrapper.execute', side_effect=OperationalError('database is locked')), \
+                    self.assertLogs('core.search', 'WARNING'):
+                self.assertFalse(search.is_available())
+            self.assertIsNone(search._fts_ready)
+            self.assertTrue(search.is_available())
+
+    def test_fts_operators_are_inert(self):
+        resp = self.client.get(reverse('get_words'), {'search': 'araba OR NEAR(" -'})
+        self.assertEqual(resp.status_code, 200)
+
+    def test_pending_word_indexed_only_after_approval(self):
+        pending = _make_pending_word(user=self.user)
+        self.assertEqual(self._search('bekliyor'), [])
+        pending.status = 'approved'
+        pending.save()
+        self.assertEqual(self._search('bekliyor'), ['bekliyor'])
+        pending.delete()
+        self.assertEqual(self._search('bekliyor'), [])
+
+    def test_rebuild_command_restores_index(self):
+        from django.core.management import call_command
+        from io import StringIO
+        from . import search
+
+        search.remove_word(Word.objects.get(word='araba').id)
+        self.assertEqual(self._search('araba'), [])
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(self._search('araba'), ['araba'])
+
+
+# ---------------------------------------------------------------------------
+# 13. get_words — cursor (keyset) pagination
+# ---------------------------------------------------------------------------
+
+@override_settings(RATELIMIT_ENABLE=False)
+class WordCursorPaginationTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='pager', password='pass123')
+        # Duplicate scores force the timestamp/id tie-breakers to do their job
+        for i, score in enumerate([3, 1, 3, 0, 1]):
+            _make_approved_word(user=self.user, word=f'kelime{i}', score=score)
+
+    def _walk(self, sort):
+        seen, cursor = [], ''
+        for _ in range(10):
+            data = self.client.get(
+                reverse('get_words'), {'sort': sort, 'limit': 2, 'cursor': cursor}
+            ).json()
+            seen.extend(w['id'] for w in data['words'])
+            if not data['has_next']:
+                return seen
+            cursor = data['next_cursor']
+        self.fail('cursor pagination did not terminate')
+
+    def test_cursor_pages_match_offset_order_for_every_sort(self):
+        for sort in ('date_desc', 'date_asc', 'score_desc', 'score_asc'):
+            expected = [
+                w['id'] for w in
+                self.client.get(reverse('get_words'), {'sort': sort, 'limit': 50}).json()['words']
+            ]
+            self.assertEqual(self._walk(sort), expected, sort)
+
+    def test_new_word_does_not_shift_next_page(self):
+        first = self.client.get(reverse('get_words'), {'limit': 2, 'cursor': ''}).json()
+        _make_approved_word(user=self.user, word='yepyeni')
+        second = self.client.get(
+            reverse('get_words'), {'limit': 2, 'cursor': first['next_cursor']}
+        ).json()
+        first_ids = {w['id'] for w in first['words']}
+        self.assertFalse(first_ids & {w['id'] for w in second['words']})
+        self.assertNotIn('yepyeni', [w['word'] for w in second['words']])
+
+    def test_invalid_cursor_rejected(self):
+        resp = self.client.get(reverse('get_words'), {'cursor': 'bozuk!!'})
+        self.assertEqual(resp.status_code, 400)
+
+    def test_non_positive_limit_returns_one_word(self):
+        for params in ({'cursor': '', 'limit': 0}, {'cursor': '', 'limit': -3}, {'page': 1, 'limit': 0}):
+            resp = self.client.get(reverse('get_words'), params)
+            self.assertEqual(resp.status_code, 200, params)
+            self.assertEqual(len(resp.json()['words']), 1, params)
+
+
+# ---------------------------------------------------------------------------
+# 14. Cursor pagination — comments and notifications
+# ---------------------------------------------------------------------------
+
+@override_settings(RATELIMIT_ENABLE=False)
+class CommentNotificationCursorTests(TestCase):
+
+    def setUp(self):
+        from .models import Notification
+        self.user = User.objects.create_user(username='yazar', password='pass123')
+        self.word = _make_approved_word(user=self.user)
+        for i in range(5):
+            Comment.objects.create(word=self.word, user=self.user, comment=f'yorum {i}')
+            Notification.objects.create(recipient=self.user, notification_type='new_comment', word=self.word)
+
+    def _walk(self, url, key):
+        ids, cursor = [], ''
+        while True:
+            data = self.client.get(url, {'limit': 2, 'cursor': cursor}).json()
+            ids.extend(item['id'] for item in data[key])
+            if not data['has_next']:
+                return ids
+            cursor = data['next_cursor']
+
+    def test_comments_walk_in_timestamp_order(self):
+        ids = self._walk(reverse('get_comments', args=[self.word.id]), 'comments')
+        expected = list(Comment.objects.filter(word=self.word).order_by('timestamp', 'id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+
+    def test_notifications_walk_newest_first(self):
+        from .models import Notification
+        self.client.force_login(self.user)
+        ids = self._walk(reverse('get_notifications'), 'notifications')
+        expected = list(Notification.objects.filter(recipient=self.user).order_by('-timestamp', '-id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+
+    def test_page_mode_runs_no_count_query(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as ctx:
+            data = self.client.get(reverse('get_comments', args=[self.word.id]), {'page': 2, 'limit': 2}).json()
+        self.assertEqual(len(data['comments']), 2)
+        self.assertTrue(data['has_next'])
+        self.assertFalse(any('COUNT(' in q['sql'] for q in ctx.captured_queries))
+
+    def test_huge_page_number_is_empty(self):
+        resp = self.client.get(reverse('get_comments', args=[self.word.id]), {'page': '9' * 23})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()['comments'], [])
+
+    def test_cursor_with_null_values_rejected(self):
+        from .pagination import encode_cursor
+        resp = self.client.get(reverse('get_comments', args=[self.word.id]), {'cursor': encode_cursor([None, None])})
+        self.assertEqual(resp.status_code, 400)
+
+
+# ---------------------------------------------------------------------------
+# 15. Denormalized Word.comment_count
+# ---------------------------------------------------------------------------
+
+@override_settings(RATELIMIT_ENABLE=False)
+class CommentCountTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='sayac', password='pass123')
+        self.word = _make_approved_word(user=self.user)
+
+    def test_add_comment_increments_and_delete_decrements(self):
+        self.client.force_login(self.user)
+        self.client.post(
+            reverse('add_comment'),
+            data=json.dumps({'word_id': self.word.id, 'comment': 'güzel'}),
+            content_type='application/json',
+        )
+        self.word.refresh_from_db()
+        self.assertEqual(self.word.comment_count, 1)
+
+        Comment.objects.get(word=self.word).delete()
+        self.word.refresh_from_db()
+        self.assertEqual(self.word.comment_count, 0)
+
+    def test_feed_reports_stored_count(self):
+        Comment.objects.create(word=self.word, user=self.user, comment='bir')
+        Comment.objects.create(word=self.word, user=self.user, comment='iki')
+        words = self.client.get(reverse('get_words')).json()['words']
+        self.assertEqual(words[0]['comment_count'], 2)
+
+    def test_repair_command_fixes_drift(self):
+        from django.core.management import call_command
+        from io import StringIO
+
+        Comment.objects.create(word=self.word, user=self.user, comment='bir')
+        Word.objects.filter(pk=self.word.pk).update(comment_count=7)
+        call_command('repair_comment_counts', stdout=StringIO())
+        self.word.refresh_from_db()
+        self.assertEqual(self.word.comment_count, 1)
+
+
+# ---------------------------------------------------------------------------
+# 16. Write-behind voting
+# ---------------------------------------------------------------------------
+
+@override_settings(RATELIMIT_ENABLE=False, VOTE_WRITE_BEHIND=True)
+class WriteBehindVoteTests(TestCase):
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='yazar', password='pass123')
+        self.voter = User.objects.create_user(username='okur', password='pass123')
+        self.word = _make_approved_word(user=self.owner)
+
+    def _vote(self, user, action):
+        self.client.force_login(user)
+        return self.client.post(
+            reverse('vote', args=['word', self.word.id]),
+            data=json.dumps({'action': action}),
+            content_type='application/json',
+        ).json()
+
+    def _flush(self):
+        from django.core.management import call_command
+        from io import StringIO
+        call_command('flush_votes', stdout=StringIO())
+
+    def test_vote_is_queued_with_provisional_score(self):
+        data = self._vote(self.voter, 'like')
+        self.assertEqual(data['new_score'], 1)
+        self.assertEqual(data['user_action'], 'liked')
+        self.assertTrue(data['pending'])
+
+        self.word.refresh_from_db()
+        self.assertEqual(self.word.score, 0)
+        self.assertFalse(WordVote.objects.filter(word=self.word).exists())
+
+        data = self._vote(self.voter, 'dislike')
+        self.assertEqual(data['new_score'], -1)
+
+    def test_flush_refreshes_the_cached_score(self):
+        from django.core.cache import cache
+        from . import cachelayer
+
+        cache.clear()
+        cachelayer.clear_local()
+        url = reverse('get_word_by_slug', args=[self.word.slug])
+        self.assertEqual(self.client.get(url).json()['word']['score'], 0)
+        self._vote(self.voter, 'like')
+        with self.captureOnCommitCallbacks(execute=True):
+            self._flush()
+        self.client.logout()
+        self.assertEqual(self.client.get(url).json()['word']['score'], 1)
+
+    def test_flush_applies_net_votes_and_notifications(self):
+        from .models import Notification, VoteIntent
+
+        self._vote(self.voter, 'like')
+        self._vote(self.voter, 'dislike')
+        self._vote(self.owner, 'like')
+        self._vote(self.owner, 'like')  # toggled off before the flush
+        self._flush()
+
+        self.word.refresh_from_db()
+        self.assertEqual(self.word.score, -1)
+        self.assertEqual(
+            list(WordVote.objects.filter(word=self.word).values_list('user__username', 'value')),
+            [('okur', -1)],
+        )
+        self.assertFalse(VoteIntent.objects.exists())
+        notifs = Notification.objects.filter(recipient=self.owner, is_active=True)
+        self.assertEqual(list(notifs.values_list('notification_type', flat=True)), ['word_dislike'])
+
+    def test_flush_toggle_off_deactivates_notification(self):
+        from .models import Notification
+
+        self._vote(self.voter, 'like')
+        self._flush()
+        self._vote(self.voter, 'like')
+        self._flush()
+
+        self.word.refresh_from_db()
+        self.assertEqual(self.word.score, 0)
+        self.assertFalse(Notification.objects.filter(recipient=self.owner, is_active=True).exists())
+
+
+# ---------------------------------------------------------------------------
+# 17. Vote engine (core.votes)
+# ---------------------------------------------------------------------------
+
+class CastVoteTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='motor', password='pass123')
+        self.word = _make_approved_word(score=5)
+
+    def test_insert_flip_and_toggle_off(self):
+        from .votes import cast_vote
+
+        result = cast_vote('word', self.word.id, self.user.id, 1)
+        self.assertEqual((result.user_action, result.delta, result.score), ('liked', 1, 6))
+        self.assertEqual(WordVote.objects.get(user=self.user, word=self.word).value, 1)
+
+        result = cast_vote('word', self.word.id, self.user.id, -1)
+        self.assertEqual((result.user_action, result.delta, result.score), ('disliked', -2, 4))
+        self.assertEqual(WordVote.objects.get(user=self.user, word=self.word).value, -1)
+
+        result = cast_vote('word', self.word.id, self.user.id, -1)
+        self.assertEqual((result.user_action, result.delta, result.score), ('none', 1, 5))
+        self.assertFalse(WordVote.objects.filter(user=self.user, word=self.word).exists())
+
+    def test_comment_votes_use_their_own_table(self):
+        from .votes import cast_vote
+
+        comment = Comment.objects.create(word=self.word, user=self.user, comment='yorum')
+        result = cast_vote('comment', comment.id, self.user.id, -1)
+        self.assertEqual(result.score, -1)
+        self.assertEqual(CommentVote.objects.get(comment=comment).value, -1)
+        self.word.refresh_from_db()
+        self.assertEqual(self.word.score, 5)
+
+
+# ---------------------------------------------------------------------------
+# 18. Score reconciliation
+# ---------------------------------------------------------------------------
+
+class ReconcileScoresTests(TestCase):
+
+    def test_drifted_scores_are_recomputed_from_votes(self):
+        from django.core.management import call_command
+        from io import StringIO
+
+        voters = [User.objects.create_user(username=f'uzlas{i}', password='pass123') for i in range(3)]
+        word = _make_approved_word(score=42)
+        untouched = _make_approved_word(word='dogru', score=1)
+        comment = Comment.objects.create(word=word, comment='yorum', score=-7)
+        for i, user in enumerate(voters):
+            WordVote.objects.create(user=user, word=word, value=1 if i else -1)
+            CommentVote.objects.create(user=user, comment=comment, value=1)
+        WordVote.objects.create(user=voters[0], word=untouched, value=1)
+
+        out = StringIO()
+        call_command('reconcile_scores', '--dry-run', '--chunk-size', '1', stdout=out)
+        self.assertIn('Word: 2 satır tarandı, 1 puan hatalı.', out.getvalue())
+        word.refresh_from_db()
+        self.assertEqual(word.score, 42)
+
+        call_command('reconcile_scores', '--chunk-size', '1', stdout=StringIO())
+        word.refresh_from_db()
+        comment.refresh_from_db()
+        self.assertEqual((word.score, comment.score), (1, 3))
+
+    def test_fixed_word_scores_reach_the_word_endpoint(self):
+        from django.core.cache import cache
+        from django.core.management import call_command
+        from io import StringIO
+        from . import cachelayer
+
+        cache.clear()
+        cachelayer.clear_local()
+        word = _make_approved_word(score=42)
+        url = reverse('get_word_by_slug', args=[word.slug])
+        self.assertEqual(self.client.get(url).json()['word']['score'], 42)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('reconcile_scores', '--only', 'word', stdout=StringIO())
+        self.assertEqual(self.client.get(url).json()['word']['score'], 0)
+
+
+# ---------------------------------------------------------------------------
+# 19. Rolled-up vote notifications
+# ---------------------------------------------------------------------------
+
+@override_settings(RATELIMIT_ENABLE=False)
+class NotificationRollupTests(TestCase):
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='sahibi', password='pass123')
+        self.voters = [User.objects.create_user(username=f'begenen{i}', password='pass123') for i in range(3)]
+        self.word = _make_approved_word(user=self.owner)
+
+    def _vote(self, user, action):
+        self.client.force_login(user)
+        self.client.post(
+            reverse('vote', args=['word', self.word.id]),
+            data=json.dumps({'action': action}),
+            content_type='application/json',
+        )
+
+    def _unread(self):
+        self.client.force_login(self.owner)
+        return self.client.get(reverse('get_unread_count')).json()['unread_count']
+
+    def test_likes_share_one_row(self):
+        from .models import Notification
+
+        for voter in self.voters:
+            self._vote(voter, 'like')
+
+        notif = Notification.objects.get(recipient=self.owner)
+        self.assertEqual(notif.notification_type, 'word_like')
+        self.assertEqual(notif.actor_count, 3)
+        self.assertEqual(notif.recent_actors, ['begenen2', 'begenen1', 'begenen0'])
+        self.assertEqual(self._unread(), 1)
+
+        data = self.client.get(reverse('get_notifications')).json()['notifications']
+        self.assertEqual([(n['actor_count'], n['actor_username']) for n in data], [(3, 'begenen2')])
+
+    def test_switch_and_unlike_move_actors_between_rollups(self):
+        from .models import Notification
+
+        self._vote(self.voters[0], 'like')
+        self._vote(self.voters[1], 'like')
+        self._vote(self.voters[0], 'dislike')
+
+        like = Notification.objects.get(recipient=self.owner, notification_type='word_like')
+        dislike = Notification.objects.get(recipient=self.owner, notification_type='word_dislike')
+        self.assertEqual((like.actor_count, like.recent_actors), (1, ['begenen1']))
+        self.assertEqual((dislike.actor_count, dislike.recent_actors), (1, ['begenen0']))
+
+        self._vote(self.voters[1], 'like')  # toggle off the last like
+        like.refresh_from_db()
+        self.assertFalse(like.is_active)
+        self.assertEqual(self._unread(), 1)
+
+        self._vote(self.voters[2], 'like')  # revives the same row
+        like.refresh_from_db()
+        self.assertTrue(like.is_active)
+        self.assertEqual((like.actor_count, like.recent_actors), (1, ['begenen2']))
+        self.assertEqual(Notification.objects.filter(recipient=self.owner).count(), 2)
+
+
+# ---------------------------------------------------------------------------
+# 20. Queued notification delivery
+# ---------------------------------------------------------------------------
+
+@override_settings(RATELIMIT_ENABLE=False, NOTIFICATION_DELIVERY='queue')
+class NotificationQueueTests(TestCase):
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='alici', password='pass123')
+        self.actor = User.objects.create_user(username='gonderen', password='pass123')
+        self.word = _make_approved_word(user=self.owner)
+
+    def _process(self):
+        from django.core.management import call_command
+        from io import StringIO
+        call_command('process_notifications', stdout=StringIO())
+
+    def test_comment_and_vote_are_queued_then_applied(self):
+        from .models import Notification, NotificationJob
+
+        self.client.force_login(self.actor)
+        self.client.post(
+            reverse('add_comment'),
+            data=json.dumps({'word_id': self.word.id, 'comment': 'harika'}),
+            content_type='application/json',
+        )
+        self.client.post(
+            reverse('vote', args=['word', self.word.id]),
+            data=json.dumps({'action': 'like'}),
+            content_type='application/json',
+        )
+        self.assertEqual(NotificationJob.objects.count(), 2)
+        self.assertFalse(Notification.objects.exists())
+
+        self.client.force_login(self.owner)
+        self.assertEqual(self.client.get(reverse('get_unread_count')).json()['unread_count'], 0)
+
+        self._process()
+        self.assertFalse(NotificationJob.objects.exists())
+        self.assertEqual(
+            sorted(Notification.objects.values_list('notification_type', flat=True)),
+            ['new_comment', 'word_like'],
+        )
+        self.assertEqual(self.client.get(reverse('get_unread_count')).json()['unread_count'], 2)
+
+    def test_events_for_deleted_targets_are_dropped(self):
+        from .models import Notification, NotificationJob
+        from .notifications import notify
+
+        notify(self.owner, 'new_comment', actor=self.actor, word=self.word)
+        self.word.delete()
+        self._process()
+        self.assertFalse(NotificationJob.objects.exists())
+        self.assertFalse(Notification.objects.exists())
+
+
+# ---------------------------------------------------------------------------
+# 21. Notification retention
+# ---------------------------------------------------------------------------
+
+class PruneNotificationsTests(TestCase):
+
+    def test_removes_inactive_and_old_read_rows_only(self):
+        import datetime
+        import os
+        import tempfile
+        from io import StringIO
+        from django.core.management import call_command
+        from django.utils import timezone
+        from .models import Notification
+
+        user = User.objects.create_user(username='arsiv', password='pass123')
+        old = timezone.now() - datetime.timedelta(days=200)
+
+        def make(is_read, is_active, when=None):
+            n = Notification.objects.create(
+                recipient=user, notification_type='new_comment', is_read=is_read, is_active=is_active,
+            )
+            if when:
+                Notification.objects.filter(pk=n.pk).update(timestamp=when)
+            return n.pk
+
+        inactive = make(False, False)
+        old_read = make(True, True, old)
+        old_unread = make(False, True, old)
+        recent_read = make(True, True)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            archive = os.path.join(tmp, 'notifications.jsonl')
+            call_command('prune_notifications', '--days', '30', '--batch-size', '1',
+                         '--pause', '0', '--archive', archive, stdout=StringIO())
+            with open(archive, encoding='utf-8') as f:
+                archived = [json.loads(line)['id'] for line in f]
+
+        self.assertEqual(archived, [old_read])
+        remaining = set(Notification.objects.values_list('id', flat=True))
+        self.assertEqual(remaining, {old_unread, recent_read})
+        self.assertNotIn(inactive, remaining)
+
+
+# ---------------------------------------------------------------------------
+# 22. Persistent unread counter
+# ---------------------------------------------------------------------------
+
+@override_settings(RATELIMIT_ENABLE=False)
+class UnreadCounterTests(TestCase):
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='sayan', password='pass123')
+        self.actor = User.objects.create_user(username='yorumcu', password='pass123')
+        self.word = _make_approved_word(user=self.owner)
+
+    def _unread(self):
+        self.client.force_login(self.owner)
+        return self.client.get(reverse('get_unread_count')).json()['unread_count']
+
+    def test_counter_follows_create_read_and_cascade(self):
+        from .models import Notification
+        from .notifications import notify
+
+        other = _make_approved_word(user=self.owner, word='ikinci')
+        notify(self.owner, 'new_comment', actor=self.actor, word=self.word)
+        notify(self.owner, 'new_comment', actor=self.actor, word=other)
+        notify(self.owner, 'new_comment', actor=self.actor, word=other)
+        self.assertEqual(self._unread(), 3)
+
+        first = Notification.objects.filter(word=self.word).get()
+        self.client.post(
+            reverse('mark_notifications_read'),
+            data=json.dumps({'ids': [first.id]}),
+            content_type='application/json',
+        )
+        self.assertEqual(self._unread(), 2)
+
+        other.delete()
+        self.assertEqual(self._unread(), 0)
+
+    def test_reconcile_repairs_drift(self):
+        from django.core.management import call_command
+        from io import StringIO
+        from .models import NotificationCounter
+        from .notifications import notify
+
+        notify(self.owner, 'new_comment', actor=self.actor, word=self.word)
+        NotificationCounter.objects.filter(pk=self.owner.pk).update(unread=9)
+        call_command('reconcile_unread_counts', stdout=StringIO())
+        self.assertEqual(self._unread(), 1)
+
+
+# ---------------------------------------------------------------------------
+# 23. Notification event stream
+# ---------------------------------------------------------------------------
+
+class NotificationStreamTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='dinleyici', password='pass123')
+
+    def test_disabled_stream_is_not_found(self):
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(reverse('notification_stream')).status_code, 404)
+
+    @override_settings(NOTIFICATION_STREAM_ENABLED=True)
+    def test_anonymous_is_rejected(self):
+        self.assertEqual(self.client.get(reverse('notification_stream')).status_code, 403)
+
+    @override_settings(NOTIFICATION_STREAM_ENABLED=True)
+    async def test_stream_sends_count_then_published_events(self):
+        import asyncio
+        from asgiref.sync import sync_to_async
+        from .events import broker
+        from .notifications import notify
+
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse('notification_stream'))
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        chunks = response.streaming_content
+
+        first = (await anext(chunks)).decode()
+        self.assertIn('event: unread', first)
+        self.assertIn('"count": 0', first)
+        self.assertTrue(broker.has_subscribers(self.user.id))
+
+        word = await sync_to_async(_make_approved_word)()
+        await sync_to_async(notify)(self.user, 'new_comment', word=word)
+        broker.publish(self.user.id, {'type': 'unread'})  # on_commit never fires inside TestCase
+
+        second = (await asyncio.wait_for(anext(chunks), 5)).decode()
+        self.assertIn('"count": 1', second)
+        await chunks.aclose()
+
+
+# ---------------------------------------------------------------------------
+# 24. Frozen notification payloads
+# ---------------------------------------------------------------------------
+
+@override_settings(RATELIMIT_ENABLE=False)
+class FrozenNotificationPayloadTests(TestCase):
+
+    def setUp(self):
+        from challenge.models import ChallengeComment, TranslationChallenge
+        from django.utils import timezone
+        from .notifications import notify, sync_vote_notification
+
+        self.owner = User.objects.create_user(username='alici', password='pass123')
+        self.actor = User.objects.create_user(username='gonderen', password='pass123')
+        word = _make_approved_word(user=self.owner)
+        challenge = TranslationChallenge.objects.create(
+            foreign_word='router', meaning='yönlendirici', status='approved',
+            timer_on=True, timer_started_at=timezone.now(),
+        )
+        suggestion = ChallengeComment.objects.create(
+            challenge=challenge, user=self.owner, suggested_word='yonlendirgec',
+            etymology='köken', example_sentence='örnek.',
+        )
+        notify(self.owner, 'new_comment', actor=self.actor, word=word)
+        sync_vote_notification(self.owner, self.actor, 'challenge', None, 1, {'challenge_comment_id': suggestion.pk})
+
+    def _list(self):
+        self.client.force_login(self.owner)
+        return self.client.get(reverse('get_notifications')).json()['notifications']
+
+    def test_payload_is_frozen_at_creation(self):
+        from .models import Notification
+
+        payloads = {n.notification_type: n.payload for n in Notification.objects.all()}
+        self.assertEqual(payloads['new_comment']['actor_username'], 'gonderen')
+        self.assertEqual(payloads['new_comment']['word_text'], 'test')
+        self.assertEqual(payloads['challenge_like']['challenge_suggested_word'], 'yonlendirgec')
+
+    def test_frozen_list_matches_joined_list(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        joined = self._list()
+        with override_settings(NOTIFICATION_FROZEN_PAYLOAD=True):
+            frozen = self._list()
+            with CaptureQueriesContext(connection) as ctx:
+                self._list()
+
+        self.assertEqual(frozen, joined)
+        self.assertTrue(frozen[0]['challenge_timer_on'])
+        self.assertFalse(frozen[0]['challenge_is_closed'])
+        notification_queries = [q['sql'] for q in ctx.captured_queries if 'core_notification' in q['sql']]
+        self.assertEqual(len(notification_queries), 1)
+        self.assertNotIn('JOIN', notification_queries[0])
+
+    @override_settings(NOTIFICATION_FROZEN_PAYLOAD=True)
+    def test_rows_without_payload_are_still_served(self):
+        from .models import Notification
+
+        Notification.objects.update(payload=None)
+        by_type = {n['notification_type']: n for n in self._list()}
+        self.assertEqual(by_type['new_comment']['word_text'], 'test')
+        self.assertEqual(by_type['challenge_like']['challenge_foreign_word'], 'router')
+
+
+# ---------------------------------------------------------------------------
+# 25. Shared SQLite cache backend
+# ---------------------------------------------------------------------------
+
+class SharedCacheTests(TestCase):
+
+    def setUp(self):
+        import tempfile
+        from .sharedcache import SQLiteCache
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = f'{tmp.name}/cache.sqlite3'
+        # Two instances on one file stand in for two worker processes
+        self.a = SQLiteCache(path, {'OPTIONS': {'MAX_ENTRIES': 10, 'CULL_EVERY': 1}})
+        self.b = SQLiteCache(path, {})
+
+    def test_writes_are_visible_to_other_workers(self):
+        self.a.set('word_slug_x', {'word': 'x'}, 60)
+        self.assertEqual(self.b.get('word_slug_x'), {'word': 'x'})
+        self.b.delete('word_slug_x')
+        self.assertIsNone(self.a.get('word_slug_x'))
+
+        self.assertTrue(self.a.add('n', 1))
+        self.assertFalse(self.b.add('n', 5))
+        self.assertEqual(self.b.incr('n', 2), 3)
+        self.assertEqual(self.a.get_many(['n', 'missing']), {'n': 3})
+
+    def test_expired_entries_are_misses(self):
+        self.a.set('kisa', 1, -1)
+        self.assertIsNone(self.b.get('kisa'))
+        self.assertFalse(self.b.has_key('kisa'))
+
+    def test_invalidation_log(self):
+        seq, _ = self.b.invalidated_since(None)
+        self.a.set('k1', 1)
+        self.a.delete('k2')
+        seq2, keys = self.b.invalidated_since(seq)
+        self.assertEqual(keys, {self.a.make_key('k1'), self.a.make_key('k2')})
+        self.assertEqual(self.b.invalidated_since(seq2), (seq2, set()))
+
+        self.a.clear()
+        self.assertIsNone(self.b.invalidated_since(seq2)[1])
+
+    def test_culls_beyond_max_entries(self):
+        for i in range(15):
+            self.a.set(f'k{i}', i, 60 + i)
+        self.assertLessEqual(len(self.a.get_many([f'k{i}' for i in range(15)])), 11)
+        self.assertEqual(self.a.get('k14'), 14)
+
+    def test_cull_runs_every_nth_write_and_trims_the_log_by_age(self):
+        from .sharedcache import SQLiteCache
+
+        c = SQLiteCache(self.a._path, {'OPTIONS': {'MAX_ENTRIES': 10, 'CULL_EVERY': 5, 'LOG_RETENTION': 0}})
+        for i in range(4):
+            c.set(f'k{i}', i)
+        self.assertEqual(c._db().execute('SELECT COUNT(*) FROM invalidations').fetchone()[0], 4)
+        c.set('k4', 4)  # fifth write culls; the log rows are all older than the retention
+        self.assertEqual(c._db().execute('SELECT COUNT(*) FROM invalidations').fetchone()[0], 1)
+
+
+# ---------------------------------------------------------------------------
+# 26. Two-tier cache layer
+# ---------------------------------------------------------------------------
+
+@override_settings(RATELIMIT_ENABLE=False)
+class CacheLayerTests(TestCase):
+
+    def setUp(self):
+        from django.core.cache import cache
+        from . import cachelayer
+
+        cache.clear()
+        cachelayer.clear_local()
+
+    def test_lru_respects_memory_cap(self):
+        from .cachelayer import LocalLRU
+
+        lru = LocalLRU(max_bytes=300)
+        lru.set('a', 'x' * 100, 60, 'ns')
+        lru.set('b', 'y' * 100, 60, 'ns')
+        lru.get('a')  # 'b' is now least recently used
+        self.assertEqual(lru.set('c', 'z' * 100, 60, 'ns'), ['ns'])
+        self.assertEqual(lru.get('a'), 'x' * 100)
+        self.assertIs(lru.get('b'), lru.get('missing'))
+        self.assertLessEqual(lru.size, 300)
+
+    def test_bump_invalidates_the_namespace(self):
+        from .cachelayer import Namespace
+
+        ns = Namespace('test_ns', 60)
+        ns.set('a', 1)
+        self.assertEqual(ns.get('a'), 1)
+        ns.bump()
+        self.assertIsNone(ns.get('a'))
+        self.assertEqual(ns.get_or_set('a', lambda: 2), 2)
+        self.assertEqual(ns.stats['local_hits'], 1)
+        self.assertEqual(ns.stats['misses'], 2)
+
+    def test_evicted_version_does_not_revive_old_entries(self):
+        from django.core.cache import cache
+        from . import cachelayer
+        from .cachelayer import Namespace
+
+        ns = Namespace('test_ns', 60)
+        cache.set('ns:test_ns', 1, None)
+        ns.set('a', 'eski')  # stored under version 1
+        ns.bump()
+        cache.delete('ns:test_ns')  # evicted
+        cachelayer.clear_local()
+        self.assertIsNone(ns.get('a'))
+
+    def test_feed_pages_are_shared_with_per_user_votes(self):
+        word = _make_approved_word(word='paylasim')
+        voter = User.objects.create_user(username='begenen', password='pass123')
+        WordVote.objects.create(user=voter, word=word, value=1)
+
+        anon = self.client.get(reverse('get_words')).json()
+        self.assertIsNone(anon['words'][0]['user_vote'])
+
+        self.client.force_login(voter)
+        with self.assertNumQueries(3):  # session, user, vote overlay; the page itself is cached
+            mine = self.client.get(reverse('get_words')).json()
+        self.assertEqual(mine['words'][0]['user_vote'], 'like')
+        self.assertEqual(mine['total_count'], anon['total_count'])
+
+    def test_word_save_drops_cached_feed(self):
+        _make_approved_word(word='ilk')
+        self.assertEqual(self.client.get(reverse('get_words')).json()['total_count'], 1)
+        _make_approved_word(word='ikinci')
+        self.assertEqual(self.client.get(reverse('get_words')).json()['total_count'], 2)
+
+
+# ---------------------------------------------------------------------------
+# 27. Single-flight recomputation
+# ---------------------------------------------------------------------------
+
+class SingleFlightTests(TestCase):
+
+    def setUp(self):
+        from django.core.cache import cache
+        from . import cachelayer
+
+        cache.clear()
+        cachelayer.clear_local()
+        self.ns = cachelayer.Namespace('sf_test', 60)
+
+    def _hold_lock(self, key):
+        from django.core.cache import cache
+        cache.add(f'sf_test:lock:{key}', 'baska-istek', 30)
+
+    def test_followers_get_the_stale_value_while_one_recomputes(self):
+        self.ns.get_or_set('toplam', lambda: 10)
+        self.ns.delete('toplam')
+
+        self._hold_lock('toplam')  # another request is recomputing
+        self.assertEqual(self.ns.get_or_set('toplam', lambda: self.fail('recomputed twice')), 10)
+        self.assertEqual(self.ns.stats['stale_served'], 1)
+
+    def test_stale_value_survives_a_bump(self):
+        self.ns.get_or_set('sayfa', lambda: ['eski'])
+        self.ns.bump()
+        self._hold_lock('sayfa')
+        self.assertEqual(self.ns.get_or_set('sayfa', lambda: ['yeni']), ['eski'])
+
+    def test_leader_releases_lock_and_drops_stale_on_error(self):
+        from django.core.cache import cache
+
+        self.ns.get_or_set('kelime', lambda: 'var')
+        self.ns.delete('kelime')
+
+        def gone():
+            raise LookupError
+        with self.assertRaises(LookupError):
+            self.ns.get_or_set('kelime', gone)
+        self.assertIsNone(cache.get('sf_test:lock:kelime'))
+        self.assertIsNone(cache.get('sf_test:stale:kelime'))
+
+    def test_stale_copy_expires_with_the_entry_timeout(self):
+        import time
+        from django.core.cache import cache
+        from .cachelayer import STALE_FACTOR
+
+        self.ns.get_or_set('kisa', lambda: 'deger', timeout=5)
+        self.assertEqual(cache.get('sf_test:stale:kisa'), 'deger')
+        later = time.time() + 5 * STALE_FACTOR + 1
+        with patch('django.core.cache.backends.locmem.time.time', return_value=later):
+            self.assertIsNone(cache.get('sf_test:stale:kisa'))
+
+    @patch('core.cachelayer.LOCK_WAIT', 0.1)
+    def test_follower_without_stale_value_computes_after_waiting(self):
+        self._hold_lock('bos')
+        self.assertEqual(self.ns.get_or_set('bos', lambda: 'kendim'), 'kendim')
+        self.assertEqual(self.ns.stats['waits'], 1)
+
+
+# ---------------------------------------------------------------------------
+# 28. Word-by-slug cache entries
+# ---------------------------------------------------------------------------
+
+@override_settings(RATELIMIT_ENABLE=False)
+class WordBySlugCacheTests(TestCase):
+
+    def setUp(self):
+        from django.core.cache import cache
+        from . import cachelayer
+
+        cache.clear()
+        cachelayer.clear_local()
+
+    def test_caches_serialized_word_with_user_vote_overlay(self):
+        from .cachelayer import WORDS
+
+        word = _make_approved_word(word='katman')
+        url = reverse('get_word_by_slug', args=[word.slug])
+        self.assertIsNone(self.client.get(url).json()['word']['user_vote'])
+        self.assertIsInstance(WORDS.get(word.slug), dict)
+
+        voter = User.objects.create_user(username='oylayan', password='pass123')
+        WordVote.objects.create(user=voter, word=word, value=-1)
+        self.client.force_login(voter)
+        self.assertEqual(self.client.get(url).json()['word']['user_vote'], 'dislike')
+        # The shared entry is not modified by the overlay
+        self.assertIsNone(WORDS.get(word.slug)['user_vote'])
+
+    def test_unknown_slug_is_negatively_cached_until_the_word_appears(self):
+        url = reverse('get_word_by_slug', args=['yeni-sozcuk'])
+        self.assertEqual(self.client.get(url).status_code, 404)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url).status_code, 404)
+
+        _make_approved_word(word='yeni sözcük')
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_vote_refreshes_the_cached_score(self):
+        word = _make_approved_word(word='oylanan')
+        url = reverse('get_word_by_slug', args=[word.slug])
+        self.assertEqual(self.client.get(url).json()['word']['score'], 0)
+
+        voter = User.objects.create_user(username='begenen', password='pass123')
+        self.client.force_login(voter)
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = self.client.post(reverse('vote', args=['word', word.id]), {'action': 'like'}, content_type='application/json')
+        self.assertEqual(resp.json()['new_score'], 1)
+
+        data = self.client.get(url).json()['word']
+        self.assertEqual((data['score'], data['user_vote']), (1, 'like'))
+
+    def test_score_is_live_next_to_the_user_vote(self):
+        word = _make_approved_word(word='canli')
+        url = reverse('get_word_by_slug', args=[word.slug])
+        self.client.get(url)  # cached with score 0
+
+        voter = User.objects.create_user(username='canli_oy', password='pass123')
+        WordVote.objects.create(user=voter, word=word, value=1)
+        Word.objects.filter(pk=word.pk).update(score=1)  # skips every invalidation
+        self.client.force_login(voter)
+        data = self.client.get(url).json()['word']
+        self.assertEqual((data['score'], data['user_vote']), (1, 'like'))
+
+    def test_unknown_slug_leaves_no_stale_copy(self):
+        from django.core.cache import cache
+        self.client.get(reverse('get_word_by_slug', args=['olmayan']))
+        self.assertFalse(cache.has_key('words:stale:olmayan'))
+
+
+# ---------------------------------------------------------------------------
+# 29. Bot page cache
+# ---------------------------------------------------------------------------
+
+class BotPageCacheTests(TestCase):
+    BOT = {'HTTP_USER_AGENT': 'Mozilla/5.0 (compatible; Googlebot/2.1)'}
+
+    def setUp(self):
+        from django.core.cache import cache
+        from . import cachelayer
+
+        cache.clear()
+        cachelayer.clear_local()
+        self.category = Category.objects.create(name='Teknoloji', slug='teknoloji', description='x')
+        self.word = _make_approved_word(word='bilgisayar')
+        self.word.categories.add(self.category)
+
+    def _get(self, url, **extra):
+        return self.client.get(url, **self.BOT, **extra)
+
+    def test_serves_precompressed_gzip_from_cache(self):
+        import gzip
+
+        url = reverse('word_detail', args=[self.word.slug])
+        plain = self._get(url)
+        with self.assertNumQueries(0):
+            zipped = self._get(url, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(zipped['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(zipped.content), plain.content)
+        self.assertIn('Accept-Encoding', zipped['Vary'])
+        self.assertIn('User-Agent', zipped['Vary'])
+
+    def test_word_save_forgets_its_pages(self):
+        word_url = reverse('word_detail', args=[self.word.slug])
+        category_url = reverse('spa_category', args=['teknoloji'])
+        self._get(word_url), self._get(category_url), self._get(reverse('index'))
+
+        self.word.definition = 'yeni tanım'
+        self.word.save()
+        for url in (word_url, category_url, reverse('index')):
+            self.assertIn('yeni tanım', self._get(url).content.decode())
+
+    def test_admin_approval_and_recategorizing_forget_pages(self):
+        from .admin import make_pending
+
+        category_url = reverse('spa_category', args=['teknoloji'])
+        self.assertIn('bilgisayar', self._get(category_url).content.decode())
+
+        self.word.categories.remove(self.category)
+        self.assertNotIn('bilgisayar', self._get(category_url).content.decode())
+
+        self.assertIn('bilgisayar', self._get(reverse('index')).content.decode())
+        make_pending(MagicMock(), None, Word.objects.filter(pk=self.word.pk))
+        self.assertNotIn('bilgisayar', self._get(reverse('index')).content.decode())
+
+    def test_missing_pages_are_not_cached(self):
+        url = reverse('word_detail', args=['yok'])
+        self.assertEqual(self._get(url).status_code, 404)
+        _make_approved_word(word='yok')
+        self.assertEqual(self._get(url).status_code, 200)
+
+
+# ---------------------------------------------------------------------------
+# 30. Pre-rendered word pages
+# ---------------------------------------------------------------------------
+
+class PrerenderTests(TestCase):
+    BOT = {'HTTP_USER_AGENT': 'Mozilla/5.0 (compatible; Googlebot/2.1)'}
+
+    def setUp(self):
+        import tempfile
+        from pathlib import Path
+        from django.core.cache import cache
+        from . import cachelayer
+
+        cache.clear()
+        cachelayer.clear_local()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.settings_override = override_settings(PRERENDER_DIR=tmp.name)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+        self.pages = Path(tmp.name) / 'sozcuk'
+
+    def test_command_renders_and_bots_are_served_without_queries(self):
+        from django.core.management import call_command
+        from io import StringIO
+
+        word = _make_approved_word(word='onceden')
+        (self.pages / 'silinmis.html').parent.mkdir(parents=True, exist_ok=True)
+        (self.pages / 'silinmis.html').write_text('eski')
+        call_command('prerender_words', workers=0, stdout=StringIO())
+
+        self.assertFalse((self.pages / 'silinmis.html').exists())
+        self.assertTrue((self.pages / f'{word.slug}.html.gz').exists())
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                reverse('word_detail', args=[word.slug]), HTTP_ACCEPT_ENCODING='gzip', **self.BOT
+            )
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+    def test_pages_follow_word_changes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            word = _make_approved_word(word='degisen')
+        page = self.pages / f'{word.slug}.html'
+        self.assertIn('tanim', page.read_text())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            word.categories.add(Category.objects.create(name='Bilim', slug='bilim', description='x'))
+        self.assertIn('Bilim', page.read_text())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            word.status = 'rejected'
+            word.save()
+        self.assertFalse(page.exists())
+
+    def test_category_saves_rerender_only_for_displayed_fields(self):
+        category = Category.objects.create(name='Bilim', slug='bilim', description='x')
+        word = _make_approved_word(word='kategorili')
+        word.categories.add(category)
+
+        with patch('core.prerender.refresh') as refresh, self.captureOnCommitCallbacks(execute=True):
+            category.order = 5
+            category.description = 'yeni'
+            category.save()
+        refresh.assert_not_called()
+
+        with patch('core.prerender.refresh') as refresh, self.captureOnCommitCallbacks(execute=True):
+            category.name = 'Fen'
+            category.save()
+        refresh.assert_called_once_with([word.pk])
+
+    @patch('core.prerender.INLINE_REFRESH_LIMIT', 1)
+    def test_large_category_changes_drop_pages_instead_of_rendering(self):
+        from . import prerender
+
+        category = Category.objects.create(name='Bilim', slug='bilim', description='x')
+        words = [_make_approved_word(word=w) for w in ('birinci', 'ikinci')]
+        for word in words:
+            word.categories.add(category)
+            prerender.write(word)
+
+        with patch('core.prerender.refresh') as refresh, self.captureOnCommitCallbacks(execute=True):
+            category.name = 'Fen'
+            category.save()
+        refresh.assert_not_called()
+        self.assertFalse(any((self.pages / f'{w.slug}.html').exists() for w in words))
+
+    def test_pages_are_world_readable_and_unreadable_ones_fall_back(self):
+        from pathlib import Path
+        from . import prerender
+
+        word = _make_approved_word(word='izinli')
+        prerender.write(word)
+        self.assertEqual((self.pages / f'{word.slug}.html').stat().st_mode & 0o777, 0o644)
+
+        with patch.object(Path, 'read_bytes', side_effect=PermissionError), self.assertLogs('core.prerender', 'WARNING'):
+            response = self.client.get(reverse('word_detail', args=[word.slug]), **self.BOT)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('izinli', response.content.decode())
+
+    def test_pages_follow_username_changes(self):
+        user = User.objects.create_user(username='eskiad', password='x')
+        with self.captureOnCommitCallbacks(execute=True):
+            word = _make_approved_word(user=user, word='imzali')
+        self.client.get(reverse('get_word_by_slug', args=[word.slug]))
+        page = self.pages / f'{word.slug}.html'
+        self.assertIn('eskiad', page.read_text())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            user.username = 'yeniad'
+            user.save()
+        self.assertIn('yeniad', page.read_text())
+        self.assertEqual(self.client.get(reverse('get_word_by_slug', args=[word.slug])).json()['word']['author'], 'yeniad')
+
+
+# ---------------------------------------------------------------------------
+# 31. Sitemaps
+# ---------------------------------------------------------------------------
+
+@override_settings(SITE_URL='https://example.test')
+class SitemapTests(TestCase):
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+
+    def _xml(self, response):
+        return b''.join(response.streaming_content).decode()
+
+    def test_index_lists_shards_and_robots_points_to_it(self):
+        word = _make_approved_word(word='harita')
+        index = self._xml(self.client.get(reverse('sitemap_index')))
+        self.assertIn('https://example.test/sitemap-categories.xml', index)
+        self.assertIn(f'https://example.test/sitemap-words-{(word.pk - 1) // 50000}.xml', index)
+        self.assertIn('<lastmod>', index)
+        robots = self.client.get(reverse('robots_txt')).content.decode()
+        self.assertIn('Sitemap: https://example.test/sitemap.xml', robots)
+
+    def test_shard_streams_in_batches_and_is_cached_gzipped(self):
+        import gzip
+        from . import sitemaps
+
+        words = [_make_approved_word(word=f'sozcuk {i}') for i in range(5)]
+        Word.objects.filter(pk=words[0].pk).update(status='pending')
+        url = reverse('sitemap_words', args=[0])
+
+        with patch.object(sitemaps, 'BATCH_SIZE', 2):
+            first = self._xml(self.client.get(url))
+        self.assertEqual(first.count('<url>'), 4)
+        self.assertNotIn(f'/sozcuk/{words[0].slug}/', first)
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(cached['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(cached.content).decode(), first)
+        self.assertEqual(self._xml(self.client.get(url)), first)
+
+    def test_word_change_invalidates_its_shard(self):
+        word = _make_approved_word(word='eski')
+        url = reverse('sitemap_words', args=[0])
+        self.assertNotIn('/sozcuk/yeni/', self._xml(self.client.get(url)))
+
+        _make_approved_word(word='yeni')
+        self.assertIn('/sozcuk/yeni/', self._xml(self.client.get(url)))
+        self.assertIn(f'/sozcuk/{word.slug}/', self._xml(self.client.get(url)))
+
+    def test_empty_shards_are_not_found_and_not_cached(self):
+        from django.core.cache import cache
+        from . import sitemaps
+
+        _make_approved_word()
+        resp = self.client.get(reverse('sitemap_words', args=[987654]))
+        self.assertEqual(resp.status_code, 404)
+        self.assertIsNone(cache.get(sitemaps.words_key(987654)))
+
+
+# ---------------------------------------------------------------------------
+# 32. Bot detection
+# ---------------------------------------------------------------------------
+
+class StubResolver:
+    def __init__(self, reverse=None, forward=None):
+        self.reverse_map = reverse or {}
+        self.forward_map = forward or {}
+        self.calls = 0
+
+    def reverse(self, ip):
+        import socket
+        self.calls += 1
+        if ip not in self.reverse_map:
+            raise socket.herror(1, 'Unknown host')
+        return self.reverse_map[ip]
+
+    def forward(self, host):
+        return self.forward_map.get(host, [])
+
+
+class BotDetectionTests(TestCase):
+
+    def test_classification_matches_the_substring_lists(self):
+        from .botdetect import BOT_GENERIC, BOT_SPECIFIC, is_bot
+
+        for token in BOT_SPECIFIC + BOT_GENERIC:
+            self.assertTrue(is_bot(f'Mozilla/5.0 (compatible; {token.upper()}/1.0)'), token)
+        self.assertFalse(is_bot('Mozilla/5.0 (X11; Linux x86_64) Firefox/126.0'))
+        self.assertFalse(is_bot(None))
+        self.assertTrue(is_bot('x' * 5000 + ' Googlebot'))
+
+    def _verifier(self, resolver, now):
+        from .botdetect import CrawlerVerifier
+        return CrawlerVerifier(resolver=resolver, clock=lambda: now[0])
+
+    def test_verified_crawler_needs_matching_reverse_and_forward_dns(self):
+        resolver = StubResolver(
+            reverse={'66.249.66.1': 'crawl-66-249-66-1.googlebot.com', '6.6.6.6': 'evil.example.com'},
+            forward={'crawl-66-249-66-1.googlebot.com': ['66.249.66.1']},
+        )
+        verifier = self._verifier(resolver, [0])
+        ua = 'Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)'
+
+        self.assertTrue(verifier.verify('66.249.66.1', ua))
+        self.assertFalse(verifier.verify('6.6.6.6', ua))         # wrong domain
+        self.assertFalse(verifier.verify('1.2.3.4', ua))         # no PTR record
+        self.assertFalse(verifier.verify('66.249.66.1', 'Mozilla/5.0 Firefox'))  # not a crawler UA
+
+    def test_results_are_cached_until_the_ttl(self):
+        from .botdetect import VERIFIED_TTL
+
+        resolver = StubResolver(
+            reverse={'157.55.39.1': 'msnbot-157-55-39-1.search.msn.com'},
+            forward={'msnbot-157-55-39-1.search.msn.com': ['157.55.39.1']},
+        )
+        now = [100.0]
+        verifier = self._verifier(resolver, now)
+        ua = 'Mozilla/5.0 (compatible; bingbot/2.0)'
+
+        for _ in range(3):
+            self.assertTrue(verifier.verify('157.55.39.1', ua))
+        self.assertEqual(resolver.calls, 1)
+        now[0] += VERIFIED_TTL + 1
+        verifier.verify('157.55.39.1', ua)
+        self.assertEqual(resolver.calls, 2)
+
+
+# ---------------------------------------------------------------------------
+# 33. Cloudflare range table
+# ---------------------------------------------------------------------------
+
+class CloudflareRangeTableTests(TestCase):
+
+    def _table(self, ranges):
+        import ipaddress
+        from .middleware import _RangeTable
+        return _RangeTable([ipaddress.ip_network(r) for r in ranges])
+
+    def test_adjacent_and_overlapping_networks_are_merged(self):
+        from .middleware import _merge
+        self.assertEqual(_merge([(10, 19), (0, 9), (15, 30), (40, 50)]), ((0, 40), (30, 50)))
+
+    def test_range_boundaries(self):
+        table = self._table(['10.0.0.0/24', '10.0.2.0/24', '2606:4700::/32'])
+        self.assertTrue(table.contains('10.0.0.0'))
+        self.assertTrue(table.contains('10.0.0.255'))
+        self.assertFalse(table.contains('10.0.1.0'))
+        self.assertTrue(table.contains('10.0.2.0'))
+        self.assertFalse(table.contains('10.0.3.0'))
+        self.assertFalse(table.contains('9.255.255.255'))
+        self.assertTrue(table.contains('2606:4700:ffff:ffff:ffff:ffff:ffff:ffff'))
+        self.assertFalse(table.contains('2606:4701::'))
+        # Families are kept apart: the IPv4-mapped form is not an IPv4 address
+        self.assertFalse(table.contains('::ffff:10.0.0.1'))
+
+
+# ---------------------------------------------------------------------------
+# 34. Cloudflare range snapshot
+# ---------------------------------------------------------------------------
+
+class CloudflareSnapshotTests(TestCase):
+
+    def setUp(self):
+        import tempfile
+        from pathlib import Path
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / 'cloudflare-ips.txt'
+        self.settings_override = override_settings(CLOUDFLARE_RANGES_PATH=str(self.path))
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+    def _fresh_cache(self):
+        from .middleware import _CfIpCache
+        return _CfIpCache()
+
+    def _recheck(self, cf):
+        cf._next_check = 0.0
+
+    def test_without_a_snapshot_the_built_in_list_is_used(self):
+        cf = self._fresh_cache()
+        self.assertTrue(cf.contains('104.16.0.1'))
+        self.assertFalse(cf.contains('192.0.2.1'))
+
+    def test_workers_reload_the_snapshot_when_it_changes(self):
+        import os
+        cf = self._fresh_cache()
+        self.path.write_text('# test\n192.0.2.0/24\n2001:db8::/32\n')
+        self.assertTrue(cf.contains('192.0.2.1'))
+        self.assertFalse(cf.contains('104.16.0.1'))
+        table = cf._table
+
+        # Unchanged file: no reload
+        self._recheck(cf)
+        cf.contains('192.0.2.1')
+        self.assertIs(cf._table, table)
+
+        self.path.write_text('198.51.100.0/24\n')
+        os.utime(self.path, ns=(0, 10 ** 9))
+        self.assertTrue(cf.contains('192.0.2.1'))  # not re-checked yet
+        self._recheck(cf)
+        self.assertTrue(cf.contains('198.51.100.7'))
+        self.assertFalse(cf.contains('192.0.2.1'))
+
+    def test_broken_snapshot_keeps_the_previous_table(self):
+        cf = self._fresh_cache()
+        self.path.write_text('not-a-network\n')
+        with self.assertLogs('core.middleware', 'WARNING'):
+            self.assertTrue(cf.contains('104.16.0.1'))
+
+    def test_command_writes_the_snapshot_only_when_it_changed(self):
+        import ipaddress
+        from io import StringIO
+        from django.core.management import call_command
+
+        networks = [ipaddress.ip_network('192.0.2.0/24'), ipaddress.ip_network('2001:db8::/32')]
+        with patch('core.management.commands.refresh_cloudflare_ips.fetch_ranges', return_value=networks):
+            call_command('refresh_cloudflare_ips', stdout=StringIO())
+            self.assertEqual(self.path.read_text(), '192.0.2.0/24\n2001:db8::/32\n')
+            self.assertEqual(self.path.stat().st_mode & 0o777, 0o644)
+            mtime = self.path.stat().st_mtime_ns
+            out = StringIO()
+            call_command('refresh_cloudflare_ips', stdout=out)
+        self.assertIn('değişmedi', out.getvalue())
+        self.assertEqual(self.path.stat().st_mtime_ns, mtime)
+
+    def test_command_keeps_the_snapshot_when_the_download_fails(self):
+        from django.core.management import call_command
+        from django.core.management.base import CommandError
+
+        self.path.write_text('192.0.2.0/24\n')
+        with patch('core.middleware.urllib.request.urlopen', side_effect=OSError('offline')):
+            with self.assertRaises(CommandError):
+                call_command('refresh_cloudflare_ips')
+        self.assertEqual(self.path.read_text(), '192.0.2.0/24\n')
+
+
+# ---------------------------------------------------------------------------
+# 35. Request metrics
+# ---------------------------------------------------------------------------
+
+class MetricsTests(TestCase):
+
+    def setUp(self):
+        from django.core.cache import cache
+        from . import cachelayer, metrics
+
+        cache.clear()
+        cachelayer.clear_local()
+        metrics.reset()
+        self.addCleanup(metrics.reset)
+
+    def _collect(self):
+        from . import metrics
+        return metrics.collect()
+
+    def test_requests_are_recorded_per_url_name(self):
+        _make_approved_word()
+        self.client.get(reverse('get_words'))
+        self.client.get(reverse('get_words'))
+        self.client.get(reverse('get_categories'))
+
+        samples = self._collect()
+        self.assertEqual(samples['request_duration_seconds', '_count', 'get_words', ''], 2)
+        self.assertEqual(samples['request_duration_seconds', '_bucket', 'get_words', '+Inf'], 2)
+        self.assertEqual(samples['request_duration_seconds', '_count', 'get_categories', ''], 1)
+        self.assertGreater(samples['db_queries', '_sum', 'get_words', ''], 0)
+        self.assertGreater(samples['response_size_bytes', '_sum', 'get_words', ''], 0)
+        # Buckets are cumulative: no bucket counts more than the next one
+        buckets = [samples['request_duration_seconds', '_bucket', 'get_words', str(b)]
+                   for b in (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)]
+        self.assertEqual(buckets, sorted(buckets))
+
+    def test_cache_hits_and_misses(self):
+        self.client.get(reverse('get_categories'))
+        self.client.get(reverse('get_categories'))
+
+        samples = self._collect()
+        self.assertEqual(samples['cache_misses_total', '', 'get_categories', ''], 1)
+        self.assertEqual(samples['cache_hits_total', '', 'get_categories', ''], 1)
+
+    def test_workers_add_up_in_the_shared_file(self):
+        import tempfile
+        from pathlib import Path
+        from . import metrics
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        with override_settings(METRICS_PATH=str(Path(tmp.name) / 'metrics.sqlite3')):
+            for seconds in (0.003, 0.2):
+                # One record and flush per simulated worker
+                metrics.record('vote', seconds, metrics.RequestMetrics())
+                metrics.flush()
+            samples = self._collect()
+
+        self.assertEqual(samples['request_duration_seconds', '_count', 'vote', ''], 2)
+        self.assertEqual(samples['request_duration_seconds', '_bucket', 'vote', '0.005'], 1)
+        self.assertEqual(samples['request_duration_seconds', '_bucket', 'vote', '0.25'], 2)
+        self.assertAlmostEqual(samples['request_duration_seconds', '_sum', 'vote', ''], 0.203)
+
+    def test_endpoint_is_staff_only_prometheus_text(self):
+        self.client.get(reverse('get_categories'))
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+
+        staff = User.objects.create_user(username='yonetici', password='sifre12345', is_staff=True)
+        self.client.force_login(staff)
+        resp = self.client.get(reverse('metrics'))
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = resp.content.decode()
+        self.assertIn('# TYPE yenisozcukler_request_duration_seconds histogram', body)
+        self.assertIn('yenisozcukler_request_duration_seconds_bucket{view="get_categories",le="+Inf"} 1\n', body)
+        self.assertIn('yenisozcukler_cache_misses_total{view="get_categories"} 1\n', body)
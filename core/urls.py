@@ -4,6 +4,9 @@ from . import views
 urlpatterns = [
     # robots.txt
     path('robots.txt', views.robots_txt, name='robots_txt'),
+    path('sitemap.xml', views.sitemap_index, name='sitemap_index'),
+    path('sitemap-words-<int:shard>.xml', views.sitemap_words, name='sitemap_words'),
+    path('sitemap-categories.xml', views.sitemap_categories, name='sitemap_categories'),
 
     # Ana Sayfa (Bot-aware)
     path('', views.index_view, name='index'),
@@ -18,6 +21,8 @@ urlpatterns = [
     path('api/comments/<int:word_id>', views.get_comments, name='get_comments'),
     path('api/categories', views.get_categories, name='get_categories'),
     path('api/my-words', views.get_my_words, name='get_my_words'),
+    path('api/cache-stats', views.cache_stats, name='cache_stats'),
+    path('metrics', views.metrics_view, name='metrics'),
 
     # POST API
     path('api/word', views.add_word, name='add_word'),
@@ -37,6 +42,7 @@ urlpatterns = [
     path('api/notifications', views.get_notifications, name='get_notifications'),
     path('api/notifications/unread-count', views.get_unread_count, name='get_unread_count'),
     path('api/notifications/mark-read', views.mark_notifications_read, name='mark_notifications_read'),
+    path('api/notifications/stream', views.notification_stream, name='notification_stream'),
 
     # SPA catch-all (Bot-aware)
     path('kategori/<slug:slug>/', views.category_view, name='spa_category'),
@@ -1,4 +1,7 @@
 # core/views.py
+import asyncio
+import hashlib
+import json
 import logging
 import requests as http_requests
 
@@ -6,28 +9,39 @@ from django.conf import settings
 from decouple import config
 from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.authentication import SessionAuthentication
 
 from django.shortcuts import get_object_or_404, render
-from django.http import HttpResponse, HttpResponseNotFound
+from django.http import HttpResponse, HttpResponseNotFound, JsonResponse, StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from asgiref.sync import sync_to_async
 from django_ratelimit.decorators import ratelimit
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate, login, logout, update_session_auth_hash
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-from django.core.cache import cache
-from django.db.models import Count, F, Sum, Q
+from django.db.models import Count, F, OuterRef, Subquery, Sum
 from django.db import transaction, DatabaseError, OperationalError, IntegrityError
 
 from .models import Word, Comment, WordVote, CommentVote, Category, Notification
+from . import pagecache, prerender, search, sitemaps, vote_queue
+from . import cachelayer, metrics
+from .botdetect import is_bot
+from .cachelayer import CATEGORIES, FEED, WORDS
+from .events import broker
+from .notifications import (
+    adjust_unread, challenge_timers, freeze_payloads, notify, sync_vote_notification, unread_count,
+)
+from .votes import cast_vote
+from .pagination import KeysetPaginator, InvalidCursor, paginate_request
 from .serializers import (
     WordSerializer, CommentSerializer,
     WordCreateSerializer, CommentCreateSerializer,
     AuthSerializer, ChangeUsernameSerializer,
     WordAddExampleSerializer, CategorySerializer,
-    NotificationSerializer
+    NotificationSerializer, FrozenNotificationSerializer
 )
 
 logger = logging.getLogger(__name__)
@@ -90,70 +104,164 @@ _ROBOTS_TXT = (
 )
 
 def robots_txt(request):
-    return HttpResponse(_ROBOTS_TXT, content_type='text/plain')
+    return HttpResponse(
+        f'{_ROBOTS_TXT}\nSitemap: {settings.SITE_URL}/sitemap.xml\n', content_type='text/plain'
+    )
 
-# --- BOT DETECTION ---
+# --- SITEMAPS (core/sitemaps.py) ---
 
-BOT_SPECIFIC = [
-    'googlebot', 'bingbot', 'yandexbot', 'duckduckbot', 'baiduspider',
-    'slurp', 'facebookexternalhit', 'linkedinbot',
-    'whatsapp', 'telegrambot', 'discordbot', 'applebot',
-]
-BOT_GENERIC = ['bot', 'crawler', 'spider', 'scraper', 'preview']
+def sitemap_index(request):
+    return sitemaps.respond(request, sitemaps.INDEX_KEY, sitemaps.index_chunks)
+
+def sitemap_words(request, shard):
+    return sitemaps.respond(
+        request, sitemaps.words_key(shard), lambda: sitemaps.word_chunks(shard),
+        exists=lambda: sitemaps.shard_exists(shard),
+    )
 
-def _is_bot(ua):
-    ua = (ua or '').lower()
-    return any(p in ua for p in BOT_SPECIFIC) or any(p in ua for p in BOT_GENERIC)
+def sitemap_categories(request):
+    return sitemaps.respond(request, sitemaps.CATEGORIES_KEY, sitemaps.category_chunks)
 
 # --- DYNAMIC RENDERING VIEWS ---
 
 @permission_classes([])
 def index_view(request):
-    if _is_bot(request.META.get('HTTP_USER_AGENT')):
+    if is_bot(request.META.get('HTTP_USER_AGENT')):
         words = Word.objects.filter(status='approved').select_related('user').order_by('-timestamp')[:50]
-        response = render(request, 'bot_index.html', {'words': words})
+        response = pagecache.serve(
+            request, pagecache.INDEX_KEY, lambda: render(request, 'bot_index.html', {'words': words})
+        )
     else:
         response = render(request, 'index.html')
     
-    response['Vary'] = 'User-Agent'
+    patch_vary_headers(response, ['User-Agent'])
     return response
 
 @permission_classes([])
 def category_view(request, slug):
-    if _is_bot(request.META.get('HTTP_USER_AGENT')):
-        category = get_object_or_404(Category, slug=slug)
-        words = Word.objects.filter(status='approved', categories=category).select_related('user').order_by('-timestamp')[:50]
-        response = render(request, 'bot_category.html', {'category': category, 'words': words})
+    if is_bot(request.META.get('HTTP_USER_AGENT')):
+        def render_category():
+            category = get_object_or_404(Category, slug=slug)
+            words = Word.objects.filter(status='approved', categories=category).select_related('user').order_by('-timestamp')[:50]
+            return render(request, 'bot_category.html', {'category': category, 'words': words})
+        response = pagecache.serve(request, pagecache.category_key(slug), render_category)
     else:
         response = render(request, 'index.html')
         
-    response['Vary'] = 'User-Agent'
+    patch_vary_headers(response, ['User-Agent'])
     return response
 
 @permission_classes([])
 def word_detail(request, word_slug):
-    if _is_bot(request.META.get('HTTP_USER_AGENT')):
-        word = get_object_or_404(
-            Word.objects.select_related('user').prefetch_related('categories'),
-            slug=word_slug,
-            status='approved'
-        )
-        response = render(request, 'word_detail.html', {'word': word})
+    if is_bot(request.META.get('HTTP_USER_AGENT')):
+        response = prerender.serve(request, word_slug)
+        if response is not None:
+            patch_vary_headers(response, ['User-Agent'])
+            return response
+
+        def render_word():
+            word = get_object_or_404(
+                Word.objects.select_related('user').prefetch_related('categories'),
+                slug=word_slug,
+                status='approved'
+            )
+            return render(request, 'word_detail.html', {'word': word})
+        response = pagecache.serve(request, pagecache.word_key(word_slug), render_word)
     else:
         response = render(request, 'index.html')
 
-    response['Vary'] = 'User-Agent'
+    patch_vary_headers(response, ['User-Agent'])
     return response
 
 @permission_classes([])
 def spa_catchall(request, *args, **kwargs):
-    if _is_bot(request.META.get('HTTP_USER_AGENT')):
+    if is_bot(request.META.get('HTTP_USER_AGENT')):
         return HttpResponseNotFound()
     return render(request, 'index.html')
 
 
 # --- OKUMA (READ) ENDPOINTLERİ ---
 
+# Every feed ordering ends with the primary key so each row has a unique
+# position; KeysetPaginator needs that to resume exactly after the last row.
+WORD_FEED_ORDERINGS = {
+    'date_desc': ('-timestamp', '-id'),
+    'date_asc': ('timestamp', 'id'),
+    'score_desc': ('-score', '-timestamp', '-id'),
+    'score_asc': ('score', '-timestamp', '-id'),
+}
+COMMENT_ORDERING = ('timestamp', 'id')
+NOTIFICATION_ORDERING = ('-timestamp', '-id')
+
+def _word_votes_for(user, word_ids):
+    """
+    {word_id: (score, vote_value)} for the given user over the given word
+    ids, in one query: the live score next to the user's vote.
+    """
+    user_votes = {}
+    try:
+        if word_ids and user.is_authenticated:
+            votes = Word.objects.filter(pk__in=word_ids).annotate(
+                user_vote_value=Subquery(
+                    WordVote.objects.filter(word=OuterRef('pk'), user=user).values('value')[:1]
+                )
+            ).values_list('pk', 'score', 'user_vote_value')
+
+            for word_id, score, value in votes:
+                user_votes[word_id] = (score, value)
+
+    except (DatabaseError, OperationalError):
+        pass
+    return user_votes
+
+
+def _with_user_votes(user, words_data):
+    """
+    Copies of cached (user-independent) serialized words with ``user_vote``
+    filled in. ``score`` is read live alongside it, so a cached score never
+    contradicts the user's own vote.
+    """
+    if not user.is_authenticated:
+        return words_data
+    user_votes = _word_votes_for(user, [w['id'] for w in words_data])
+    labels = {1: 'like', -1: 'dislike'}
+    result = []
+    for w in words_data:
+        score, vote = user_votes.get(w['id'], (w['score'], None))
+        result.append({**w, 'user_vote': labels.get(vote), 'score': score})
+    return result
+
+
+def _feed_page(words_queryset, sort, cursor, page_number, limit, count_cacheable):
+    """
+    One feed page as a cacheable dict, serialized without per-user fields.
+    Cursor mode (``cursor`` not None, empty for the first page) is a keyset
+    seek without COUNT(*); raises InvalidCursor.
+    """
+    if cursor is not None:
+        words_page = KeysetPaginator(words_queryset, WORD_FEED_ORDERINGS[sort], limit).page(cursor)
+        return {
+            'words': list(WordSerializer(words_page, many=True).data),
+            'next_cursor': words_page.next_cursor,
+            'has_next': words_page.has_next,
+        }
+
+    if count_cacheable:
+        total_count = FEED.get_or_set('approved_count', words_queryset.count, 60 * 5)
+    else:
+        total_count = words_queryset.count()
+
+    paginator = Paginator(words_queryset, limit)
+    try:
+        words_page = paginator.page(page_number)
+    except (PageNotAnInteger, EmptyPage):
+        words_page = []
+
+    return {
+        'words': list(WordSerializer(words_page, many=True).data),
+        'total_count': total_count,
+    }
+
 @ratelimit(key='ip', rate='60/m', method='GET', block=False)
 @api_view(['GET'])
 @permission_classes([])
@@ -161,14 +269,9 @@ def get_categories(request):
     if getattr(request, 'limited', False):
         return Response({'error': 'Too many requests'}, status=429)
 
-    cache_key = 'all_active_categories'
-    categories_data = cache.get(cache_key)
-    
-    if not categories_data:
-        categories = Category.objects.filter(is_active=True)
-        serializer = CategorySerializer(categories, many=True)
-        categories_data = serializer.data
-        cache.set(cache_key, categories_data, 60 * 60) 
+    categories_data = CATEGORIES.get_or_set(
+        'active', lambda: list(CategorySerializer(Category.objects.filter(is_active=True), many=True).data)
+    )
 
     return Response({'success': True, 'categories': categories_data})
 
@@ -185,72 +288,45 @@ def get_words(request):
         limit = int(request.GET.get('limit', 20))
     except (ValueError, TypeError):
         limit = 20
-    limit = min(limit, 50)
+    limit = max(1, min(limit, 50))
     tag_slug = request.GET.get('tag')
     sort = request.GET.get('sort', 'date_desc')
     search_query = request.GET.get('search', '').strip()[:40]
 
     words_queryset = Word.objects.filter(status='approved')\
-        .annotate(comment_count=Count('comments'))\
         .select_related('user')\
         .prefetch_related('categories')\
-        .only('id', 'word', 'definition', 'example', 'etymology', 'author', 'timestamp', 'score', 'user__username')
-
-    if sort == 'date_asc':
-        words_queryset = words_queryset.order_by('timestamp')
-    elif sort == 'score_desc':
-        words_queryset = words_queryset.order_by('-score', '-timestamp')
-    elif sort == 'score_asc':
-        words_queryset = words_queryset.order_by('score', '-timestamp')
-    else:
-        words_queryset = words_queryset.order_by('-timestamp')
+        .only('id', 'word', 'definition', 'example', 'etymology', 'author', 'timestamp', 'score', 'comment_count', 'user__username')
+
+    if sort not in WORD_FEED_ORDERINGS:
+        sort = 'date_desc'
+    words_queryset = words_queryset.order_by(*WORD_FEED_ORDERINGS[sort])
     
     if tag_slug:
         words_queryset = words_queryset.filter(categories__slug=tag_slug)
 
     if search_query:
-        words_queryset = words_queryset.filter(
-            Q(word__icontains=search_query) | 
-            Q(definition__icontains=search_query)
-        )
+        words_queryset = search.filter_words(words_queryset, search_query)
 
-    if not tag_slug and not search_query:
-        cache_key = 'total_approved_words_count_all'
-        total_count = cache.get(cache_key)
-        if total_count is None:
-            total_count = words_queryset.count()
-            cache.set(cache_key, total_count, 60 * 5)
-    else:
-        total_count = words_queryset.count()
+    cursor = request.GET.get('cursor')
 
-    paginator = Paginator(words_queryset, limit)
-    try:
-        words_page = paginator.page(page_number)
-    except (PageNotAnInteger, EmptyPage):
-        words_page = []
+    def build_page():
+        return _feed_page(words_queryset, sort, cursor, page_number, limit,
+                          count_cacheable=not tag_slug and not search_query)
 
-    user_votes = {}
-    
     try:
-        if words_page and request.user.is_authenticated:
-            page_word_ids = [w.id for w in words_page]
-            votes = WordVote.objects.filter(
-                user=request.user, 
-                word_id__in=page_word_ids
-            ).values('word', 'value')
-            
-            for v in votes:
-                user_votes[v['word']] = v['value']
-                
-    except (DatabaseError, OperationalError):
-        pass
-
-    serializer = WordSerializer(words_page, many=True, context={'user_votes': user_votes})
+        if search_query:
+            body = build_page()
+        else:
+            page_key = hashlib.sha1(repr((sort, tag_slug, cursor, page_number, limit)).encode()).hexdigest()
+            body = FEED.get_or_set(page_key, build_page)
+    except InvalidCursor as e:
+        return Response({'error': str(e)}, status=400)
 
     return Response({
         'status': 'full',
-        'words': serializer.data,
-        'total_count': total_count
+        **body,
+        'words': _with_user_votes(request.user, body['words']),
     })
 
 @ratelimit(key='ip', rate='120/m', method='GET', block=False)
@@ -261,21 +337,18 @@ def get_comments(request, word_id):
     if getattr(request, 'limited', False):
         return Response({'error': 'Too many requests'}, status=429)
 
-    page = request.GET.get('page', 1)
     try:
         limit = int(request.GET.get('limit', 10))
     except (ValueError, TypeError):
         limit = 10
-    limit = min(limit, 20)
+    limit = max(1, min(limit, 20))
 
     word = get_object_or_404(Word, id=word_id, status='approved')
-    comments_qs = Comment.objects.filter(word=word).select_related('user').order_by('timestamp')
-    paginator = Paginator(comments_qs, limit)
-
+    comments_qs = Comment.objects.filter(word=word).select_related('user')
     try:
-        comments_page = paginator.page(page)
-    except (EmptyPage, PageNotAnInteger):
-        comments_page = []
+        comments_page = paginate_request(request, comments_qs, COMMENT_ORDERING, limit)
+    except InvalidCursor as e:
+        return Response({'error': str(e)}, status=400)
 
     user_votes = {} 
 
@@ -297,7 +370,8 @@ def get_comments(request, word_id):
     return Response({
         'success': True, 
         'comments': serializer.data,
-        'has_next': comments_page.has_next() if hasattr(comments_page, 'has_next') else False
+        'has_next': comments_page.has_next,
+        'next_cursor': comments_page.next_cursor,
     })
 
 
@@ -310,7 +384,6 @@ def get_word(request, word_id):
 
     word = get_object_or_404(
         Word.objects.filter(status='approved')
-            .annotate(comment_count=Count('comments'))
             .select_related('user')
             .prefetch_related('categories'),
         id=word_id
@@ -326,6 +399,17 @@ def get_word(request, word_id):
     return Response({'success': True, 'word': serializer.data})
 
 
+MISSING_WORD_CACHE_SECONDS = 60
+
+
+def _serialized_word(word_slug):
+    word = Word.objects.filter(status='approved', slug=word_slug)\
+        .select_related('user')\
+        .prefetch_related('categories')\
+        .first()
+    return dict(WordSerializer(word).data) if word else None
+
+
 @ratelimit(key='ip', rate='120/m', method='GET', block=False)
 @api_view(['GET'])
 @permission_classes([])
@@ -333,26 +417,30 @@ def get_word_by_slug(request, word_slug):
     if getattr(request, 'limited', False):
         return Response({'error': 'Too many requests'}, status=429)
 
-    cache_key = f'word_slug_{word_slug}'
-    word = cache.get(cache_key)
-    if word is None:
-        word = get_object_or_404(
-            Word.objects.filter(status='approved')
-                .annotate(comment_count=Count('comments'))
-                .select_related('user')
-                .prefetch_related('categories'),
-            slug=word_slug
-        )
-        cache.set(cache_key, word, 60 * 60)
+    # Cached as the serialized dict (None for unknown slugs, briefly, so
+    # crawlers probing dead links do not reach the database every time)
+    data = WORDS.get_or_set(word_slug, lambda: _serialized_word(word_slug),
+                            negative_timeout=MISSING_WORD_CACHE_SECONDS)
+    if data is None:
+        return Response({'detail': 'No Word matches the given query.'}, status=404)
 
-    user_votes = {}
-    if request.user.is_authenticated:
-        vote = WordVote.objects.filter(user=request.user, word=word).values('value').first()
-        if vote:
-            user_votes[word.id] = vote['value']
+    return Response({'success': True, 'word': _with_user_votes(request.user, [data])[0]})
 
-    serializer = WordSerializer(word, context={'user_votes': user_votes})
-    return Response({'success': True, 'word': serializer.data})
+
+@api_view(['GET'])
+@authentication_classes([SessionAuthentication])
+@permission_classes([IsAdminUser])
+def cache_stats(request):
+    """Hit/miss/eviction counters of this worker's two-tier cache (core.cachelayer)."""
+    return Response({'success': True, 'namespaces': cachelayer.stats()})
+
+
+@api_view(['GET'])
+@authentication_classes([SessionAuthentication])
+@permission_classes([IsAdminUser])
+def metrics_view(request):
+    """Per-view latency, query and cache metrics (core.metrics) in Prometheus text format."""
+    return HttpResponse(metrics.render(metrics.collect()), content_type='text/plain; version=0.0.4; charset=utf-8')
 
 
 # --- YAZMA (WRITE) ENDPOINTLERİ ---
@@ -378,97 +466,49 @@ def vote(request, entity_type, entity_id):
 
     if entity_type == 'word':
         ModelClass = Word
-        VoteClass = WordVote
-        lookup_field = 'word'
     elif entity_type == 'comment':
         ModelClass = Comment
-        VoteClass = CommentVote
-        lookup_field = 'comment'
     else:
         return Response({'error': 'Geçersiz tip.'}, status=404)
 
-    obj = get_object_or_404(ModelClass.objects.select_for_update(), id=entity_id)
+    if settings.VOTE_WRITE_BEHIND:
+        # Queue the click and answer with a provisional score; flush_votes
+        # applies it later in a batched transaction.
+        obj = get_object_or_404(ModelClass, id=entity_id)
+        if entity_type == 'word' and obj.status != 'approved':
+            return Response({'error': 'Geçersiz içerik.'}, status=404)
+        new_score, response_action = vote_queue.enqueue_vote(user, entity_type, obj, vote_val, client_ip)
+        return Response({
+            'success': True,
+            'new_score': new_score,
+            'user_action': response_action,
+            'pending': True,
+        })
+
+    obj = get_object_or_404(ModelClass.objects.select_related('user'), id=entity_id)
     
     if entity_type == 'word' and obj.status != 'approved':
         return Response({'error': 'Geçersiz içerik.'}, status=404)
 
-    existing_vote = VoteClass.objects.filter(user=user, **{lookup_field: obj}).first()
-    response_action = 'none'
-
-    if existing_vote:
-        if existing_vote.value == vote_val:
-            existing_vote.delete()
-            obj.score = F('score') - vote_val
-            response_action = 'none'
-        else:
-            existing_vote.value = vote_val
-            existing_vote.save(update_fields=['value'])
-            obj.score = F('score') + (vote_val * 2)
-            response_action = 'liked' if vote_val == 1 else 'disliked'
-    else:
-        try:
-            new_vote = VoteClass(
-                value=vote_val,
-                ip_address=client_ip,
-                user=user,
-                **{lookup_field: obj}
-            )
-            new_vote.save()
-        except IntegrityError:
-            return Response({'error': 'Oy zaten kaydedildi.'}, status=409)
-        obj.score = F('score') + vote_val
-        response_action = 'liked' if vote_val == 1 else 'disliked'
-
-    obj.save(update_fields=['score'])
-    obj.refresh_from_db()
+    result = cast_vote(entity_type, obj.id, user.id, vote_val, client_ip)
+    if result.score is None:
+        transaction.set_rollback(True)
+        return Response({'error': 'Geçersiz içerik.'}, status=404)
+    response_action = result.user_action
+    if entity_type == 'word' and result.delta:
+        # The raw score UPDATE skips Word.save, which would have dropped these
+        pagecache.forget_word_scores([obj.slug])
 
     owner = obj.user if hasattr(obj, 'user') else None
-    if owner and owner != user:
-        prefix = 'word' if entity_type == 'word' else 'comment'
-        like_type = f'{prefix}_like'
-        dislike_type = f'{prefix}_dislike'
-        current_type = like_type if vote_val == 1 else dislike_type
-        opposite_type = dislike_type if vote_val == 1 else like_type
-
-        # This dictionary is critical to preventing the lookup_kwargs error.
-        lookup_kwargs = {'word': obj} if entity_type == 'word' else {'comment': obj}
-
-        if response_action == 'none':
-            # SOFT DELETE: Instead of .delete(), we deactivate it.
-            updated = Notification.objects.filter(
-                recipient=owner, actor=user, notification_type=current_type, **lookup_kwargs
-            ).update(is_active=False)
-            
-            if updated:
-                cache.delete(f'notif_unread_{owner.id}')
-        else:
-            # Deactivate the opposite vote type (e.g. they switched from dislike to like)
-            Notification.objects.filter(
-                recipient=owner, actor=user, notification_type=opposite_type, **lookup_kwargs
-            ).update(is_active=False)
-            
-            # This defaults dictionary is also required for get_or_create
-            defaults = {'comment': None} if entity_type == 'word' else {'word': obj.word}
-            defaults['is_active'] = True
-            
-            # Fetch or create the notification. 
-            notif, created = Notification.objects.get_or_create(
-                recipient=owner, actor=user, notification_type=current_type, 
-                **lookup_kwargs, defaults=defaults
-            )
-            
-            # REVIVE: If it existed but was deactivated, turn it back on.
-            if not created and not notif.is_active:
-                notif.is_active = True
-                notif.is_read = False  # Mark unread so they see it again
-                notif.save(update_fields=['is_active', 'is_read'])
-                cache.delete(f'notif_unread_{owner.id}')
-            elif created:
-                cache.delete(f'notif_unread_{owner.id}')
+    if entity_type == 'word':
+        target, defaults = {'word_id': obj.id}, None
+    else:
+        target, defaults = {'comment_id': obj.id}, {'word_id': obj.word_id}
+    sync_vote_notification(owner, user, entity_type, result.old_value, result.new_value, target, defaults)
 
     return Response({
         'success': True,
-        'new_score': obj.score,
+        'new_score': result.score,
         'user_action': response_action
     })
 
@@ -509,8 +549,6 @@ def add_word(request):
             word.score = 1
             word.save(update_fields=['score'])
 
-        cache.delete('total_approved_words_count_all')
-        
         return Response({'success': True})
     else:
         first_error = next(iter(serializer.errors.values()))[0]
@@ -580,14 +618,7 @@ def add_comment(request):
         new_comment.score = 1
 
         if word.user and word.user != request.user:
-            Notification.objects.create(
-                recipient=word.user,
-                actor=request.user,
-                notification_type='new_comment',
-                word=word,
-                comment=new_comment,
-            )
-            cache.delete(f'notif_unread_{word.user.id}')
+            notify(word.user, 'new_comment', actor=request.user, word=word, comment=new_comment)
 
         return Response({'success': True, 'comment': CommentSerializer(new_comment).data}, status=201)
     else:
@@ -788,7 +819,7 @@ def get_my_words(request):
         limit = int(request.GET.get('limit', 20))
     except (ValueError, TypeError):
         limit = 20
-    limit = min(limit, 50)
+    limit = max(1, min(limit, 50))
     
     if target_username:
         user = get_object_or_404(User, username__iexact=target_username)
@@ -798,7 +829,6 @@ def get_my_words(request):
         return Response({'success': False, 'error': 'Yetkisiz erişim.'}, status=401)
 
     words_qs = Word.objects.filter(user=user, status='approved')\
-        .annotate(comment_count=Count('comments'))\
         .select_related('user')\
         .prefetch_related('categories')\
         .order_by('-timestamp')
@@ -830,6 +860,31 @@ def get_my_words(request):
 
 # --- BİLDİRİM (NOTIFICATION) ENDPOINTLERİ ---
 
+# Everything the frozen-payload list reads: one row from the seek index, no joins
+NOTIFICATION_LIST_COLUMNS = (
+    'id', 'notification_type', 'actor', 'word', 'comment', 'challenge_comment',
+    'message', 'is_read', 'timestamp', 'actor_count', 'recent_actors', 'payload',
+)
+
+
+def _notification_queryset(**filters):
+    qs = Notification.objects.filter(**filters)
+    if settings.NOTIFICATION_FROZEN_PAYLOAD:
+        return qs.only(*NOTIFICATION_LIST_COLUMNS)
+    return qs.select_related('actor', 'word', 'comment', 'challenge_comment', 'challenge_comment__challenge')
+
+
+def _serialize_notifications(notifications):
+    if not settings.NOTIFICATION_FROZEN_PAYLOAD:
+        return NotificationSerializer(notifications, many=True).data
+    notifications = list(notifications)
+    # Rows written before payloads existed are frozen in memory for this response
+    freeze_payloads([n for n in notifications if n.payload is None])
+    return FrozenNotificationSerializer(
+        notifications, many=True, context={'challenges': challenge_timers(notifications)}
+    ).data
+
+
 @ratelimit(key=universal_rate_key, rate='60/m', method='GET', block=False)
 @api_view(['GET'])
 @authentication_classes([SessionAuthentication])
@@ -838,25 +893,24 @@ def get_notifications(request):
     if getattr(request, 'limited', False):
         return Response({'error': 'Too many requests'}, status=429)
 
-    page_number = request.GET.get('page', 1)
-    limit = min(int(request.GET.get('limit', 20)), 50)
+    try:
+        limit = int(request.GET.get('limit', 20))
+    except (ValueError, TypeError):
+        limit = 20
+    limit = max(1, min(limit, 50))
 
     # Filtering strictly for active notifications to prevent spam
-    qs = Notification.objects.filter(recipient=request.user, is_active=True).select_related(
-        'actor', 'word', 'comment', 'challenge_comment', 'challenge_comment__challenge'
-    )
-    paginator = Paginator(qs, limit)
+    qs = _notification_queryset(recipient=request.user, is_active=True)
     try:
-        page = paginator.page(page_number)
-    except (PageNotAnInteger, EmptyPage):
-        page = []
-
-    serializer = NotificationSerializer(page, many=True)
+        page = paginate_request(request, qs, NOTIFICATION_ORDERING, limit)
+    except InvalidCursor as e:
+        return Response({'error': str(e)}, status=400)
 
     return Response({
         'success': True,
-        'notifications': serializer.data,
-        'has_next': page.has_next() if hasattr(page, 'has_next') else False,
+        'notifications': _serialize_notifications(page),
+        'has_next': page.has_next,
+        'next_cursor': page.next_cursor,
     })
 
 
@@ -868,12 +922,7 @@ def get_unread_count(request):
     if getattr(request, 'limited', False):
         return Response({'error': 'Too many requests'}, status=429)
 
-    cache_key = f'notif_unread_{request.user.id}'
-    count = cache.get(cache_key)
-    if count is None:
-        count = Notification.objects.filter(recipient=request.user, is_read=False, is_active=True).count()
-        cache.set(cache_key, count, 60)
-    return Response({'success': True, 'unread_count': count})
+    return Response({'success': True, 'unread_count': unread_count(request.user.id)})
 
 
 @ratelimit(key=universal_rate_key, rate='30/m', method='POST', block=False)
@@ -894,7 +943,69 @@ def mark_notifications_read(request):
     else:
         return Response({'success': False, 'error': 'İşaretlenecek bildirim ID\'leri eksik.'}, status=400)
         
-    qs.update(is_read=True)
-    cache.delete(f'notif_unread_{request.user.id}')
+    adjust_unread(request.user.id, -qs.update(is_read=True))
+
+    return Response({'success': True})
+
+
+# --- Notification event stream (SSE) ---
+# Needs an ASGI server (config/asgi.py); the front end falls back to polling
+# get_unread_count when the stream is disabled or unavailable.
+
+STREAM_HEARTBEAT_SECONDS = 25
+STREAM_MAX_SECONDS = 15 * 60
+
 
-    return Response({'success': True})
\ No newline at end of file
+def _sse(event, data):
+    return f'event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n'
+
+
+def _stream_notification(notification_id, user_id):
+    notif = _notification_queryset(pk=notification_id, recipient_id=user_id, is_active=True).first()
+    return _serialize_notifications([notif])[0] if notif else None
+
+
+async def notification_stream(request):
+    if not settings.NOTIFICATION_STREAM_ENABLED:
+        return HttpResponseNotFound()
+    user = await request.auser()
+    if not user.is_authenticated:
+        return JsonResponse({'error': 'Giriş yapmalısınız.'}, status=403)
+
+    user_id = user.id
+    get_count = sync_to_async(unread_count)
+    get_notification = sync_to_async(_stream_notification)
+
+    async def events():
+        entry = broker.subscribe(user_id)
+        _loop, queue = entry
+        deadline = asyncio.get_running_loop().time() + STREAM_MAX_SECONDS
+        try:
+            last_count = await get_count(user_id)
+            yield f'retry: {STREAM_HEARTBEAT_SECONDS * 1000}\n' + _sse('unread', {'count': last_count})
+            while asyncio.get_running_loop().time() < deadline:
+                try:
+                    event = await asyncio.wait_for(queue.get(), STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    event = {'type': 'heartbeat'}
+
+                if event['type'] == 'notification':
+                    data = await get_notification(event['id'], user_id)
+                    if data:
+                        yield _sse('notification', data)
+
+                # Every event doubles as a cheap counter check, which also picks
+                # up writes made by other worker processes.
+                count = await get_count(user_id)
+                if count != last_count:
+                    last_count = count
+                    yield _sse('unread', {'count': count})
+                elif event['type'] == 'heartbeat':
+                    yield ': ping\n\n'
+        finally:
+            broker.unsubscribe(user_id, entry)
+
+    response = StreamingHttpResponse(events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
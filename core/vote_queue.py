@@ -0,0 +1,147 @@
+# core/vote_queue.py
+"""
+Write-behind vote ingestion.
+
+With settings.VOTE_WRITE_BEHIND on, a click only appends a VoteIntent row (a
+single short INSERT, no row locks) and answers with a provisional score. The
+``flush_votes`` command later replays queued intents in batches: each batch is
+one transaction that writes the net vote rows, one score UPDATE per voted
+object and at most one notification change per (voter, object) pair.
+"""
+import logging
+from collections import OrderedDict
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import F
+
+from . import pagecache
+from .models import VoteIntent
+from .notifications import sync_vote_notification
+from .votes import entity_config, apply_click
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_vote(user, entity_type, obj, vote_val, ip_address=None):
+    """
+    Queue one click and return (provisional score, user_action).
+
+    The provisional score is the committed score plus this user's own queued
+    clicks, so a user toggling quickly sees consistent numbers; other voters'
+    queued clicks show up after the next flush.
+    """
+    _model, vote_model, fk, _prefix = entity_config(entity_type)
+
+    current = vote_model.objects.filter(user=user, **{fk: obj}).values_list('value', flat=True).first()
+    pending = VoteIntent.objects.filter(
+        entity_type=entity_type, entity_id=obj.pk, user=user
+    ).order_by('id').values_list('value', flat=True)
+
+    provisional = obj.score
+    for value in pending:
+        current, delta, _action = apply_click(current, value)
+        provisional += delta
+    _new, delta, action = apply_click(current, vote_val)
+
+    VoteIntent.objects.create(
+        user=user,
+        entity_type=entity_type,
+        entity_id=obj.pk,
+        value=vote_val,
+        ip_address=ip_address,
+    )
+    return provisional + delta, action
+
+
+def _is_votable(entity_type, obj):
+    if entity_type == 'word':
+        return obj.status == 'approved'
+    if entity_type == 'challenge_comment':
+        return obj.challenge.status == 'approved' and not obj.challenge.is_closed
+    return True
+
+
+def _apply_entity(entity_type, entity_id, intents):
+    model, vote_model, fk, prefix = entity_config(entity_type)
+
+    qs = model.objects.select_related('user')
+    if entity_type == 'challenge_comment':
+        qs = qs.select_related('challenge')
+    obj = qs.filter(pk=entity_id).first()
+    if obj is None or not _is_votable(entity_type, obj):
+        return
+
+    user_ids = {i.user_id for i in intents}
+    existing = dict(
+        vote_model.objects.filter(user_id__in=user_ids, **{fk: obj}).values_list('user_id', 'value')
+    )
+
+    initial = {uid: existing.get(uid) for uid in user_ids}
+    state = dict(initial)
+    last_ip = {}
+    score_delta = 0
+    for intent in intents:
+        state[intent.user_id], delta, _action = apply_click(state[intent.user_id], intent.value)
+        score_delta += delta
+        last_ip[intent.user_id] = intent.ip_address
+
+    changed = [uid for uid in user_ids if state[uid] != initial[uid]]
+    if not changed:
+        return
+
+    removed = [uid for uid in changed if state[uid] is None]
+    if removed:
+        vote_model.objects.filter(user_id__in=removed, **{fk: obj}).delete()
+    for value in (1, -1):
+        flipped = [uid for uid in changed if initial[uid] is not None and state[uid] == value]
+        if flipped:
+            vote_model.objects.filter(user_id__in=flipped, **{fk: obj}).update(value=value)
+    vote_model.objects.bulk_create([
+        vote_model(user_id=uid, value=state[uid], ip_address=last_ip[uid], **{fk: obj})
+        for uid in changed if initial[uid] is None
+    ])
+
+    if score_delta:
+        model.objects.filter(pk=obj.pk).update(score=F('score') + score_delta)
+        if entity_type == 'word':
+            # .update() skips Word.save, which would have dropped these
+            pagecache.forget_word_scores([obj.slug])
+    if entity_type == 'challenge_comment':
+        obj.challenge.refresh_top_suggestion(obj.challenge_id)
+
+    owner = obj.user
+    if not owner:
+        return
+    if entity_type == 'word':
+        target, defaults = {'word_id': obj.pk}, None
+    elif entity_type == 'comment':
+        target, defaults = {'comment_id': obj.pk}, {'word_id': obj.word_id}
+    else:
+        target, defaults = {'challenge_comment_id': obj.pk}, None
+
+    actors = User.objects.in_bulk(changed)
+    for uid in changed:
+        # Only the net change matters: like -> unlike -> like within one batch
+        # touches neither the vote row nor the notification.
+        sync_vote_notification(owner, actors.get(uid), prefix, initial[uid], state[uid], target, defaults)
+
+
+def flush_pending(batch_size=500):
+    """Apply up to ``batch_size`` queued clicks in one transaction. Returns the number applied."""
+    with transaction.atomic():
+        intents = list(VoteIntent.objects.order_by('id')[:batch_size])
+        if not intents:
+            return 0
+
+        grouped = OrderedDict()
+        for intent in intents:
+            grouped.setdefault((intent.entity_type, intent.entity_id), []).append(intent)
+
+        for (entity_type, entity_id), entity_intents in grouped.items():
+            _apply_entity(entity_type, entity_id, entity_intents)
+
+        VoteIntent.objects.filter(id__in=[i.id for i in intents]).delete()
+
+    logger.info('Applied %d queued votes on %d objects', len(intents), len(grouped))
+    return len(intents)
@@ -0,0 +1,124 @@
+# core/votes.py
+"""
+Vote engine for WordVote, CommentVote and ChallengeCommentVote.
+
+A click is resolved with at most two statements on the vote table plus one
+score UPDATE, without locking the voted row first:
+
+1. ``INSERT ... ON CONFLICT DO UPDATE ... WHERE value <> excluded.value
+   RETURNING`` records a new vote or flips an opposite one.
+2. Only if (1) touched nothing (the user clicked the same button again),
+   ``DELETE ... RETURNING`` removes the vote.
+3. ``UPDATE ... SET score = score + delta RETURNING score`` applies the delta
+   and reads back the new score.
+
+The statements need ON CONFLICT and RETURNING (SQLite >= 3.35, PostgreSQL).
+"""
+from dataclasses import dataclass
+
+from django.db import connection
+from django.utils import timezone
+
+from .models import Word, Comment, WordVote, CommentVote
+
+
+def entity_config(entity_type):
+    """(model, vote model, vote FK name, notification prefix) for an entity type."""
+    if entity_type == 'word':
+        return Word, WordVote, 'word', 'word'
+    if entity_type == 'comment':
+        return Comment, CommentVote, 'comment', 'comment'
+    if entity_type == 'challenge_comment':
+        from challenge.models import ChallengeComment, ChallengeCommentVote
+        return ChallengeComment, ChallengeCommentVote, 'comment', 'challenge'
+    raise ValueError(f'Unknown vote entity: {entity_type}')
+
+
+def apply_click(current, vote_val):
+    """
+    Toggle semantics of a like/dislike click on a user's current vote.
+    Returns (new vote value or None, score delta, user_action).
+    """
+    if current == vote_val:
+        return None, -vote_val, 'none'
+    action = 'liked' if vote_val == 1 else 'disliked'
+    if current is None:
+        return vote_val, vote_val, action
+    return vote_val, vote_val * 2, action
+
+
+@dataclass
+class VoteResult:
+    user_action: str
+    delta: int
+    score: int | None
+    old_value: int | None = None
+    new_value: int | None = None
+
+
+def _vote_sql(entity_type):
+    model, vote_model, fk, _prefix = entity_config(entity_type)
+    opts = vote_model._meta
+    qn = connection.ops.quote_name
+    table = qn(opts.db_table)
+    user_col = qn(opts.get_field('user').column)
+    target_col = qn(opts.get_field(fk).column)
+    value_col = qn(opts.get_field('value').column)
+    ip_col = qn(opts.get_field('ip_address').column)
+    ts_col = qn(opts.get_field('timestamp').column)
+
+    upsert = (
+        f'INSERT INTO {table} ({user_col}, {target_col}, {value_col}, {ip_col}, {ts_col}) '
+        f'VALUES (%s, %s, %s, %s, %s) '
+        f'ON CONFLICT ({user_col}, {target_col}) DO UPDATE SET {value_col} = excluded.{value_col} '
+        f'WHERE {table}.{value_col} <> excluded.{value_col} '
+        # An updated row keeps its original timestamp, an inserted one carries ours
+        f'RETURNING {ts_col} = %s'
+    )
+    delete = (
+        f'DELETE FROM {table} WHERE {user_col} = %s AND {target_col} = %s AND {value_col} = %s '
+        f'RETURNING {value_col}'
+    )
+    score_col = qn(model._meta.get_field('score').column)
+    score = (
+        f'UPDATE {qn(model._meta.db_table)} SET {score_col} = {score_col} + %s '
+        f'WHERE {qn(model._meta.pk.column)} = %s RETURNING {score_col}'
+    )
+    return upsert, delete, score
+
+
+_SQL_CACHE = {}
+
+
+def cast_vote(entity_type, object_id, user_id, vote_val, ip_address=None):
+    """
+    Apply one like (1) / dislike (-1) click by ``user_id`` on an object.
+
+    Call inside a transaction so the vote row and the score commit together.
+    ``score`` in the result is None if the object disappeared meanwhile.
+    """
+    if entity_type not in _SQL_CACHE:
+        _SQL_CACHE[entity_type] = _vote_sql(entity_type)
+    upsert, delete, score_sql = _SQL_CACHE[entity_type]
+
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    with connection.cursor() as cursor:
+        cursor.execute(upsert, [user_id, object_id, vote_val, ip_address, now, now])
+        row = cursor.fetchone()
+        if row is not None:
+            old_value = None if row[0] else -vote_val
+            new_value = vote_val
+            delta = vote_val if old_value is None else vote_val * 2
+            action = 'liked' if vote_val == 1 else 'disliked'
+        else:
+            cursor.execute(delete, [user_id, object_id, vote_val])
+            # Nothing deleted either means a concurrent click already removed it
+            old_value = vote_val if cursor.fetchall() else None
+            new_value = None
+            delta = -vote_val if old_value else 0
+            action = 'none'
+
+        cursor.execute(score_sql, [delta, object_id])
+        row = cursor.fetchone()
+
+    return VoteResult(action, delta, row[0] if row else None, old_value, new_value)
@@ -328,14 +328,16 @@ async function loadSuggestions(challengeId, page = 1) {
 
     if (page === 1) {
         list.innerHTML = '<div class="spinner"></div>';
-        state.currentChallengeCommentPage = 1;
+        state.challengeCommentCursor = null;
     } else {
         const btn = list.querySelector('.load-more-comments-btn');
         if (btn) btn.innerText = 'Yükleniyor...';
     }
 
     try {
-        const data = await apiRequest(`/api/challenge-comments/${challengeId}?page=${page}&limit=${CHALLENGE_COMMENTS_PER_PAGE}`);
+        const cursor = page === 1 ? '' : (state.challengeCommentCursor || '');
+        const data = await apiRequest(`/api/challenge-comments/${challengeId}?cursor=${encodeURIComponent(cursor)}&limit=${CHALLENGE_COMMENTS_PER_PAGE}`);
+        state.challengeCommentCursor = data.next_cursor || null;
 
         if (page === 1) list.innerHTML = '';
         else list.querySelector('.load-more-comments-btn')?.remove();
@@ -357,7 +359,7 @@ async function loadSuggestions(challengeId, page = 1) {
                 const btn = document.createElement('button');
                 btn.className = 'load-more-comments-btn';
                 btn.innerText = 'Daha fazla öneri';
-                btn.addEventListener('click', () => loadSuggestions(challengeId, ++state.currentChallengeCommentPage));
+                btn.addEventListener('click', () => loadSuggestions(challengeId, page + 1));
                 list.appendChild(btn);
             }
         } else if (page === 1) {
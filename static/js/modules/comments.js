@@ -105,12 +105,14 @@ async function loadComments(wordId, page = 1) {
     const list = state.activeCardClone.querySelector('#commentsList');
     if (!list) return;
 
-    if (page === 1) { list.innerHTML = '<div class="spinner"></div>'; state.currentCommentPage = 1; }
+    if (page === 1) { list.innerHTML = '<div class="spinner"></div>'; state.commentCursor = null; }
     else { const b = list.querySelector('.load-more-comments-btn'); if (b) b.innerText = 'Yükleniyor...'; }
 
     try {
-        const data = await apiRequest(`/api/comments/${wordId}?page=${page}&limit=${COMMENTS_PER_PAGE}`);
+        const cursor = page === 1 ? '' : (state.commentCursor || '');
+        const data = await apiRequest(`/api/comments/${wordId}?cursor=${encodeURIComponent(cursor)}&limit=${COMMENTS_PER_PAGE}`);
         if (page === 1) list.innerHTML = ''; else list.querySelector('.load-more-comments-btn')?.remove();
+        state.commentCursor = data.next_cursor || null;
 
         if (data.comments?.length > 0) {
             data.comments.forEach(c => list.appendChild(createCommentItem(c)));
@@ -118,7 +120,7 @@ async function loadComments(wordId, page = 1) {
                 const btn = document.createElement('button');
                 btn.className = 'load-more-comments-btn';
                 btn.innerText = 'Daha eski yorumlar';
-                btn.addEventListener('click', () => loadComments(wordId, ++state.currentCommentPage));
+                btn.addEventListener('click', () => loadComments(wordId, page + 1));
                 list.appendChild(btn);
             }
         } else if (page === 1) {
@@ -10,7 +10,9 @@ export async function fetchWords(page) {
     const list = document.getElementById('feedList');
     const loadBtn = document.querySelector('#loadMoreContainer button');
 
-    let url = `/api/words?page=${page}&limit=${ITEMS_PER_PAGE}&sort=${encodeURIComponent(state.currentSort)}`;
+    // Keyset pagination: page 1 starts with an empty cursor, later pages resume from next_cursor
+    const cursor = page === 1 ? '' : (state.feedCursor || '');
+    let url = `/api/words?cursor=${encodeURIComponent(cursor)}&limit=${ITEMS_PER_PAGE}&sort=${encodeURIComponent(state.currentSort)}`;
     if (state.activeCategorySlug) {
         url += `&tag=${state.activeCategorySlug}`;
     }
@@ -29,11 +31,11 @@ export async function fetchWords(page) {
     try {
         const data = await apiRequest(url);
         if (page === 1) list.innerHTML = '';
+        state.feedCursor = data.next_cursor || null;
 
         if (data.words?.length > 0) {
             appendCards(data.words, list, false);
-            const hasMore = data.words.length >= ITEMS_PER_PAGE && (!data.total_count || (page * ITEMS_PER_PAGE < data.total_count));
-            document.getElementById('loadMoreContainer').style.display = hasMore ? 'block' : 'none';
+            document.getElementById('loadMoreContainer').style.display = data.has_next ? 'block' : 'none';
         } else if (page === 1) {
             if (state.currentSearchQuery) {
                 list.innerHTML = '';
@@ -6,12 +6,63 @@ import { animateAndOpenCommentView } from './comments.js';
 import { openChallengeDiscussion } from './challenge.js';
 
 let notifPage = 1;
+let notifCursor = null;
 let hasMoreNotifs = false;
 
+let pollTimer = null;
+
 export function initNotifications() {
     if (!isUserLoggedIn) return;
+    if (window.EventSource) {
+        openNotificationStream();
+    } else {
+        startPolling();
+    }
+}
+
+// Server push via SSE; the server also sends the current count on connect.
+function openNotificationStream() {
+    const source = new EventSource('/api/notifications/stream');
+    let opened = false;
+
+    source.addEventListener('open', () => { opened = true; });
+    source.addEventListener('unread', (e) => {
+        updateBadges(JSON.parse(e.data).count);
+    });
+    source.addEventListener('notification', (e) => {
+        prependLiveNotification(JSON.parse(e.data));
+    });
+    source.addEventListener('error', () => {
+        // Never connected (stream disabled / no ASGI): fall back to polling.
+        // After a successful connection EventSource reconnects by itself.
+        if (!opened) {
+            source.close();
+            startPolling();
+        }
+    });
+}
+
+function startPolling() {
+    if (pollTimer) return;
     fetchUnreadCount();
-    setInterval(fetchUnreadCount, 30000); // poll every 30s
+    pollTimer = setInterval(() => {
+        if (!document.hidden) fetchUnreadCount(); // background tabs stay quiet
+    }, 30000);
+    document.addEventListener('visibilitychange', () => {
+        if (!document.hidden) fetchUnreadCount();
+    });
+}
+
+function prependLiveNotification(n) {
+    const modal = document.getElementById('notificationsModal');
+    const feed = document.getElementById('notifFeed');
+    if (!modal || !feed || !modal.classList.contains('show')) return;
+
+    // A rolled-up notification may already be listed; replace it in place
+    const existing = feed.querySelector(`[data-notif-id="${n.id}"]`);
+    if (existing) existing.remove();
+    feed.prepend(createNotifItem(n));
+    if (!n.is_read) markRead([n.id]);
 }
 
 export async function fetchUnreadCount() {
@@ -53,7 +104,9 @@ async function loadNotifications(page) {
     if (page === 1) feed.innerHTML = '<div class="spinner"></div>';
 
     try {
-        const d = await apiRequest(`/api/notifications?page=${page}&limit=20`);
+        const cursor = page === 1 ? '' : (notifCursor || '');
+        const d = await apiRequest(`/api/notifications?cursor=${encodeURIComponent(cursor)}&limit=20`);
+        notifCursor = d.next_cursor || null;
 
         if (page === 1) feed.innerHTML = '';
 
@@ -94,6 +147,7 @@ async function markRead(ids) {
 function createNotifItem(n) {
     const div = document.createElement('div');
     div.className = 'notif-item' + (n.is_read ? '' : ' notif-unread');
+    div.dataset.notifId = n.id;
 
     const type = n.notification_type;
     const wordRouteTypes = ['word_like', 'word_dislike', 'comment_like', 'comment_dislike', 'new_comment', 'challenge_win'];
@@ -162,8 +216,17 @@ function getNotifIcon(type) {
     }
 }
 
+function buildActorText(n) {
+    // Vote notifications are rolled up: "ali ve 11 kişi daha"
+    const latest = (n.recent_actors && n.recent_actors[0]) || n.actor_username;
+    if (!latest) return 'Birisi';
+    const others = (n.actor_count || 1) - 1;
+    const name = `<strong>${escapeHTML(latest)}</strong>`;
+    return others > 0 ? `${name} ve ${others} kişi daha` : name;
+}
+
 function buildNotifText(n) {
-    const actor = n.actor_username ? `<strong>${escapeHTML(n.actor_username)}</strong>` : 'Birisi';
+    const actor = buildActorText(n);
     const word = n.word_text ? `<strong>${escapeHTML(n.word_text)}</strong>` : '';
 
     switch (n.notification_type) {
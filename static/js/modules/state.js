@@ -11,7 +11,8 @@ export const state = {
     currentWordId: null,
     activeCardClone: null,
     currentPage: 1,
-    currentCommentPage: 1,
+    feedCursor: null,
+    commentCursor: null,
     isLoading: false,
     currentProfileUser: null,
     wordIdForExample: null,
@@ -26,7 +27,7 @@ export const state = {
     challengeExpanded: false,
     activeChallengeView: null,
     currentChallengeId: null,
-    currentChallengeCommentPage: 1,
+    challengeCommentCursor: null,
 };
 
 export const pendingVotes = {};